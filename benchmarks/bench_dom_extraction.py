@@ -0,0 +1,73 @@
+"""
+Benchmark: đọc card bằng từng lệnh WebDriver vs một script extract_cards cho cả trang.
+Cần Chrome + ChromeDriver.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_dom_extraction --cards 60
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from crawler.browser import create_chrome_driver
+from crawler.dom_extractor import extract_cards, extract_cards_per_element
+from crawler.parsing import product_from_card_fields
+from benchmarks.html_fixtures import search_page_html
+
+BASE_URL = "https://shopee.vn"
+
+
+def count_driver_calls(driver):
+    """Đếm số lệnh gửi tới chromedriver (mỗi lệnh là một HTTP round trip)"""
+    counter = {'calls': 0}
+    original_execute = driver.execute
+
+    def execute(*args, **kwargs):
+        counter['calls'] += 1
+        return original_execute(*args, **kwargs)
+
+    driver.execute = execute
+    return counter
+
+
+def measure(driver, counter, extract) -> tuple:
+    """Chạy một cách extract, trả về (số sản phẩm, số lệnh WebDriver, thời gian)"""
+    counter['calls'] = 0
+    start = time.perf_counter()
+    seen = set()
+    for fields in extract():
+        product = product_from_card_fields(fields, BASE_URL)
+        if product:
+            seen.add(product.product_id)
+    return len(seen), counter['calls'], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cards', type=int, default=60, help='Số card trên trang')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8') as f:
+        f.write(search_page_html(args.cards))
+        page_path = f.name
+
+    driver = create_chrome_driver(headless=True)
+    try:
+        driver.get(f"file://{page_path}")
+        counter = count_driver_calls(driver)
+
+        for _ in range(args.repeat):
+            old = measure(driver, counter, lambda: extract_cards_per_element(driver))
+            new = measure(driver, counter, lambda: extract_cards(driver)['cards'])
+            print(f"Từng element:   {old[0]} sản phẩm, {old[1]} lệnh WebDriver, {old[2] * 1000:.0f} ms/trang")
+            print(f"extract_cards:  {new[0]} sản phẩm, {new[1]} lệnh WebDriver, {new[2] * 1000:.0f} ms/trang")
+            print(f"Tăng tốc:       x{old[2] / new[2]:.1f}\n")
+    finally:
+        driver.quit()
+        os.remove(page_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark tải end-to-end: ShopeeCrawler (HTTP-only) crawl keyword trên server giả lập Shopee
+với các kịch bản bình thường / lỗi ngẫu nhiên 429-403-500 / server giới hạn request mỗi giây.
+In số sản phẩm, thời gian, số lần retry, số kết nối TCP và số request theo status phía server.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_end_to_end --limit 3000 --latency 0.1
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from crawler.metrics import CrawlMetrics
+from crawler.rate_limiter import AdaptiveRateLimiter
+from crawler.session import SessionState
+from crawler.shopee_crawler import ShopeeCrawler
+from devserver import DevServerConfig, ShopeeDevServer
+from devserver.server import SESSION_COOKIE
+
+SCENARIOS = {
+    'bình thường': {},
+    'lỗi 10% (429/500)': {'error_rate': 0.1, 'error_codes': (429, 500)},
+    'giới hạn 20 req/s': {'max_rps': 20},
+}
+
+
+def run_scenario(latency: float, limit: int, concurrency: int, rate: float, overrides: dict):
+    config = DevServerConfig(latency=latency, items_per_target=limit * 2, require_cookie=True, **overrides)
+    with tempfile.TemporaryDirectory(prefix='shopee_bench_') as tmp_dir, ShopeeDevServer(config) as server:
+        metrics = CrawlMetrics()
+        crawler = ShopeeCrawler(
+            http_only=True,
+            api_concurrency=concurrency,
+            rate_limiter=AdaptiveRateLimiter(initial_rate=rate, max_rate=rate, base_backoff=0.2, max_backoff=2.0),
+            metrics=metrics,
+            base_url=server.url,
+            # Không đụng tới cookies / session Shopee thật trong thư mục hiện tại
+            cookies_file=os.path.join(tmp_dir, 'cookies.json'),
+            session_file=os.path.join(tmp_dir, 'session.json'),
+        )
+        # Session giả để không phải mở Chrome lấy cookies
+        crawler.session_state = SessionState(
+            cookies=[{'name': SESSION_COOKIE, 'value': 'bench', 'domain': '127.0.0.1', 'path': '/'}]
+        )
+        try:
+            start = time.perf_counter()
+            products = crawler.crawl_by_keyword('bench', limit=limit)
+            elapsed = time.perf_counter() - start
+        finally:
+            crawler.close()
+        return len(products), elapsed, metrics, server.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=3000, help='Số sản phẩm mỗi lần crawl')
+    parser.add_argument('--latency', type=float, default=0.1, help='Độ trễ mỗi request của server (giây)')
+    parser.add_argument('--concurrency', type=int, default=8, help='api_concurrency của crawler')
+    parser.add_argument('--rate', type=float, default=50.0, help='Số request/giây tối đa của crawler')
+    args = parser.parse_args()
+
+    print(f"{'Kịch bản':20} {'sản phẩm':>9} {'thời gian':>10} {'sp/s':>8} {'retry':>6} {'kết nối':>8}  status phía server")
+    for name, overrides in SCENARIOS.items():
+        count, elapsed, metrics, server_stats = run_scenario(
+            args.latency, args.limit, args.concurrency, args.rate, overrides
+        )
+        statuses = ', '.join(f"{status}: {n}" for status, n in server_stats['requests'].get('api', {}).items())
+        print(f"{name:20} {count:9} {elapsed:9.2f}s {count / elapsed:8.0f} {metrics.total('http_retries'):6.0f} {server_stats['connections']:8}  {statuses}")
+
+
+if __name__ == '__main__':
+    main()
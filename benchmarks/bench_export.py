@@ -0,0 +1,83 @@
+"""
+Benchmark: thời gian ghi, dung lượng file và thời gian đọc lại bằng pandas của các định dạng xuất.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_export --count 100000
+    python -m benchmarks.bench_export --count 20000 --excel
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from models.product import Product
+from storage.sinks import CsvSink, JsonlSink
+from storage.parquet_sink import ParquetSink
+from benchmarks.html_fixtures import load_sample_records
+
+
+def make_products(count: int):
+    """Sinh `count` sản phẩm từ bản ghi mẫu, id khác nhau"""
+    records = load_sample_records()
+    products = []
+    for i in range(count):
+        record = dict(records[i % len(records)])
+        record['product_id'] = str(int(record['product_id']) + i)
+        products.append(Product(**record))
+    return products
+
+
+def write_json(products, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([p.to_dict() for p in products], f, ensure_ascii=False, indent=2)
+
+
+def write_excel(products, path):
+    pd.DataFrame([p.to_dict() for p in products]).to_excel(path, index=False, engine='openpyxl')
+
+
+def write_sink(sink_class):
+    def write(products, path):
+        with sink_class(path) as sink:
+            sink.write_many(products)
+    return write
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--excel', action='store_true', help='Đo cả Excel (rất chậm với nhiều sản phẩm)')
+    args = parser.parse_args()
+
+    products = make_products(args.count)
+    formats = [
+        ('json', write_json, lambda path: pd.read_json(path)),
+        ('jsonl', write_sink(JsonlSink), lambda path: pd.read_json(path, lines=True)),
+        ('csv', write_sink(CsvSink), lambda path: pd.read_csv(path, encoding='utf-8-sig')),
+        ('parquet', write_sink(ParquetSink), lambda path: pd.read_parquet(path)),
+    ]
+    if args.excel:
+        formats.insert(1, ('xlsx', write_excel, lambda path: pd.read_excel(path, engine='openpyxl')))
+
+    print(f"{'định dạng':>10} {'ghi (s)':>9} {'dung lượng':>12} {'đọc lại (s)':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, write, read in formats:
+            path = os.path.join(tmp_dir, f"products.{name}")
+            start = time.perf_counter()
+            write(products, path)
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            frame = read(path)
+            read_time = time.perf_counter() - start
+            assert len(frame) == len(products)
+
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"{name:>10} {write_time:>9.2f} {size_mb:>10.1f}MB {read_time:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
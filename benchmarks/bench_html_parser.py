@@ -0,0 +1,52 @@
+"""
+Benchmark: số card parse được mỗi giây của từng backend HTML parser.
+Kiểm tra luôn các backend cho ra cùng danh sách Product.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_html_parser --cards 600
+    python -m benchmarks.bench_html_parser --html saved_shop_page.html
+"""
+import argparse
+import time
+
+from crawler.html_parser import PARSER_BACKENDS
+from benchmarks.html_fixtures import search_page_html
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--html', help='File HTML trang search/shop đã lưu (mặc định: sinh từ aaa)')
+    parser.add_argument('--cards', type=int, default=600, help='Số card khi sinh HTML giả lập')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, 'r', encoding='utf-8') as f:
+            html = f.read()
+    else:
+        html = search_page_html(args.cards)
+
+    results = {}
+    for name, backend in PARSER_BACKENDS.items():
+        try:
+            card_parser = backend()
+        except ImportError:
+            print(f"{name:>5}: chưa cài đặt, bỏ qua")
+            continue
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            products = card_parser.parse_page(html)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        results[name] = products
+        rate = len(products) / elapsed if elapsed else 0
+        print(f"{name:>5}: {len(products)} card trong {elapsed * 1000:.1f} ms -> {rate:,.0f} card/s")
+
+    outputs = list(results.values())
+    if len(outputs) > 1:
+        same = all(output == outputs[0] for output in outputs[1:])
+        print("Kết quả giữa các backend:", "giống nhau ✅" if same else "KHÁC NHAU ❌")
+
+
+if __name__ == '__main__':
+    main()
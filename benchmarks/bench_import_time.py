@@ -0,0 +1,74 @@
+"""
+Benchmark: thời gian khởi động (process mới) của CLI so với cách import cũ của main.py
+(pandas + selenium + BeautifulSoup được import ngay khi load module).
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_import_time --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import tương đương main.py trước khi tách CLI / import lười
+EAGER_IMPORTS = (
+    "import json, pandas; "
+    "from selenium.webdriver.common.by import By; "
+    "from selenium import webdriver; "
+    "from bs4 import BeautifulSoup; "
+    "import crawler.shopee_crawler, filters.sorter"
+)
+
+
+def run_once(args) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable] + args, cwd=ROOT, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - started
+
+
+def loaded_modules(code: str) -> set:
+    """Các module nặng đã được import sau khi chạy code"""
+    check = f"{code}; import sys; print(' '.join(m for m in ('pandas', 'selenium', 'bs4', 'pyarrow') if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    sample = os.path.join(tmp_dir, 'sample.jsonl')
+    with open(sample, 'w', encoding='utf-8') as f:
+        for i in range(100):
+            f.write(f'{{"name": "sp {i}", "price": {1000 + i}, "shop_id": "1", "product_id": "{i}"}}\n')
+
+    cases = [
+        ("python (không import gì)", ['-c', 'pass'], None),
+        ("import kiểu main.py cũ", ['-c', EAGER_IMPORTS], EAGER_IMPORTS),
+        ("import crawler.shopee_crawler", ['-c', 'import crawler.shopee_crawler'], 'import crawler.shopee_crawler'),
+        ("cli.py --help", ['cli.py', '--help'], 'import cli'),
+        ("main.py --help", ['main.py', '--help'], 'import main'),
+        ("cli.py export .jsonl -> .csv", ['cli.py', 'export', sample, os.path.join(tmp_dir, 'out.csv')],
+         'import cli, storage.product_files'),
+    ]
+
+    print(f"{'Lệnh':32} {'median':>10} {'min':>10}  module nặng đã import")
+    for name, command, code in cases:
+        run_once(command)  # Lần đầu để tạo .pyc
+        times = [run_once(command) for _ in range(args.repeat)]
+        modules = ', '.join(sorted(loaded_modules(code))) if code else ''
+        print(f"{name:32} {statistics.median(times) * 1000:8.0f}ms {min(times) * 1000:8.0f}ms  {modules or '-'}")
+
+
+if __name__ == '__main__':
+    main()
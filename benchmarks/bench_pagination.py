@@ -0,0 +1,58 @@
+"""
+Benchmark: phân trang tuần tự vs song song trên server giả lập Shopee (devserver).
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_pagination --items 3000 --latency 0.2
+"""
+import argparse
+import json
+import time
+import urllib.parse
+import urllib.request
+
+from crawler.pagination import SearchItemsPaginator
+from devserver import DevServerConfig, ShopeeDevServer
+
+
+def run(base_url: str, limit: int, concurrency: int) -> tuple:
+    """Crawl `limit` items với mức song song cho trước, trả về (số items, thời gian)"""
+
+    def fetch_page(params):
+        url = f"{base_url}/api/v4/search/search_items?{urllib.parse.urlencode(params)}"
+        with urllib.request.urlopen(url, timeout=15) as response:
+            return json.loads(response.read())
+
+    paginator = SearchItemsPaginator(
+        fetch_page, {'keyword': 'bench', 'by': 'ctime'}, limit, concurrency=concurrency
+    )
+    start = time.perf_counter()
+    offsets = []
+    count = 0
+    for newest, items in paginator.iter_pages():
+        offsets.append(newest)
+        count += len(items)
+    elapsed = time.perf_counter() - start
+    assert offsets == sorted(offsets), "Các trang phải trả về theo thứ tự offset"
+    return count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=3000, help='Số items cần crawl')
+    parser.add_argument('--latency', type=float, default=0.2, help='Độ trễ mỗi request (giây)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    # Server có ít items hơn limit một chút để kiểm tra điều kiện dừng khi hết trang
+    config = DevServerConfig(latency=args.latency, items_per_target=args.items - 30)
+    with ShopeeDevServer(config) as server:
+        seq_count, seq_time = run(server.url, args.items, 1)
+        par_count, par_time = run(server.url, args.items, args.concurrency)
+
+    print(f"Tuần tự:   {seq_count} items trong {seq_time:.2f}s")
+    print(f"Song song: {par_count} items trong {par_time:.2f}s (concurrency={args.concurrency})")
+    print(f"Tăng tốc:  x{seq_time / par_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: bộ nhớ mỗi sản phẩm (tracemalloc) của dataclass cũ, Product dùng __slots__ và ProductBatch.
+Mỗi sản phẩm có chuỗi riêng như khi parse từ API (tên, id, link, shop/category/location).
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_product_memory --count 1000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from models.product import Product
+from models.product_batch import ProductBatch
+from benchmarks.html_fixtures import load_sample_records
+
+
+@dataclass
+class LegacyProduct:
+    """Product trước khi tối ưu (dataclass có __dict__), giữ lại để so sánh"""
+    name: str
+    price: float
+    original_price: Optional[float] = None
+    commission_rate: Optional[float] = None
+    sales_count: int = 0
+    rating: Optional[float] = None
+    shop_name: str = ""
+    shop_id: str = ""
+    product_id: str = ""
+    category: str = ""
+    image_url: str = ""
+    product_url: str = ""
+    location: str = ""
+
+
+def _fresh(value: str) -> str:
+    """Bản sao mới của chuỗi, giống chuỗi vừa được decode từ JSON"""
+    return (value + ' ')[:-1]
+
+
+def make_rows(count: int):
+    """Sinh tham số khởi tạo cho `count` sản phẩm, mỗi chuỗi là object riêng"""
+    records = load_sample_records()
+    for i in range(count):
+        record = records[i % len(records)]
+        shop_id = record['product_url'].rstrip('/').split('/')[-2]
+        product_id = str(int(record['product_id']) + i)
+        yield dict(
+            name=f"{record['name']} #{i}",
+            price=float(record['price']) + i % 7,
+            original_price=record['original_price'],
+            commission_rate=record['commission_rate'],
+            sales_count=int(record['sales_count']) + i % 11,
+            rating=record['rating'],
+            shop_name=_fresh(record['shop_name']),
+            shop_id=_fresh(shop_id),
+            product_id=product_id,
+            category=_fresh(record['category']),
+            image_url=_fresh(record['image_url']),
+            product_url=f"https://shopee.vn/product/{shop_id}/{product_id}",
+            location=_fresh(record['location']),
+        )
+
+
+def measure(label: str, build, count: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>20}: {current / count:8.1f} bytes/sản phẩm, tổng {current / 1024 / 1024:8.1f}MB, {elapsed:.1f}s")
+    del result
+    gc.collect()
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000000)
+    args = parser.parse_args()
+
+    count = args.count
+    legacy = measure("dataclass (cũ)", lambda: [LegacyProduct(**row) for row in make_rows(count)], count)
+    slotted = measure("Product (__slots__)", lambda: [Product(**row) for row in make_rows(count)], count)
+    batch = measure("ProductBatch (cột)", lambda: ProductBatch(Product(**row) for row in make_rows(count)), count)
+    print(f"Tiết kiệm: Product {1 - slotted / legacy:.0%}, ProductBatch {1 - batch / legacy:.0%}")
+
+
+if __name__ == '__main__':
+    main()
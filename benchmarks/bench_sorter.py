@@ -0,0 +1,74 @@
+"""
+Benchmark: sắp xếp nhiều tiêu chí và chọn top-K trên nhiều sản phẩm.
+So sánh sorted() với lambda (cách cũ) và ProductSorter trên list Product / ProductBatch.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_sorter --count 1000000 --top 100
+"""
+import argparse
+import random
+import time
+
+from filters.sorter import ProductSorter, SortKey
+from models.product import Product
+from models.product_batch import ProductBatch
+
+
+def make_products(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        Product(
+            name=f"Sản phẩm {i}",
+            price=float(rng.randint(1, 5000) * 1000),
+            commission_rate=rng.choice((None, 0.0, 2.5, 5.0, 7.5, 10.0)),
+            sales_count=rng.randint(0, 20000),
+            rating=rng.choice((None, 3.5, 4.0, 4.5, 4.8, 5.0)),
+            shop_id=str(rng.randint(1, 5000)),
+            product_id=str(i),
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label: str, func, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:>42}: {elapsed:7.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--top', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"Sinh {args.count:,} sản phẩm...")
+    products = make_products(args.count)
+    batch = ProductBatch(products)
+    keys = [
+        SortKey('commission_rate', descending=True, fill=0),
+        SortKey('sales_count', descending=True),
+        SortKey('rating', descending=True, fill=0),
+    ]
+
+    # Cách cũ: sort lại cả danh sách cho từng tiêu chí (từ tiêu chí cuối lên)
+    def legacy():
+        result = sorted(products, key=lambda p: p.rating if p.rating else 0, reverse=True)
+        result = sorted(result, key=lambda p: p.sales_count, reverse=True)
+        result = sorted(result, key=lambda p: p.commission_rate if p.commission_rate else 0, reverse=True)
+        return result[:args.top]
+
+    expected = timed("sorted() x3 với lambda, lấy top", legacy)
+    full = timed("ProductSorter.sort (list)", lambda: ProductSorter.sort(products, keys))
+    top_list = timed(f"ProductSorter.top_k({args.top}) (list)", lambda: ProductSorter.top_k(products, keys, args.top))
+    top_batch = timed(f"ProductSorter.top_k({args.top}) (ProductBatch)", lambda: ProductSorter.top_k(batch, keys, args.top))
+
+    same = full[:args.top] == expected and top_list == expected and top_batch == expected
+    print("Kết quả:", "giống nhau ✅" if same else "KHÁC NHAU ❌")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Fixture cho benchmark chạy offline: trang JSON search_items, HTML trang search/shop đã lưu
+và bộ sản phẩm tổng hợp (tới 1M) sinh từ các bản ghi mẫu trong file `aaa`.
+
+Các file trong thư mục này được ghi sẵn. Ghi lại / thêm fixture thật:
+    python -m benchmarks.fixtures                          # sinh lại từ aaa
+    python -m benchmarks.fixtures --from-cache .shopee_cache   # lấy response search_items đã ghi bởi ResponseCache
+    python -m benchmarks.fixtures --html saved_shop.html --name shop_real
+"""
+import argparse
+import base64
+import glob
+import json
+import os
+import random
+import shutil
+from typing import Dict, Iterator, List, Tuple
+
+from benchmarks.html_fixtures import load_sample_records, search_page_html, shop_page_html
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SEARCH_ITEMS_PATH = '/api/v4/search/search_items'
+
+
+def _shop_id(record: Dict) -> str:
+    return record.get('shop_id') or record['product_url'].rstrip('/').split('/')[-2]
+
+
+def api_item(record: Dict, index: int = 0) -> Dict:
+    """Một item search_items (item_basic) từ bản ghi dạng Product.to_dict()"""
+    image = record.get('image_url', '')
+    return {
+        'item_basic': {
+            'itemid': int(record['product_id']) + index,
+            'shopid': int(_shop_id(record)),
+            'name': record['name'],
+            'price': int(record['price'] * 100000),
+            'price_before_discount': int((record.get('original_price') or 0) * 100000),
+            'historical_sold': record.get('sales_count') or 0,
+            'item_rating': {'rating_star': record.get('rating') or 0},
+            'shop_name': record.get('shop_name', ''),
+            'image': image.rsplit('/', 1)[-1],
+            'catid': int(record['category']) if record.get('category') else 0,
+            'shop_location': record.get('location', ''),
+        }
+    }
+
+
+def search_items_page(records: List[Dict], page: int, page_size: int = 60) -> Dict:
+    """Response search_items của trang thứ `page`"""
+    start = page * page_size
+    return {
+        'total_count': len(records) * 1000,
+        'nomore': False,
+        'items': [api_item(records[(start + i) % len(records)], start + i) for i in range(page_size)],
+    }
+
+
+def synthetic_records(count: int, seed: int = 0) -> Iterator[Dict]:
+    """
+    Sinh `count` bản ghi kiểu `aaa` (dạng Product.to_dict() kèm shop_id):
+    giữ tên/shop/nơi bán của bản ghi mẫu, giá/lượt bán/rating/hoa hồng thay đổi ngẫu nhiên (cố định theo seed)
+    """
+    rng = random.Random(seed)
+    samples = load_sample_records()
+    shop_count = max(1, count // 50)
+    for i in range(count):
+        sample = samples[i % len(samples)]
+        price = float(round(sample['price'] * rng.uniform(0.5, 1.5), -2))
+        shop_id = str(100000 + rng.randrange(shop_count))
+        product_id = str(int(sample['product_id']) + i)
+        yield {
+            'name': f"{sample['name']} #{i}",
+            'price': price,
+            'original_price': price * 1.25 if rng.random() < 0.4 else None,
+            'commission_rate': rng.choice((None, 0.0, 2.5, 5.0, 7.5, 10.0)),
+            'sales_count': rng.randint(0, 20000),
+            'rating': rng.choice((None, 3.5, 4.0, 4.5, 4.8, 5.0)),
+            'shop_name': sample['shop_name'],
+            'shop_id': shop_id,
+            'product_id': product_id,
+            'category': sample['category'],
+            'image_url': sample['image_url'],
+            'product_url': f"https://shopee.vn/product/{shop_id}/{product_id}",
+            'location': sample['location'],
+        }
+
+
+def load_search_items_pages() -> List[Dict]:
+    """Các trang search_items đã ghi (search_items_*.json)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, 'search_items_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(json.load(f))
+    return pages
+
+
+def load_html(kind: str) -> List[Tuple[str, str]]:
+    """(tên file, HTML) của các trang `kind` ('search' hoặc 'shop') đã lưu"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, f'{kind}*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def _write_json(name: str, data: Dict):
+    with open(os.path.join(FIXTURE_DIR, name), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def record_generated(pages: int = 2, cards: int = 120):
+    """Sinh lại fixture từ aaa"""
+    records = load_sample_records()
+    for page in range(pages):
+        _write_json(f'search_items_{page:03d}.json', search_items_page(records, page))
+    for name, html in (('search.html', search_page_html(cards, records)), ('shop.html', shop_page_html(cards, records))):
+        with open(os.path.join(FIXTURE_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(html)
+    print(f"Đã sinh {pages} trang search_items và 2 trang HTML ({cards} card) vào {FIXTURE_DIR}")
+
+
+def record_from_cache(cache_dir: str, max_pages: int = 20) -> int:
+    """Chép các response search_items thật đã lưu bởi ResponseCache vào fixture"""
+    count = 0
+    for path in sorted(glob.glob(os.path.join(cache_dir, '*', '*.json'))):
+        if count >= max_pages:
+            break
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if SEARCH_ITEMS_PATH not in entry.get('url', '') or entry.get('status_code') != 200:
+            continue
+        data = json.loads(base64.b64decode(entry['body']))
+        if not data.get('items'):
+            continue
+        _write_json(f'search_items_cache_{count:03d}.json', data)
+        count += 1
+    print(f"Đã chép {count} trang search_items từ {cache_dir}")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=2, help='Số trang search_items sinh từ aaa')
+    parser.add_argument('--cards', type=int, default=120, help='Số card mỗi trang HTML sinh từ aaa')
+    parser.add_argument('--from-cache', help='Thư mục ResponseCache chứa response search_items thật')
+    parser.add_argument('--html', help='File HTML trang search/shop đã lưu từ browser')
+    parser.add_argument('--name', default='shop_saved', help='Tên fixture cho --html (bắt đầu bằng search hoặc shop)')
+    args = parser.parse_args()
+
+    if args.from_cache:
+        record_from_cache(args.from_cache)
+    elif args.html:
+        shutil.copyfile(args.html, os.path.join(FIXTURE_DIR, f'{args.name}.html'))
+        print(f"Đã chép {args.html} thành {args.name}.html")
+    else:
+        record_generated(args.pages, args.cards)
+
+
+if __name__ == '__main__':
+    main()
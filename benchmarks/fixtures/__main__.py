@@ -0,0 +1,4 @@
+from benchmarks.fixtures import main
+
+if __name__ == '__main__':
+    main()
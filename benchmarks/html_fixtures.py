@@ -0,0 +1,61 @@
+"""
+Sinh HTML trang search/shop giả lập từ các bản ghi mẫu trong file `aaa`
+"""
+import html
+import json
+import os
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_FILE = os.path.join(ROOT_DIR, 'aaa')
+
+
+def load_sample_records() -> List[Dict]:
+    """Đọc các bản ghi sản phẩm mẫu (định dạng Product.to_dict())"""
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _format_price(price: float) -> str:
+    return f"₫{int(price):,}".replace(',', '.')
+
+
+def card_html(record: Dict, index: int) -> str:
+    """HTML một card sản phẩm, id được đánh lại theo index để không trùng"""
+    shop_id = record['product_url'].rstrip('/').split('/')[-2]
+    product_id = int(record['product_id']) + index
+    rating = f"{record['rating']:.1f}" if record.get('rating') else ""
+    return (
+        '<div class="col-xs-2-4 shopee-search-item-result__item" data-sqe="item">'
+        f'<a href="/product/{shop_id}/{product_id}">'
+        '<div class="product-card">'
+        f'<img src="{html.escape(record["image_url"])}" alt="">'
+        f'<div class="product-name">{html.escape(record["name"])}</div>'
+        f'<div class="product-price"><span class="final-price">{_format_price(record["price"])}</span></div>'
+        f'<div class="product-rating">{rating}</div>'
+        f'<div class="product-sold">Đã bán {record["sales_count"]}</div>'
+        f'<div class="product-location">{html.escape(record.get("location", ""))}</div>'
+        '</div></a></div>'
+    )
+
+
+def search_page_html(count: int, records: List[Dict] = None) -> str:
+    """Trang search với `count` card"""
+    records = records or load_sample_records()
+    cards = ''.join(card_html(records[i % len(records)], i) for i in range(count))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Shopee search</title></head><body>'
+        f'<div class="shopee-search-item-result"><div class="row">{cards}</div></div>'
+        '</body></html>'
+    )
+
+
+def shop_page_html(count: int, records: List[Dict] = None) -> str:
+    """Trang shop với `count` card"""
+    records = records or load_sample_records()
+    cards = ''.join(card_html(records[i % len(records)], i) for i in range(count))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Shopee shop</title></head><body>'
+        f'<div class="shop-page"><div class="shop-all-product-view">{cards}</div></div>'
+        '</body></html>'
+    )
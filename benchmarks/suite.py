@@ -0,0 +1,305 @@
+"""
+Bộ benchmark offline cho parser và pipeline: parse JSON search_items, parse HTML trang search/shop,
+tạo / sắp xếp / lọc / xuất bộ sản phẩm tổng hợp (mặc định 1M) sinh từ các bản ghi mẫu `aaa`.
+Đo thời gian (tốt nhất trong --repeat lần), throughput và bộ nhớ Python cao nhất (tracemalloc).
+Không cần mạng hay Chrome, fixture nằm trong benchmarks/fixtures.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.suite                                   # 1M sản phẩm
+    python -m benchmarks.suite --quick                           # 100k sản phẩm, nhanh hơn
+    python -m benchmarks.suite --save bench_baseline.json        # lưu kết quả làm mốc
+    python -m benchmarks.suite --compare bench_baseline.json     # so với mốc, exit 1 nếu chậm hơn --threshold
+    python -m benchmarks.suite --only parse                      # chỉ chạy case có tên chứa "parse"
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.fixtures import load_html, load_search_items_pages, synthetic_records
+from crawler.html_parser import PARSER_BACKENDS
+from filters.product_filter import ProductFilter
+from filters.sorter import ProductSorter, SortKey
+from models.product import Product
+from models.product_batch import ProductBatch
+
+SORT_KEYS = [
+    SortKey('commission_rate', descending=True, fill=0),
+    SortKey('sales_count', descending=True),
+    SortKey('rating', descending=True, fill=0),
+]
+FILTER = ProductFilter(min_price=100000, max_price=500000, min_rating=4.5, min_sales=100)
+
+
+class BenchContext:
+    """Dữ liệu dùng chung giữa các case (bộ sản phẩm tổng hợp chỉ tạo một lần)"""
+
+    def __init__(self, count: int, export_count: int, parse_items: int, tmp_dir: str):
+        self.count = count
+        self.export_count = export_count
+        self.parse_items = parse_items
+        self.tmp_dir = tmp_dir
+        self._products: Optional[List[Product]] = None
+        self._batch: Optional[ProductBatch] = None
+
+    @property
+    def products(self) -> List[Product]:
+        if self._products is None:
+            self._products = build_products(self.count)
+        return self._products
+
+    @property
+    def batch(self) -> ProductBatch:
+        if self._batch is None:
+            self._batch = ProductBatch(self.products)
+        return self._batch
+
+
+def build_products(count: int) -> List[Product]:
+    return [Product.from_dict(record) for record in synthetic_records(count)]
+
+
+def _repeat_to(items: list, count: int) -> list:
+    """Lặp lại danh sách fixture cho tới khi đủ `count` phần tử"""
+    if not items:
+        return []
+    return (items * (count // len(items) + 1))[:count]
+
+
+# Mỗi case: (tên, hàm nhận context trả về hàm chạy benchmark, hàm chạy trả về số item đã xử lý)
+Case = Tuple[str, Callable[[BenchContext], Callable[[], int]]]
+
+
+def _parse_api_case(ctx: BenchContext):
+    from crawler.shopee_crawler import ShopeeCrawler
+
+    crawler = ShopeeCrawler(http_only=True)  # chỉ dùng hàm parse, http_only nên không mở Chrome
+    items = _repeat_to([item for page in load_search_items_pages() for item in page.get('items', [])], ctx.parse_items)
+
+    def run():
+        parse = crawler._parse_product_from_api
+        return sum(1 for item in items if parse(item))
+    return run
+
+
+def _parse_html_case(backend: str, kind: str):
+    def setup(ctx: BenchContext):
+        parser = PARSER_BACKENDS[backend]()
+        pages = [html for _, html in load_html(kind)]
+        cards_per_round = sum(len(parser.parse_page(html)) for html in pages) or 1
+        rounds = max(1, ctx.parse_items // 10 // cards_per_round)
+
+        def run():
+            return sum(len(parser.parse_page(html)) for _ in range(rounds) for html in pages)
+        return run
+    return setup
+
+
+def _build_case(ctx: BenchContext):
+    def run():
+        return len(build_products(ctx.count))
+    return run
+
+
+def _build_batch_case(ctx: BenchContext):
+    products = ctx.products
+
+    def run():
+        return len(ProductBatch(products))
+    return run
+
+
+def _sort_case(ctx: BenchContext):
+    products = ctx.products
+
+    def run():
+        ProductSorter.sort(products, SORT_KEYS)
+        return len(products)
+    return run
+
+
+def _top_k_case(ctx: BenchContext):
+    products = ctx.products
+
+    def run():
+        ProductSorter.top_k(products, SORT_KEYS, 100)
+        return len(products)
+    return run
+
+
+def _top_k_batch_case(ctx: BenchContext):
+    batch = ctx.batch
+
+    def run():
+        ProductSorter.top_k(batch, SORT_KEYS, 100)
+        return len(batch)
+    return run
+
+
+def _filter_case(ctx: BenchContext):
+    products = ctx.products
+
+    def run():
+        FILTER.apply(products)
+        return len(products)
+    return run
+
+
+def _export_case(extension: str):
+    def setup(ctx: BenchContext):
+        from storage.product_files import write_products
+
+        products = ctx.products[:ctx.export_count]
+        path = os.path.join(ctx.tmp_dir, f"export.{extension}")
+
+        def run():
+            return write_products(products, path)
+        return run
+    return setup
+
+
+def all_cases() -> List[Case]:
+    cases: List[Case] = [('parse_api_items', _parse_api_case)]
+    for backend in PARSER_BACKENDS:
+        for kind in ('search', 'shop'):
+            cases.append((f'parse_html_{backend}_{kind}', _parse_html_case(backend, kind)))
+    cases += [
+        ('build_products', _build_case),
+        ('build_product_batch', _build_batch_case),
+        ('sort_multi_key', _sort_case),
+        ('top_k_100', _top_k_case),
+        ('top_k_100_batch', _top_k_batch_case),
+        ('filter', _filter_case),
+        ('export_jsonl', _export_case('jsonl')),
+        ('export_csv', _export_case('csv')),
+        ('export_parquet', _export_case('parquet')),
+    ]
+    return cases
+
+
+def measure(run: Callable[[], int], repeat: int, memory: bool) -> Dict:
+    """Chạy `repeat` lần lấy thời gian tốt nhất, thêm một lần với tracemalloc để đo bộ nhớ cao nhất"""
+    best, items = float('inf'), 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = run()
+        best = min(best, time.perf_counter() - start)
+    result = {
+        'seconds': round(best, 6),
+        'items': items,
+        'items_per_second': round(items / best, 1) if best > 0 else 0.0,
+    }
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(args) -> Dict:
+    tmp_dir = tempfile.mkdtemp(prefix='shopee_bench_')
+    ctx = BenchContext(args.count, args.export_count, args.parse_items, tmp_dir)
+    results = {}
+    print(f"{'case':28} {'time':>10} {'items/s':>14} {'peak MB':>9}")
+    for name, setup in all_cases():
+        if args.only and not any(part in name for part in args.only.split(',')):
+            continue
+        try:
+            run = setup(ctx)
+            result = measure(run, args.repeat, not args.no_memory)
+        except ImportError as e:
+            print(f"{name:28} bỏ qua ({e})")
+            continue
+        results[name] = result
+        peak = f"{result['peak_mb']:9.1f}" if 'peak_mb' in result else f"{'-':>9}"
+        print(f"{name:28} {result['seconds'] * 1000:8.1f}ms {result['items_per_second']:14,.0f} {peak}")
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB trên Linux
+    print(f"RSS cao nhất của process: {max_rss:.0f} MB")
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'count': args.count,
+            'export_count': args.export_count,
+            'parse_items': args.parse_items,
+            'created_at': time.time(),
+            'max_rss_mb': round(max_rss, 1),
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """In chênh lệch so với mốc, trả về danh sách case chậm hơn / tốn bộ nhớ hơn quá ngưỡng"""
+    regressions = []
+    base_meta, meta = baseline.get('meta', {}), current['meta']
+    if base_meta.get('count') != meta['count']:
+        print(f"⚠️ Mốc chạy với count={base_meta.get('count')}, lần này count={meta['count']}")
+    print(f"\n{'case':28} {'mốc':>10} {'hiện tại':>10} {'thời gian':>10} {'bộ nhớ':>10}")
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            print(f"{name:28} (không có trong mốc)")
+            continue
+        time_ratio = result['seconds'] / base['seconds'] if base['seconds'] else 1.0
+        memory_text = ''
+        slower = time_ratio > 1 + threshold
+        bigger = False
+        if 'peak_mb' in result and 'peak_mb' in base and base['peak_mb']:
+            memory_ratio = result['peak_mb'] / base['peak_mb']
+            memory_text = f"{(memory_ratio - 1) * 100:+.0f}%"
+            # Bỏ qua chênh lệch nhỏ (dưới 1MB) của các case ít bộ nhớ
+            bigger = memory_ratio > 1 + threshold and result['peak_mb'] - base['peak_mb'] > 1
+        flag = ' ❌' if slower or bigger else (' ✅' if time_ratio < 1 - threshold else '')
+        print(f"{name:28} {base['seconds'] * 1000:8.1f}ms {result['seconds'] * 1000:8.1f}ms "
+              f"{(time_ratio - 1) * 100:+9.0f}% {memory_text:>10}{flag}")
+        if slower or bigger:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000000, help='Số sản phẩm tổng hợp cho build/sort/filter')
+    parser.add_argument('--export-count', type=int, default=200000, help='Số sản phẩm khi đo xuất file')
+    parser.add_argument('--parse-items', type=int, default=60000, help='Số item JSON khi đo parse API')
+    parser.add_argument('--quick', action='store_true', help='Chạy nhanh: 100k sản phẩm, 20k khi xuất file')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', help='Chỉ chạy case có tên chứa một trong các chuỗi (phân cách bằng dấu phẩy)')
+    parser.add_argument('--no-memory', action='store_true', help='Không đo bộ nhớ (tracemalloc làm chậm thêm một lần chạy)')
+    parser.add_argument('--save', help='Lưu kết quả ra file JSON (làm mốc)')
+    parser.add_argument('--compare', help='File kết quả mốc để so sánh')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Ngưỡng chậm hơn / tốn bộ nhớ hơn (0.2 = 20%%)')
+    args = parser.parse_args()
+    if args.quick:
+        args.count, args.export_count, args.parse_items = 100000, 20000, 12000
+
+    current = run_suite(args)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"Đã lưu kết quả vào {args.save}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Chậm hơn / tốn bộ nhớ hơn mốc quá {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n✅ Không case nào chậm hơn mốc quá {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Dòng lệnh không cần nhập tay (chạy được trong script / cron).
+Các module nặng (selenium, pandas, pyarrow...) chỉ được import trong lệnh cần tới.
+
+Chạy từ thư mục gốc:
+    python cli.py crawl keyword "áo thun" --limit 200 --http-only --output ao_thun.jsonl
+    python cli.py crawl category 11036032 --limit 500 --min-rating 4 --sort=-sales --output cat.parquet
+    python cli.py crawl shop 326544948 --limit 100 --output shop.xlsx
+    python cli.py crawl keyword "áo thun" --limit 5000 --checkpoint ao_thun.ckpt.json --output ao_thun.jsonl
+    python cli.py crawl resume --checkpoint ao_thun.ckpt.json --output ao_thun.jsonl
+    python cli.py sort ao_thun.jsonl --by=-commission,price --top 100 --output top.csv
+    python cli.py export ao_thun.jsonl ao_thun.xlsx
+(`python main.py <lệnh>` tương đương `python cli.py <lệnh>`)
+"""
+import argparse
+import sys
+
+# Checkpoint của lần crawl gần nhất trong menu của main.py, dùng để tiếp tục khi bị dừng giữa chừng
+CHECKPOINT_FILE = "shopee_checkpoint.json"
+
+# Tên ngắn cho các trường hay dùng khi sắp xếp
+SORT_ALIASES = {
+    'commission': 'commission_rate',
+    'sales': 'sales_count',
+    'sold': 'sales_count',
+}
+# Các trường thiếu giá trị được coi là 0 khi sắp xếp (giống menu của main.py)
+ZERO_FILL_FIELDS = ('commission_rate', 'rating')
+
+
+def parse_sort_keys(value: str):
+    """'-commission,price' -> [SortKey('commission_rate', True, fill=0), SortKey('price')]"""
+    from filters.sorter import SortKey
+
+    keys = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith('-')
+        field = part.lstrip('+-')
+        field = SORT_ALIASES.get(field, field)
+        fill = 0 if field in ZERO_FILL_FIELDS else None
+        keys.append(SortKey(field, descending=descending, fill=fill))
+    return keys
+
+
+def _sort_products(products, sort: str, top):
+    if not sort:
+        return products[:top] if top else products
+    from filters.sorter import ProductSorter
+
+    return ProductSorter.sort(products, parse_sort_keys(sort), limit=top)
+
+
+def _build_filter(args):
+    from filters.product_filter import ProductFilter
+
+    product_filter = ProductFilter(
+        min_price=args.min_price,
+        max_price=args.max_price,
+        min_rating=args.min_rating,
+        min_sales=args.min_sales,
+        locations=args.location,
+        name_contains=args.name_contains
+    )
+    return None if product_filter.is_empty() else product_filter
+
+
+def _import_cookies():
+    from crawler.cookie_helper import get_chrome_cookies, save_cookies_to_file
+
+    print("Đang import cookies từ Chrome...")
+    cookies = get_chrome_cookies()
+    if cookies:
+        save_cookies_to_file(cookies)
+        print("✅ Đã import cookies thành công!")
+    else:
+        print("⚠️ Không tìm thấy cookies (cần đăng nhập Shopee trên Chrome rồi đóng Chrome)")
+
+
+def cmd_crawl(args) -> int:
+    from crawler.shopee_crawler import ShopeeCrawler
+    from storage.product_files import write_products
+
+    if args.import_cookies:
+        _import_cookies()
+
+    store = None
+    if args.store:
+        from storage.product_store import ProductStore
+        store = ProductStore(args.store)
+    sink = None
+    if args.stream:
+        from storage.sinks import open_sink
+        sink = open_sink(args.stream)
+
+    metrics = None
+    if args.stats_file:
+        from crawler.metrics import CrawlMetrics
+        metrics = CrawlMetrics(args.stats_file)
+
+    crawler = None
+    try:
+        crawler = ShopeeCrawler(
+            headless=not args.show_browser, http_only=args.http_only, store=store, sink=sink, metrics=metrics,
+            base_url=args.base_url
+        )
+        checkpoint = args.checkpoint or None
+        if args.mode == 'resume':
+            if not checkpoint:
+                print("Cần --checkpoint <file> để tiếp tục")
+                return 2
+            products = crawler.resume(checkpoint)
+        else:
+            product_filter = _build_filter(args)
+            recrawl = bool(store) and not args.full
+            if args.mode == 'keyword':
+                products = crawler.crawl_by_keyword(
+                    args.target, limit=args.limit, sort_by=args.sort_by, recrawl=recrawl,
+                    product_filter=product_filter, checkpoint=checkpoint
+                )
+            elif args.mode == 'category':
+                products = crawler.crawl_by_category(
+                    int(args.target), limit=args.limit, sort_by=args.sort_by, recrawl=recrawl,
+                    product_filter=product_filter, checkpoint=checkpoint
+                )
+            else:
+                products = crawler.crawl_by_shop(
+                    args.target, limit=args.limit, product_filter=product_filter, checkpoint=checkpoint
+                )
+    except KeyboardInterrupt:
+        if args.checkpoint:
+            print(f"\nĐã hủy. Tiếp tục bằng: python cli.py crawl resume --checkpoint {args.checkpoint}")
+        else:
+            print("\nĐã hủy. Thêm --checkpoint <file> để có thể tiếp tục lần sau")
+        return 130
+    finally:
+        if sink:
+            sink.close()
+            print(f"Đã ghi {sink.count} sản phẩm vào {sink.path}")
+        if crawler:
+            crawler.close()
+        if store:
+            store.close()
+        if metrics:
+            metrics.report()
+
+    if not products:
+        print("Không tìm thấy sản phẩm nào!")
+        return 1
+    products = _sort_products(products, args.sort, args.top)
+    if args.output:
+        count = write_products(products, args.output)
+        print(f"Đã lưu {count} sản phẩm vào {args.output}")
+    print(f"Đã crawl được {len(products)} sản phẩm!")
+    return 0
+
+
+def cmd_sort(args) -> int:
+    from storage.product_files import read_products, write_products
+
+    products = _sort_products(read_products(args.input), args.by, args.top)
+    output = args.output or args.input
+    count = write_products(products, output)
+    print(f"Đã lưu {count} sản phẩm vào {output}")
+    return 0
+
+
+def cmd_export(args) -> int:
+    from storage.product_files import iter_products, write_products
+
+    count = write_products(iter_products(args.input), args.output)
+    print(f"Đã lưu {count} sản phẩm vào {args.output}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='cli.py', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    crawl = commands.add_parser('crawl', help='Crawl theo keyword / category / shop, hoặc tiếp tục từ checkpoint')
+    crawl.add_argument('mode', choices=('keyword', 'category', 'shop', 'resume'))
+    crawl.add_argument('target', nargs='?', help='Keyword, category ID hoặc shop ID')
+    crawl.add_argument('--limit', type=int, default=60, help='Số sản phẩm cần crawl')
+    crawl.add_argument('--sort-by', default='ctime', choices=('ctime', 'sales', 'price', 'pop'),
+                       help='Thứ tự kết quả phía Shopee (keyword/category)')
+    crawl.add_argument('--output', '-o', help='File kết quả (.json/.jsonl/.csv/.parquet/.xlsx)')
+    crawl.add_argument('--sort', help='Sắp xếp trước khi lưu, vd. --sort=-commission,price (dấu - là giảm dần)')
+    crawl.add_argument('--top', type=int, help='Chỉ giữ N sản phẩm đầu sau khi sắp xếp')
+    crawl.add_argument('--import-cookies', action='store_true', help='Import cookies từ Chrome đã đăng nhập')
+    crawl.add_argument('--show-browser', action='store_true', help='Hiển thị browser thay vì chạy ẩn')
+    crawl.add_argument('--http-only', action='store_true', help='Crawl keyword/category chỉ bằng HTTP')
+    crawl.add_argument('--store', help='Lưu vào database SQLite và chỉ crawl phần mới, vd. shopee_products.db')
+    crawl.add_argument('--full', action='store_true', help='Với --store: vẫn crawl đủ limit, không dừng ở trang cũ')
+    crawl.add_argument('--stream', help='Ghi dần kết quả ra file .jsonl/.csv/.parquet trong lúc crawl')
+    crawl.add_argument('--checkpoint', help='Lưu checkpoint vào file này để tiếp tục bằng "crawl resume" (mặc định không lưu)')
+    crawl.add_argument('--stats-file', help='Ghi thời gian từng giai đoạn và bộ đếm ra file JSON')
+    crawl.add_argument('--base-url', help='Địa chỉ thay cho https://shopee.vn, vd. server giả lập python -m devserver')
+    crawl.add_argument('--min-price', type=float)
+    crawl.add_argument('--max-price', type=float)
+    crawl.add_argument('--min-rating', type=float)
+    crawl.add_argument('--min-sales', type=int)
+    crawl.add_argument('--location', action='append', help='Nơi bán (lặp lại để chọn nhiều nơi)')
+    crawl.add_argument('--name-contains')
+    crawl.set_defaults(func=cmd_crawl)
+
+    sort = commands.add_parser('sort', help='Sắp xếp file sản phẩm đã xuất')
+    sort.add_argument('input')
+    sort.add_argument('--by', required=True, help='Tiêu chí, vd. --by=-sales,price (dấu - là giảm dần)')
+    sort.add_argument('--top', type=int, help='Chỉ giữ N sản phẩm đầu')
+    sort.add_argument('--output', '-o', help='File kết quả (mặc định ghi đè file đầu vào)')
+    sort.set_defaults(func=cmd_sort)
+
+    export = commands.add_parser('export', help='Chuyển file sản phẩm sang định dạng khác')
+    export.add_argument('input')
+    export.add_argument('output')
+    export.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'crawl' and args.mode != 'resume' and not args.target:
+        parser.error(f"crawl {args.mode} cần target")
+    if args.command == 'crawl' and args.mode == 'category' and not args.target.isdigit():
+        parser.error(f"category ID phải là số: {args.target}")
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
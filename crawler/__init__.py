@@ -1,5 +1,11 @@
-from .shopee_crawler import ShopeeCrawler
-
 __all__ = ['ShopeeCrawler']
 
 
+def __getattr__(name):
+    # Import khi dùng tới để `import crawler.xxx` không phải tải cả ShopeeCrawler
+    if name == 'ShopeeCrawler':
+        from .shopee_crawler import ShopeeCrawler
+        return ShopeeCrawler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
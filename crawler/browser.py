@@ -0,0 +1,127 @@
+"""
+Các hàm dùng chung để tạo Chrome driver và nạp cookies Shopee
+"""
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+# Số giây từ 1601-01-01 (mốc thời gian của Chrome/Windows) tới 1970-01-01
+WINDOWS_EPOCH_OFFSET = 11644473600
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def build_chrome_options(headless: bool = True):
+    """Tạo Chrome options chuẩn cho crawler"""
+    # Import selenium khi cần mở browser, chế độ HTTP-only không phải tải selenium
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless=new')  # Dùng headless mới
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # Không bật performance log: response API được bắt trực tiếp bởi NetworkCapture,
+    # để bật thì chromedriver giữ toàn bộ log trong bộ nhớ cho tới khi được đọc
+    return chrome_options
+
+
+def create_chrome_driver(headless: bool = True):
+    """Khởi tạo Selenium WebDriver"""
+    from selenium import webdriver
+
+    try:
+        driver = webdriver.Chrome(options=build_chrome_options(headless))
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Set window size
+        driver.set_window_size(1920, 1080)
+        return driver
+    except Exception as e:
+        print(f"Lỗi khởi tạo Chrome driver: {e}")
+        print("Đảm bảo đã cài đặt Chrome và ChromeDriver")
+        raise
+
+
+def normalize_cookie(cookie: Dict) -> Dict:
+    """Chuẩn hóa cookie (domain, expiry, các trường bắt buộc) để add vào Selenium"""
+    cookie = dict(cookie)
+
+    # Đảm bảo domain đúng
+    if 'domain' in cookie:
+        # Chỉnh domain nếu cần
+        domain = cookie['domain']
+        if domain.startswith('.'):
+            domain = domain[1:]
+        cookie['domain'] = domain
+
+    # Xử lý expiry
+    if 'expiry' in cookie and cookie['expiry']:
+        # Chuyển từ Windows timestamp (micro giây từ 1601, expires_utc của Chrome) sang Unix timestamp nếu cần
+        expiry = cookie['expiry']
+        if expiry > 10000000000000000:  # Windows timestamp
+            expiry = expiry / 1000000 - WINDOWS_EPOCH_OFFSET
+        cookie['expiry'] = int(expiry)
+
+    # Đảm bảo có các trường bắt buộc
+    if 'path' not in cookie:
+        cookie['path'] = '/'
+    if 'secure' not in cookie:
+        cookie['secure'] = False
+    if 'httpOnly' not in cookie:
+        cookie['httpOnly'] = False
+    return cookie
+
+
+def add_cookies(driver, cookies: List[Dict]) -> int:
+    """Add cookies vào driver, trả về số cookie add thành công"""
+    loaded_count = 0
+    for cookie in cookies:
+        try:
+            driver.add_cookie(normalize_cookie(cookie))
+            loaded_count += 1
+        except Exception:
+            continue
+    return loaded_count
+
+
+def load_cookies_from_file(
+    driver,
+    cookies_file: str,
+    base_url: str,
+    navigate: Optional[Callable[[str], None]] = None
+) -> bool:
+    """
+    Load cookies từ file vào driver: mở trang chủ, thay toàn bộ cookies rồi refresh.
+    navigate: hàm mở URL (mặc định driver.get), crawler truyền vào để đi qua rate limiter
+    """
+    if not os.path.exists(cookies_file):
+        return False
+    try:
+        # Truy cập trang chủ trước
+        (navigate or driver.get)(base_url)
+        time.sleep(2)
+
+        with open(cookies_file, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+
+        # Xóa cookies cũ trước
+        driver.delete_all_cookies()
+
+        # Load cookies mới
+        loaded_count = add_cookies(driver, cookies)
+        if loaded_count > 0:
+            print(f"✅ Đã load {loaded_count}/{len(cookies)} cookies từ file")
+            # Refresh để áp dụng cookies
+            driver.refresh()
+            time.sleep(3)
+            return True
+    except Exception as e:
+        print(f"⚠️ Không thể load cookies: {e}")
+    return False
@@ -0,0 +1,187 @@
+"""
+Checkpoint cho crawl dài: lưu vị trí (offset newest / vị trí scroll, các sản phẩm đã thấy)
+và sản phẩm đã lấy được để tiếp tục sau khi bị lỗi, CAPTCHA hoặc Ctrl+C
+"""
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.product import FIELDS, Product
+
+
+def _atomic_write(path: str, text: str):
+    """Ghi file tạm rồi đổi tên để file không bị hỏng giữa chừng"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class CrawlCheckpoint:
+    """
+    Checkpoint của một lần crawl (keyword / category / shop):
+    - cursor: offset `newest` của trang API kế tiếp, hoặc vị trí scroll của trang shop
+    - seen: các (shop_id, product_id) đã xử lý (trang shop)
+    - sản phẩm được ghi nối vào file `<path>.products.jsonl`, file checkpoint chỉ lưu số dòng hợp lệ,
+      nên mỗi lần lưu không phải ghi lại toàn bộ sản phẩm
+    """
+
+    def __init__(
+        self,
+        path: str,
+        kind: str,
+        target: str,
+        limit: int,
+        sort_by: str = "ctime",
+        options: Optional[Dict] = None
+    ):
+        self.path = path
+        self.products_path = f"{path}.products.jsonl"
+        self.kind = kind
+        self.target = str(target)
+        self.limit = limit
+        self.sort_by = sort_by
+        self.options = dict(options or {})
+        self.cursor = 0
+        self.seen: Set[Tuple[str, str]] = set()
+        self.product_count = 0
+        self.done = False
+        self.updated_at = time.time()
+
+    @classmethod
+    def load(cls, path: str) -> Optional["CrawlCheckpoint"]:
+        """Đọc checkpoint, trả về None nếu chưa có hoặc file hỏng"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            checkpoint = cls(path, data['kind'], data['target'], data['limit'], data['sort_by'], data['options'])
+            checkpoint.cursor = data['cursor']
+            checkpoint.seen = {tuple(key) for key in data['seen']}
+            checkpoint.product_count = data['product_count']
+            checkpoint.done = data['done']
+            checkpoint.updated_at = data['updated_at']
+            return checkpoint
+        except Exception as e:
+            print(f"⚠️ Không đọc được checkpoint {path}: {e}")
+            return None
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        kind: str,
+        target: str,
+        limit: int,
+        sort_by: str = "ctime",
+        options: Optional[Dict] = None
+    ) -> "CrawlCheckpoint":
+        """
+        Tiếp tục checkpoint cũ nếu nó chưa xong và cùng job (kind, target, sort_by, options),
+        không thì bắt đầu checkpoint mới (checkpoint đã xong không được dùng lại, tránh trả kết quả cũ)
+        """
+        checkpoint = cls.load(path)
+        if checkpoint and not checkpoint.done and checkpoint.matches(kind, target, sort_by, options):
+            # Cho phép tăng limit khi resume
+            checkpoint.limit = max(checkpoint.limit, limit)
+            print(f"♻️  Tiếp tục từ checkpoint: {checkpoint.product_count} sản phẩm, vị trí {checkpoint.cursor}")
+            return checkpoint
+        checkpoint = cls(path, kind, target, limit, sort_by, options)
+        if os.path.exists(checkpoint.products_path):
+            os.remove(checkpoint.products_path)
+        checkpoint.save()
+        return checkpoint
+
+    def matches(self, kind: str, target: str, sort_by: str = "ctime", options: Optional[Dict] = None) -> bool:
+        """Cùng job: so sánh cả thứ tự sắp xếp và tùy chọn (recrawl, bộ lọc) sau khi qua JSON như lúc lưu"""
+        normalized = json.loads(json.dumps(dict(options or {}), ensure_ascii=False))
+        return (
+            self.kind == kind and self.target == str(target)
+            and self.sort_by == sort_by and self.options == normalized
+        )
+
+    def save(self):
+        self.updated_at = time.time()
+        _atomic_write(self.path, json.dumps({
+            'kind': self.kind,
+            'target': self.target,
+            'limit': self.limit,
+            'sort_by': self.sort_by,
+            'options': self.options,
+            'cursor': self.cursor,
+            'seen': sorted(self.seen),
+            'product_count': self.product_count,
+            'done': self.done,
+            'updated_at': self.updated_at,
+        }, ensure_ascii=False))
+
+    def products(self) -> List[Product]:
+        """Các sản phẩm đã lưu (bỏ các dòng ghi sau lần lưu checkpoint cuối)"""
+        products = []
+        if not self.product_count or not os.path.exists(self.products_path):
+            return products
+        with open(self.products_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if len(products) >= self.product_count:
+                    break
+                products.append(Product.from_dict(json.loads(line)))
+        return products
+
+    @staticmethod
+    def _lines(products: Iterable[Product]) -> str:
+        return ''.join(
+            json.dumps({field: getattr(p, field) for field in FIELDS}, ensure_ascii=False) + '\n'
+            for p in products
+        )
+
+    def record(
+        self,
+        products: List[Product],
+        cursor: Optional[int] = None,
+        seen: Optional[Iterable[Tuple[str, str]]] = None
+    ):
+        """Ghi nối các sản phẩm mới rồi lưu vị trí mới"""
+        if products:
+            if self.product_count == 0:
+                mode = 'w'
+            else:
+                # Cắt các dòng thừa từ lần ghi bị dừng giữa chừng trước khi ghi nối
+                self._truncate_products()
+                mode = 'a'
+            with open(self.products_path, mode, encoding='utf-8') as f:
+                f.write(self._lines(products))
+                f.flush()
+                os.fsync(f.fileno())
+            self.product_count += len(products)
+        if cursor is not None:
+            self.cursor = cursor
+        if seen is not None:
+            self.seen = set(seen)
+        self.save()
+
+    def _truncate_products(self):
+        if not os.path.exists(self.products_path):
+            self.product_count = 0
+            return
+        with open(self.products_path, 'r+b') as f:
+            for _ in range(self.product_count):
+                if not f.readline():
+                    break
+            f.truncate(f.tell())
+
+    def finish(self, products: List[Product]):
+        """Đánh dấu crawl đã xong, lưu danh sách sản phẩm cuối cùng"""
+        _atomic_write(self.products_path, self._lines(products))
+        self.product_count = len(products)
+        self.done = True
+        self.save()
+
+    def remove(self):
+        """Xóa checkpoint và file sản phẩm"""
+        for path in (self.path, self.products_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -5,8 +5,48 @@ import json
 import os
 import sqlite3
 import shutil
+import tempfile
 from pathlib import Path
 
+COOKIES_QUERY = """
+    SELECT name, value, host_key, path, expires_utc, is_secure, is_httponly
+    FROM cookies
+    WHERE host_key LIKE '%shopee.vn%'
+"""
+
+# Cookies đã parse theo (đường dẫn, mtime, size) của file Cookies, tránh đọc / copy lại khi file không đổi
+_cookies_cache = {}
+
+
+def _read_cookie_rows(cookies_path):
+    """
+    Đọc cookies Shopee từ database Cookies của Chrome: mở trực tiếp ở chế độ chỉ đọc (immutable, không cần lock);
+    nếu Chrome đang giữ file thì mới copy ra thư mục tạm và xóa bản copy sau khi đọc
+    """
+    uri = Path(cookies_path).resolve().as_uri() + "?mode=ro&immutable=1"
+    try:
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            return conn.execute(COOKIES_QUERY).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+    # Copy file cookies ra ngoài Chrome profile để tránh lock
+    temp_dir = tempfile.mkdtemp(prefix="shopee_cookies_")
+    try:
+        temp_cookies = os.path.join(temp_dir, "Cookies")
+        shutil.copy2(cookies_path, temp_cookies)
+        conn = sqlite3.connect(temp_cookies)
+        try:
+            return conn.execute(COOKIES_QUERY).fetchall()
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 def get_chrome_cookies():
     """Lấy cookies từ Chrome profile"""
     cookies = []
@@ -20,35 +60,24 @@ def get_chrome_cookies():
     for cookies_path in chrome_paths:
         if os.path.exists(cookies_path):
             try:
-                # Copy file cookies để tránh lock
-                temp_cookies = cookies_path + "_temp"
-                shutil.copy2(cookies_path, temp_cookies)
-                
-                # Kết nối database
-                conn = sqlite3.connect(temp_cookies)
-                cursor = conn.cursor()
-                
-                # Lấy cookies của shopee.vn
-                cursor.execute("""
-                    SELECT name, value, host_key, path, expires_utc, is_secure, is_httponly
-                    FROM cookies
-                    WHERE host_key LIKE '%shopee.vn%'
-                """)
-                
-                for row in cursor.fetchall():
-                    cookie = {
-                        'name': row[0],
-                        'value': row[1],
-                        'domain': row[2],
-                        'path': row[3] if row[3] else '/',
-                        'expiry': row[4] if row[4] else None,
-                        'secure': bool(row[5]),
-                        'httpOnly': bool(row[6])
-                    }
-                    cookies.append(cookie)
-                
-                conn.close()
-                os.remove(temp_cookies)
+                stat = os.stat(cookies_path)
+                key = (cookies_path, stat.st_mtime_ns, stat.st_size)
+                if key in _cookies_cache:
+                    cookies = _cookies_cache[key]
+                else:
+                    cookies = []
+                    for row in _read_cookie_rows(cookies_path):
+                        cookie = {
+                            'name': row[0],
+                            'value': row[1],
+                            'domain': row[2],
+                            'path': row[3] if row[3] else '/',
+                            'expiry': row[4] if row[4] else None,
+                            'secure': bool(row[5]),
+                            'httpOnly': bool(row[6])
+                        }
+                        cookies.append(cookie)
+                    _cookies_cache[key] = cookies
                 
                 if cookies:
                     print(f"✅ Đã tìm thấy {len(cookies)} cookies từ Chrome profile")
@@ -56,11 +85,6 @@ def get_chrome_cookies():
                     
             except Exception as e:
                 print(f"⚠️ Không thể đọc cookies từ {cookies_path}: {e}")
-                if os.path.exists(temp_cookies):
-                    try:
-                        os.remove(temp_cookies)
-                    except:
-                        pass
     
     return cookies
 
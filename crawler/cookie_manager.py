@@ -0,0 +1,187 @@
+"""
+Quản lý cookies Shopee đã lưu (shopee_cookies.json) khi mở browser:
+- Bộ cookies đã chuẩn hóa (domain, expiry Windows epoch -> Unix...) được cache theo mtime của file
+- Kiểm tra còn hạn từ expiry đã lưu, và bằng một request search_items nhỏ (kết quả cache ttl giây)
+- Cookies còn dùng được thì nạp thẳng vào Chrome qua CDP Network.setCookies, không phải mở trang chủ,
+  chờ, xóa / add từng cookie rồi refresh như load_cookies_from_file
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .browser import USER_AGENT, load_cookies_from_file, normalize_cookie
+
+# Cookie phiên đăng nhập / thiết bị của Shopee, dùng để xét còn hạn nếu có trong file
+SESSION_COOKIE_NAMES = ('SPC_EC', 'SPC_ST', 'SPC_U', 'SPC_F')
+
+VALIDATE_PATH = "/api/v4/search/search_items"
+VALIDATE_PARAMS = {
+    'by': 'relevancy', 'keyword': 'a', 'limit': 1, 'newest': 0, 'order': 'desc',
+    'page_type': 'search', 'scenario': 'PAGE_GLOBAL_SEARCH', 'version': 2,
+}
+
+# Cache dùng chung trong process (nhiều crawler / driver của pool cùng đọc một file cookies)
+_cache_lock = threading.Lock()
+_jar_cache: Dict[str, Tuple[Tuple[int, int], List[Dict]]] = {}
+_validation_cache: Dict[Tuple[str, Tuple[int, int], str], Tuple[float, bool]] = {}
+
+
+class CookieManager:
+    """
+    Cookies đã lưu của một file:
+    - jar(): danh sách cookie đã chuẩn hóa (đọc lại file chỉ khi file đổi)
+    - is_fresh(): cookie phiên chưa hết hạn (còn ít nhất margin giây)
+    - validate(): request HTTP nhẹ bằng cookies để chắc Shopee còn chấp nhận
+    - load_into(driver): fast path CDP nếu cookies còn dùng được, ngược lại mở trang chủ như cũ
+    """
+
+    def __init__(
+        self,
+        cookies_file: str = "shopee_cookies.json",
+        base_url: str = "https://shopee.vn",
+        margin: float = 300,
+        validation_ttl: float = 600,
+        validate_request: bool = True
+    ):
+        self.cookies_file = cookies_file
+        self.base_url = base_url.rstrip('/')
+        self.margin = margin
+        self.validation_ttl = validation_ttl
+        self.validate_request = validate_request
+
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.cookies_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def jar(self) -> List[Dict]:
+        """Cookies đã chuẩn hóa của file, rỗng nếu chưa có file hoặc file hỏng"""
+        version = self._file_version()
+        if version is None:
+            return []
+        path = os.path.abspath(self.cookies_file)
+        with _cache_lock:
+            cached = _jar_cache.get(path)
+            if cached and cached[0] == version:
+                return cached[1]
+        try:
+            with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                cookies = [normalize_cookie(cookie) for cookie in json.load(f)]
+        except Exception as e:
+            print(f"⚠️ Không đọc được cookies {self.cookies_file}: {e}")
+            return []
+        with _cache_lock:
+            _jar_cache[path] = (version, cookies)
+        return cookies
+
+    def expires_at(self) -> Optional[float]:
+        """Thời điểm cookie phiên sớm hết hạn nhất (None nếu không có cookie nào có expiry)"""
+        cookies = self.jar()
+        session_cookies = [c for c in cookies if c['name'] in SESSION_COOKIE_NAMES] or cookies
+        expiries = [c['expiry'] for c in session_cookies if c.get('expiry')]
+        return min(expiries) if expiries else None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Có cookies và cookie phiên chưa hết hạn (cookie không có expiry coi như còn hạn)"""
+        if not self.jar():
+            return False
+        expires_at = self.expires_at()
+        return expires_at is None or expires_at > (now or time.time()) + self.margin
+
+    def validate(self, before_request: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Gọi search_items 1 sản phẩm bằng cookies đã lưu, True nếu Shopee trả dữ liệu.
+        Kết quả được cache validation_ttl giây cho tới khi file cookies đổi.
+        before_request: gọi trước request (crawler truyền rate limiter vào)
+        """
+        version = self._file_version()
+        if version is None:
+            return False
+        key = (os.path.abspath(self.cookies_file), version, self.base_url)
+        with _cache_lock:
+            cached = _validation_cache.get(key)
+        if cached and time.time() - cached[0] < self.validation_ttl:
+            return cached[1]
+
+        import requests
+
+        url = f"{self.base_url}{VALIDATE_PATH}"
+        valid = False
+        try:
+            if before_request:
+                before_request(url)
+            response = requests.get(
+                url,
+                params=VALIDATE_PARAMS,
+                cookies={cookie['name']: cookie['value'] for cookie in self.jar()},
+                headers={'User-Agent': USER_AGENT, 'Accept': 'application/json', 'X-API-Source': 'pc',
+                         'Referer': f"{self.base_url}/"},
+                timeout=10
+            )
+            if response.status_code == 200:
+                data = response.json()
+                # Shopee trả 200 kèm mã lỗi khi session không hợp lệ
+                valid = not (data.get('error') and not data.get('items'))
+        except Exception as e:
+            print(f"⚠️ Không kiểm tra được cookies: {e}")
+        with _cache_lock:
+            _validation_cache[key] = (time.time(), valid)
+        return valid
+
+    def usable(self, before_request: Optional[Callable[[str], None]] = None) -> bool:
+        """Cookies còn hạn và (nếu bật validate_request) được Shopee chấp nhận"""
+        if not self.is_fresh():
+            return False
+        return not self.validate_request or self.validate(before_request)
+
+    @staticmethod
+    def _cdp_cookie(cookie: Dict) -> Dict:
+        cdp_cookie = {
+            'name': cookie['name'],
+            'value': cookie['value'],
+            'domain': cookie.get('domain', 'shopee.vn'),
+            'path': cookie.get('path', '/'),
+            'secure': bool(cookie.get('secure')),
+            'httpOnly': bool(cookie.get('httpOnly')),
+        }
+        if cookie.get('expiry'):
+            cdp_cookie['expires'] = cookie['expiry']
+        if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+            cdp_cookie['sameSite'] = cookie['sameSite']
+        return cdp_cookie
+
+    def set_via_cdp(self, driver) -> bool:
+        """Nạp toàn bộ cookies bằng một lệnh CDP, không cần đang mở trang của domain"""
+        cookies = self.jar()
+        if not cookies or not hasattr(driver, 'execute_cdp_cmd'):
+            return False
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [self._cdp_cookie(c) for c in cookies]})
+            return True
+        except Exception as e:
+            print(f"⚠️ Không nạp được cookies qua CDP: {e}")
+            return False
+
+    def load_into(
+        self,
+        driver,
+        navigate: Optional[Callable[[str], None]] = None,
+        before_request: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Nạp cookies vào driver. Trả về cách đã nạp: 'cdp' (cookies còn dùng được, không mở trang),
+        'navigate' (mở trang chủ rồi refresh để Shopee cấp cookies mới) hoặc None nếu không nạp được.
+        navigate: hàm mở URL (mặc định driver.get), before_request: gọi trước request kiểm tra
+        """
+        if not self.jar():
+            return None
+        if self.usable(before_request) and self.set_via_cdp(driver):
+            print(f"✅ Đã nạp {len(self.jar())} cookies còn hạn (không cần mở trang chủ)")
+            return 'cdp'
+        if load_cookies_from_file(driver, self.cookies_file, self.base_url, navigate=navigate):
+            return 'navigate'
+        return None
@@ -0,0 +1,149 @@
+"""
+Lấy dữ liệu card sản phẩm từ DOM: một script cho cả trang thay vì nhiều lệnh WebDriver mỗi card
+"""
+from typing import Dict, List, Optional, Sequence
+
+# Các selector card sản phẩm trên trang search
+CARD_SELECTORS = (
+    "a[href*='/product/']",
+    "div[class*='shopee-search-item-result'] a",
+    "div[class*='col-xs-2-4'] a",
+    "div[data-sqe='item'] a",
+    "[class*='product-item'] a",
+    "[class*='search-result'] a",
+)
+
+LINK_SELECTOR = "a[href*='/product/']"
+NAME_SELECTOR = "[class*='name'], [class*='title'], [class*='product-name']"
+PRICE_SELECTOR = "[class*='price'], [class*='final-price']"
+
+# Chạy trong trang: duyệt mọi selector, bỏ trùng theo href, trả về mảng JSON các trường của card
+_EXTRACT_SCRIPT = """
+var selectors = arguments[0], linkSel = arguments[1], nameSel = arguments[2], priceSel = arguments[3];
+var soldRe = /đã\\s*bán[:\\s]*(\\d+(?:\\.\\d+)?[kK]?)/i;
+var seen = {}, cards = [];
+
+function text(el) { return el ? (el.innerText || '').trim() : ''; }
+
+function findLink(el) {
+    if (el.matches(linkSel)) return el;
+    var link = el.querySelector(linkSel);
+    if (!link && el.parentElement) link = el.parentElement.querySelector(linkSel);
+    return link;
+}
+
+for (var s = 0; s < selectors.length; s++) {
+    var elements = document.querySelectorAll(selectors[s]);
+    for (var i = 0; i < elements.length; i++) {
+        var el = elements[i], link = findLink(el);
+        if (!link || !link.href || seen[link.href]) continue;
+        seen[link.href] = true;
+
+        var name = text(el.querySelector(nameSel));
+        if (!name) name = text(el.querySelector('a'));
+        var img = el.querySelector('img');
+        var sold = (el.innerText || '').match(soldRe);
+        cards.push({
+            href: link.href,
+            name: name,
+            price_text: text(el.querySelector(priceSel)),
+            image: img ? (img.getAttribute('src') && img.src || img.getAttribute('data-src') || '') : '',
+            sold_text: sold ? sold[0] : ''
+        });
+    }
+}
+return {links: document.querySelectorAll(linkSel).length, cards: cards};
+"""
+
+
+def extract_cards(driver, selectors: Sequence[str] = CARD_SELECTORS) -> Dict:
+    """
+    Chạy một script duy nhất để lấy mọi card trên trang.
+    Trả về {'links': số link sản phẩm, 'cards': [{href, name, price_text, image, sold_text}, ...]}
+    """
+    result = driver.execute_script(
+        _EXTRACT_SCRIPT, list(selectors), LINK_SELECTOR, NAME_SELECTOR, PRICE_SELECTOR
+    )
+    return result or {'links': 0, 'cards': []}
+
+
+def read_element_fields(element) -> Optional[Dict]:
+    """
+    Đọc các trường của một card bằng các lệnh WebDriver riêng lẻ
+    (5-8 round trip mỗi card, chậm hơn extract_cards nhiều)
+    """
+    from selenium.webdriver.common.by import By
+
+    # Lấy href để extract product_id
+    href = element.get_attribute('href')
+
+    # Nếu element không phải là link, tìm link bên trong
+    if not href or '/product/' not in href:
+        try:
+            # Thử tìm link trong element hoặc parent
+            link_elem = element.find_element(By.CSS_SELECTOR, LINK_SELECTOR)
+            href = link_elem.get_attribute('href')
+        except Exception:
+            try:
+                # Thử tìm trong parent
+                parent = element.find_element(By.XPATH, "./..")
+                link_elem = parent.find_element(By.CSS_SELECTOR, LINK_SELECTOR)
+                href = link_elem.get_attribute('href')
+            except Exception:
+                return None
+
+    if not href or '/product/' not in href:
+        return None
+
+    fields = {'href': href, 'name': '', 'price_text': '', 'image': '', 'sold_text': ''}
+
+    # Lấy tên sản phẩm
+    try:
+        fields['name'] = element.find_element(By.CSS_SELECTOR, NAME_SELECTOR).text
+    except Exception:
+        try:
+            fields['name'] = element.find_element(By.TAG_NAME, "a").text
+        except Exception:
+            pass
+    if not fields['name'].strip():
+        return fields
+
+    # Lấy giá
+    try:
+        fields['price_text'] = element.find_element(By.CSS_SELECTOR, PRICE_SELECTOR).text
+    except Exception:
+        pass
+
+    # Lấy hình ảnh
+    try:
+        img_elem = element.find_element(By.CSS_SELECTOR, "img")
+        fields['image'] = img_elem.get_attribute('src') or img_elem.get_attribute('data-src') or ""
+    except Exception:
+        pass
+
+    # Lấy text để tìm số lượng bán
+    try:
+        fields['sold_text'] = element.text
+    except Exception:
+        pass
+    return fields
+
+
+def extract_cards_per_element(driver, selectors: Sequence[str] = CARD_SELECTORS) -> List[Dict]:
+    """Cách cũ: find_elements cho từng selector rồi đọc từng card bằng WebDriver (dùng để so sánh)"""
+    from selenium.webdriver.common.by import By
+
+    cards = []
+    for selector in selectors:
+        try:
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        except Exception:
+            continue
+        for elem in elements:
+            try:
+                fields = read_element_fields(elem)
+            except Exception:
+                continue
+            if fields:
+                cards.append(fields)
+    return cards
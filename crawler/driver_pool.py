@@ -0,0 +1,176 @@
+"""
+Pool các Chrome driver đã khởi động sẵn và đã nạp cookies, cho các job crawl mượn
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .browser import create_chrome_driver
+from .cookie_manager import CookieManager
+
+
+class DriverPool:
+    """
+    Giữ sẵn `size` Chrome headless đã load cookies.
+    - acquire()/release() hoặc `with pool.lease() as driver:` để mượn driver
+    - Khi trả: kiểm tra driver còn sống, driver hỏng hoặc đã dùng đủ
+      `max_uses` lần sẽ bị đóng và thay bằng driver mới ở background
+    - Pool không còn driver nào (kể cả đang tạo) thì acquire() tự tạo một driver
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        headless: bool = True,
+        max_uses: int = 20,
+        acquire_timeout: float = 300,
+        cookies_file: str = "shopee_cookies.json",
+        base_url: str = "https://shopee.vn"
+    ):
+        self.size = size
+        self.headless = headless
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.cookies_file = cookies_file
+        self.base_url = base_url
+        self.cookie_manager = CookieManager(cookies_file, base_url)
+        self._idle: "queue.Queue" = queue.Queue()
+        self._uses: Dict[int, int] = {}  # driver còn sống (đang rảnh hoặc đang cho mượn)
+        self._pending = 0  # số driver đang được tạo ở background
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Khởi động song song toàn bộ driver một lần cho cả pool
+        print(f"Đang khởi động {size} Chrome cho pool...")
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            for driver in executor.map(lambda _: self._create_driver(), range(size)):
+                if driver:
+                    self._idle.put(driver)
+        print(f"✅ Pool sẵn sàng với {self._idle.qsize()}/{size} driver")
+
+    def _create_driver(self):
+        """Tạo driver mới và nạp cookies"""
+        try:
+            driver = create_chrome_driver(self.headless)
+        except Exception:
+            return None
+        try:
+            self.cookie_manager.load_into(driver)
+        except Exception as e:
+            print(f"⚠️ Không nạp được cookies cho driver mới: {e}")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return None
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _replace_in_background(self):
+        """Tạo driver thay thế để pool luôn đủ driver sẵn sàng"""
+        def worker():
+            try:
+                driver = self._create_driver()
+            finally:
+                with self._lock:
+                    self._pending -= 1
+            if driver is None:
+                return
+            if self._closed:
+                self._quit(driver)
+            else:
+                self._idle.put(driver)
+        with self._lock:
+            self._pending += 1
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        """Driver còn phản hồi và không bị kẹt ở trang CAPTCHA/login"""
+        try:
+            driver.execute_script("return document.readyState")
+            url = driver.current_url
+            return '/verify/captcha' not in url and '/buyer/login' not in url
+        except Exception:
+            return False
+
+    def _exhausted(self) -> bool:
+        """Không còn driver nào sống và cũng không có driver nào đang được tạo"""
+        with self._lock:
+            return not self._uses and self._pending == 0
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Mượn một driver, chờ tối đa `timeout` giây (mặc định acquire_timeout) nếu pool đang bận hết.
+        Pool đã cạn (mọi driver hỏng / tạo lỗi) thì tạo driver mới ngay thay vì chờ.
+        Raise RuntimeError nếu hết thời gian chờ hoặc không tạo được driver
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool đã đóng")
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._idle.empty() and self._exhausted():
+                driver = self._create_driver()
+                if driver is None:
+                    raise RuntimeError("DriverPool không tạo được Chrome driver")
+                return driver
+            try:
+                # Chờ từng đoạn ngắn để phát hiện pool cạn trong lúc đang chờ
+                return self._idle.get(timeout=max(0.0, min(1.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Không mượn được driver từ pool sau {timeout:.0f}s")
+
+    def release(self, driver, discard: bool = False):
+        """Trả driver về pool. discard=True để bỏ driver này và tạo driver mới"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        if self._closed:
+            self._quit(driver)
+        elif discard or uses >= self.max_uses or not self._is_healthy(driver):
+            # Đăng ký driver thay thế trước khi đóng, để acquire() không tưởng pool đã cạn
+            self._replace_in_background()
+            self._quit(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager mượn driver và tự trả lại"""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Đóng toàn bộ driver đang rảnh trong pool"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,271 @@
+"""
+Parser card sản phẩm từ HTML với nhiều backend (BeautifulSoup, lxml) cho cùng kết quả Product
+"""
+import re
+from typing import List, Optional
+
+from models.product import Product
+from .parsing import PRODUCT_URL_RE, RATING_RE, absolute_url, normalize_image_url, parse_price_text, parse_sold_count
+
+PRODUCT_HREF_RE = re.compile(r'/product/')
+CARD_CLASS_RE = re.compile(r'col-xs-2-4|shopee-search-item')
+
+# Mỗi selector có 2 dạng: CSS cho BeautifulSoup và XPath cho lxml
+NAME_SELECTORS = (
+    ('div[class*="name"]', './/div[contains(@class, "name")]'),
+    ('div[class*="product-name"]', './/div[contains(@class, "product-name")]'),
+    ('div[class*="title"]', './/div[contains(@class, "title")]'),
+    ('a[href*="/product/"]', './/a[contains(@href, "/product/")]'),
+)
+PRICE_SELECTORS = (
+    ('span[class*="price"]', './/span[contains(@class, "price")]'),
+    ('div[class*="price"]', './/div[contains(@class, "price")]'),
+    ('[class*="final-price"]', './/*[contains(@class, "final-price")]'),
+    ('[class*="current-price"]', './/*[contains(@class, "current-price")]'),
+)
+CARD_XPATH = (
+    '//div[contains(@class, "col-xs-2-4") or contains(@class, "shopee-search-item")]'
+)
+
+
+class CardParser:
+    """
+    Thuật toán parse chung cho một card; backend chỉ cài đặt các thao tác tìm/đọc node.
+    - parse_element(): parse node của backend
+    - parse_fragment(): parse HTML của một card
+    - parse_page(): parse mọi card trong HTML cả trang
+    """
+
+    name = "base"
+
+    def __init__(self, base_url: str = "https://shopee.vn"):
+        self.base_url = base_url
+
+    # --- Các thao tác backend phải cài đặt ---
+    def fragment_root(self, html: str):
+        raise NotImplementedError
+
+    def page_cards(self, html: str) -> list:
+        raise NotImplementedError
+
+    def find_product_link(self, element):
+        raise NotImplementedError
+
+    def attr(self, element, name: str) -> str:
+        raise NotImplementedError
+
+    def select_first(self, element, selector: tuple):
+        raise NotImplementedError
+
+    def find_img(self, element):
+        raise NotImplementedError
+
+    def text(self, element, strip: bool = False) -> str:
+        raise NotImplementedError
+
+    def first_string_matching(self, element, pattern) -> Optional[str]:
+        raise NotImplementedError
+
+    # --- Thuật toán chung ---
+    def parse_element(self, element, shop_id: Optional[str] = None) -> Optional[Product]:
+        """Parse sản phẩm từ một node card"""
+        try:
+            # Tìm link sản phẩm trước (quan trọng nhất)
+            link_elem = self.find_product_link(element)
+            if link_elem is None:
+                return None
+
+            href = self.attr(link_elem, 'href')
+            if not href:
+                return None
+
+            product_url = absolute_url(href, self.base_url)
+
+            # Extract shop_id và product_id từ URL
+            match = PRODUCT_URL_RE.search(href)
+            if not match:
+                return None
+
+            shop_id = match.group(1)
+            product_id = match.group(2)
+
+            # Tìm tên sản phẩm - thử nhiều selector
+            name = ""
+            for selector in NAME_SELECTORS:
+                name_elem = self.select_first(element, selector)
+                if name_elem is not None:
+                    name = self.text(name_elem, strip=True)
+                    if name:
+                        break
+
+            if not name:
+                name = self.text(link_elem, strip=True)
+
+            if not name:
+                return None
+
+            # Tìm giá - thử nhiều selector
+            price = 0
+            for selector in PRICE_SELECTORS:
+                price_elem = self.select_first(element, selector)
+                if price_elem is not None:
+                    parsed_price = parse_price_text(self.text(price_elem, strip=True))
+                    if parsed_price is not None:
+                        price = parsed_price
+                        break
+
+            # Tìm hình ảnh
+            img_elem = self.find_img(element)
+            image_url = ""
+            if img_elem is not None:
+                image_url = normalize_image_url(self.attr(img_elem, 'src') or self.attr(img_elem, 'data-src'))
+
+            # Tìm số lượng bán
+            sales_count = parse_sold_count(self.text(element))
+
+            # Tìm rating
+            rating = None
+            rating_text = self.first_string_matching(element, RATING_RE)
+            if rating_text:
+                rating = float(RATING_RE.search(rating_text).group(1))
+
+            return Product(
+                name=name,
+                price=price,
+                original_price=None,
+                commission_rate=None,
+                sales_count=sales_count,
+                rating=rating,
+                shop_name="",
+                shop_id=shop_id,
+                product_id=product_id,
+                category="",
+                image_url=image_url,
+                product_url=product_url,
+                location=""
+            )
+        except Exception:
+            return None
+
+    def parse_fragment(self, html: str, shop_id: Optional[str] = None) -> Optional[Product]:
+        """Parse HTML của một card"""
+        return self.parse_element(self.fragment_root(html), shop_id=shop_id)
+
+    def parse_page(self, html: str, shop_id: Optional[str] = None) -> List[Product]:
+        """Parse mọi card (div col-xs-2-4 / shopee-search-item) trong HTML cả trang"""
+        products = []
+        for element in self.page_cards(html):
+            product = self.parse_element(element, shop_id=shop_id)
+            if product:
+                products.append(product)
+        return products
+
+
+class BeautifulSoupParser(CardParser):
+    """Backend BeautifulSoup + html.parser (thuần Python, luôn có sẵn)"""
+
+    name = "bs4"
+
+    def fragment_root(self, html: str):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, 'html.parser')
+
+    def page_cards(self, html: str) -> list:
+        return self.fragment_root(html).find_all('div', class_=CARD_CLASS_RE)
+
+    def find_product_link(self, element):
+        return element.find('a', href=PRODUCT_HREF_RE)
+
+    def attr(self, element, name: str) -> str:
+        return element.get(name, '')
+
+    def select_first(self, element, selector: tuple):
+        return element.select_one(selector[0])
+
+    def find_img(self, element):
+        return element.find('img')
+
+    def text(self, element, strip: bool = False) -> str:
+        return element.get_text(strip=strip)
+
+    def first_string_matching(self, element, pattern) -> Optional[str]:
+        found = element.find(string=pattern)
+        return str(found) if found else None
+
+
+class LxmlParser(CardParser):
+    """Backend lxml (libxml2, nhanh hơn nhiều lần so với html.parser)"""
+
+    name = "lxml"
+
+    def __init__(self, base_url: str = "https://shopee.vn"):
+        super().__init__(base_url)
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._xpath_cache = {}
+        # Chỉ lấy text node thường, bỏ qua comment/script/style giống get_text() của bs4
+        self._text_nodes = etree.XPath(
+            './/text()[not(parent::script) and not(parent::style)]'
+        )
+
+    def _xpath(self, expression: str):
+        compiled = self._xpath_cache.get(expression)
+        if compiled is None:
+            from lxml import etree
+            compiled = self._xpath_cache[expression] = etree.XPath(expression)
+        return compiled
+
+    def fragment_root(self, html: str):
+        # Bọc trong một div để tìm kiếm trên con cháu giống BeautifulSoup document
+        return self._html.fragment_fromstring(html, create_parent='div')
+
+    def page_cards(self, html: str) -> list:
+        return self._xpath(CARD_XPATH)(self._html.document_fromstring(html))
+
+    def find_product_link(self, element):
+        links = self._xpath('.//a[contains(@href, "/product/")]')(element)
+        return links[0] if links else None
+
+    def attr(self, element, name: str) -> str:
+        return element.get(name, '')
+
+    def select_first(self, element, selector: tuple):
+        found = self._xpath(selector[1])(element)
+        return found[0] if found else None
+
+    def find_img(self, element):
+        found = self._xpath('.//img')(element)
+        return found[0] if found else None
+
+    def text(self, element, strip: bool = False) -> str:
+        strings = self._text_nodes(element)
+        if strip:
+            return ''.join(s.strip() for s in strings if s.strip())
+        return ''.join(strings)
+
+    def first_string_matching(self, element, pattern) -> Optional[str]:
+        for string in self._text_nodes(element):
+            if pattern.search(string):
+                return str(string)
+        return None
+
+
+PARSER_BACKENDS = {
+    'bs4': BeautifulSoupParser,
+    'lxml': LxmlParser,
+}
+
+
+def get_parser(name: str = 'auto', base_url: str = "https://shopee.vn") -> CardParser:
+    """
+    Chọn backend parser: 'bs4', 'lxml' hoặc 'auto' (lxml nếu đã cài, không thì bs4)
+    """
+    if name == 'auto':
+        try:
+            return LxmlParser(base_url)
+        except ImportError:
+            return BeautifulSoupParser(base_url)
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Parser không hợp lệ: {name} (chọn: auto, {', '.join(PARSER_BACKENDS)})")
+    return PARSER_BACKENDS[name](base_url)
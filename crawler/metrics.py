@@ -0,0 +1,288 @@
+"""
+Đo thời gian từng giai đoạn crawl (mở Chrome, load cookies, tải trang, đợi, scroll, request HTTP, parse...)
+và đếm sự kiện (trang đã tải, parse lỗi, 403/429, CAPTCHA, sản phẩm theo nguồn).
+Xuất ra file JSON hoặc dạng text Prometheus qua HTTP endpoint để job chạy lâu có thể scrape.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Biên của các bucket histogram (giây)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "shopee_crawl"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Histogram:
+    """Histogram thời gian: số lần theo bucket, tổng, lớn nhất"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # bucket cuối là +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Ước lượng phân vị từ bucket (biên trên của bucket chứa phân vị)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def merge(self, counts: List[int], count: int, total: float, maximum: float):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.count += count
+        self.total += total
+        self.max = max(self.max, maximum)
+
+
+class CrawlMetrics:
+    """
+    Metrics của một crawler (an toàn khi dùng từ nhiều thread):
+    - time(stage) / observe(stage, seconds): thời gian từng giai đoạn, lưu dạng histogram
+    - inc(name, value, **labels): bộ đếm, vd. inc('http_responses', status=403), inc('products', 60, source='api')
+    - snapshot() / save(): số liệu dạng dict / file JSON (stats_file)
+    - to_prometheus() / serve(port): dạng text Prometheus, endpoint /metrics (và /stats.json)
+    """
+
+    def __init__(self, stats_file: Optional[str] = None, buckets=DEFAULT_BUCKETS):
+        self.stats_file = stats_file
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._server = None
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Đo thời gian khối lệnh (kể cả khi có exception)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def count_products(self, source: str, count: int):
+        """Đếm sản phẩm lấy được theo nguồn (api, network, dom, html, script)"""
+        if count:
+            self.inc('products', count, source=source)
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get((name, _label_key(labels)), 0)
+
+    def total(self, name: str) -> float:
+        """Tổng bộ đếm trên mọi nhãn"""
+        with self._lock:
+            return sum(value for (counter, _), value in self._counters.items() if counter == name)
+
+    # --- Gộp metrics từ process khác (worker của batch) ---
+
+    def export_state(self) -> Dict:
+        """Số liệu thô (pickle được) để gộp vào metrics của process khác bằng merge_state()"""
+        with self._lock:
+            return {
+                'stages': {
+                    stage: (list(h.counts), h.count, h.total, h.max) for stage, h in self._stages.items()
+                },
+                'counters': [(name, list(labels), value) for (name, labels), value in self._counters.items()],
+            }
+
+    def merge_state(self, state: Dict):
+        with self._lock:
+            for stage, values in state['stages'].items():
+                histogram = self._stages.get(stage)
+                if histogram is None:
+                    histogram = self._stages[stage] = Histogram(self.buckets)
+                histogram.merge(*values)
+            for name, labels, value in state['counters']:
+                key = (name, tuple(tuple(label) for label in labels))
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    # --- Xuất số liệu ---
+
+    def snapshot(self) -> Dict:
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        products = self.total('products')
+        with self._lock:
+            stages = {
+                stage: {
+                    'count': h.count,
+                    'total_seconds': round(h.total, 4),
+                    'mean_seconds': round(h.total / h.count, 4) if h.count else 0.0,
+                    'p50_seconds': h.quantile(0.5),
+                    'p95_seconds': h.quantile(0.95),
+                    'max_seconds': round(h.max, 4),
+                }
+                for stage, h in sorted(self._stages.items())
+            }
+            counters = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                label_text = ','.join(f"{k}={v}" for k, v in labels)
+                counters[f"{name}[{label_text}]" if label_text else name] = value
+        return {
+            'started_at': self.started_at,
+            'elapsed_seconds': round(elapsed, 3),
+            'products': products,
+            'items_per_second': round(products / elapsed, 3),
+            'stages': stages,
+            'counters': counters,
+        }
+
+    def save(self, path: Optional[str] = None):
+        """Ghi snapshot ra file JSON (ghi file tạm rồi đổi tên), không làm gì nếu không có đường dẫn"""
+        path = path or self.stats_file
+        if not path:
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+        if stages:
+            name = f"{METRIC_PREFIX}_stage_seconds"
+            lines.append(f"# HELP {name} Thời gian từng giai đoạn crawl")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, h in stages:
+                labels = (('stage', stage),)
+                cumulative = 0
+                for bound, count in zip(h.buckets + (float('inf'),), h.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    bucket_labels = _format_labels(labels, 'le="%s"' % le)
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h.total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        for counter_name in sorted({name for (name, _), _ in counters}):
+            name = f"{METRIC_PREFIX}_{counter_name}_total"
+            lines.append(f"# TYPE {name} counter")
+            for (other, labels), value in counters:
+                if other == counter_name:
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        snapshot = self.snapshot()
+        lines.append(f"# TYPE {METRIC_PREFIX}_items_per_second gauge")
+        lines.append(f"{METRIC_PREFIX}_items_per_second {snapshot['items_per_second']}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_uptime_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_uptime_seconds {snapshot['elapsed_seconds']}")
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1"):
+        """Mở endpoint HTTP (thread nền): /metrics dạng Prometheus, /stats.json dạng JSON"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/stats.json'):
+                    body = json.dumps(metrics.snapshot(), ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+                elif self.path.startswith('/metrics') or self.path == '/':
+                    body = metrics.to_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"📈 Metrics tại http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+    def stop_server(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def report(self):
+        """In tóm tắt thời gian các giai đoạn chiếm nhiều thời gian nhất"""
+        snapshot = self.snapshot()
+        print(f"📈 {snapshot['products']:.0f} sản phẩm, {snapshot['items_per_second']} sản phẩm/s")
+        stages = sorted(snapshot['stages'].items(), key=lambda item: -item[1]['total_seconds'])
+        for stage, stats in stages[:8]:
+            print(f"   {stage:20} {stats['count']:6}x  tổng {stats['total_seconds']:8.2f}s  "
+                  f"p50 {stats['p50_seconds']:.3f}s  p95 {stats['p95_seconds']:.3f}s")
+
+
+def instrument(stage: str):
+    """Decorator cho method của ShopeeCrawler: đo cả lần crawl, đếm số lần crawl và lưu file stats"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            try:
+                with metrics.time(stage):
+                    return method(self, *args, **kwargs)
+            finally:
+                metrics.inc('crawls', kind=stage)
+                try:
+                    metrics.save()
+                except Exception as e:
+                    print(f"⚠️ Không ghi được file stats: {e}")
+        return wrapper
+    return decorator
@@ -0,0 +1,192 @@
+"""
+Bắt response của các API search/shop items ngay khi trang nhận được,
+đẩy Product đã parse vào hàng đợi có giới hạn cho vòng lặp crawl tiêu thụ
+"""
+import json
+import queue
+import weakref
+from typing import Callable, Dict, List, Optional, Sequence
+
+from models.product import Product
+
+# API trả về danh sách sản phẩm mà trang search/shop gọi khi scroll
+DEFAULT_URL_PATTERNS = (
+    '/api/v4/search/search_items',
+    '/api/v4/shop/search_items',
+    '/api/v4/shop/rcmd_items',
+)
+
+# Hook fetch/XHR trong trang: chỉ xử lý URL khớp pattern, chỉ giữ item_basic
+_HOOK_SCRIPT = """
+(function (patterns, maxItems) {
+    if (window.__shopeeCapture) return;
+    var state = window.__shopeeCapture = {items: [], responses: 0, dropped: 0};
+
+    function matches(url) {
+        url = String(url || '');
+        for (var i = 0; i < patterns.length; i++) {
+            if (url.indexOf(patterns[i]) !== -1) return true;
+        }
+        return false;
+    }
+
+    function collect(text) {
+        try {
+            var data = typeof text === 'string' ? JSON.parse(text) : text;
+            var items = data.items || (data.data && data.data.items) || [];
+            state.responses++;
+            for (var i = 0; i < items.length; i++) {
+                if (state.items.length >= maxItems) { state.dropped++; continue; }
+                var item = items[i];
+                state.items.push({item_basic: item.item_basic || item});
+            }
+        } catch (e) {}
+    }
+
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (input) {
+            var url = typeof input === 'string' ? input : (input && input.url);
+            var promise = originalFetch.apply(this, arguments);
+            if (matches(url)) {
+                promise.then(function (response) {
+                    return response.clone().text().then(collect);
+                }).catch(function () {});
+            }
+            return promise;
+        };
+    }
+
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__captureUrl = url;
+        return originalOpen.apply(this, arguments);
+    };
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        if (matches(this.__captureUrl)) {
+            this.addEventListener('load', function () {
+                collect(this.responseType === 'json' ? this.response : this.responseText);
+            });
+        }
+        return originalSend.apply(this, arguments);
+    };
+})(%s, %d);
+"""
+
+_DRAIN_SCRIPT = """
+var state = window.__shopeeCapture;
+return state ? state.items.splice(0, arguments[0]) : [];
+"""
+
+_RESET_SCRIPT = """
+var state = window.__shopeeCapture;
+if (state) { state.items.length = 0; state.dropped = 0; }
+"""
+
+_STATS_SCRIPT = """
+var state = window.__shopeeCapture;
+return state ? {responses: state.responses, pending: state.items.length, dropped: state.dropped} : null;
+"""
+
+
+class NetworkCapture:
+    """
+    Cài hook vào trang qua CDP (Page.addScriptToEvaluateOnNewDocument) để bắt body
+    của các API items ngay khi response hoàn tất, thay vì đọc lại performance log.
+
+    - attach(): cài hook cho driver hiện tại (gọi trước khi mở trang)
+    - pump(): chuyển items từ trang sang hàng đợi, không vượt quá chỗ trống còn lại
+    - drain(n): lấy tối đa n Product đã parse khỏi hàng đợi
+    - reset(): bỏ các Product còn lại của trang trước (gọi trước mỗi lần mở trang mới)
+    """
+
+    def __init__(
+        self,
+        get_driver: Callable,
+        parse_item: Callable[[Dict], Optional[Product]],
+        url_patterns: Sequence[str] = DEFAULT_URL_PATTERNS,
+        max_queue: int = 1000,
+        max_page_buffer: int = 5000
+    ):
+        self.get_driver = get_driver
+        self.parse_item = parse_item
+        self.url_patterns = list(url_patterns)
+        self.products: "queue.Queue[Product]" = queue.Queue(maxsize=max_queue)
+        self.max_page_buffer = max_page_buffer
+        # weakref thay vì id(): driver mới của pool có thể được cấp lại đúng id của driver đã đóng
+        self._attached_driver: Optional[weakref.ref] = None
+
+    @property
+    def hook_script(self) -> str:
+        return _HOOK_SCRIPT % (json.dumps(self.url_patterns), self.max_page_buffer)
+
+    def attach(self) -> bool:
+        """Cài hook cho driver hiện tại (chỉ cài một lần cho mỗi driver)"""
+        driver = self.get_driver()
+        if driver is None:
+            return False
+        if self._attached_driver is not None and self._attached_driver() is driver:
+            return True
+        try:
+            # Chạy trước script của trang ở mọi lần điều hướng sau này
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.hook_script})
+            # Và cài luôn cho document hiện tại
+            driver.execute_script(self.hook_script)
+            self._attached_driver = weakref.ref(driver)
+            return True
+        except Exception as e:
+            print(f"⚠️ Không cài được network capture: {e}")
+            return False
+
+    def reset(self):
+        """Xóa hàng đợi và buffer trong trang, để crawl sau không nhận sản phẩm của trang trước"""
+        while True:
+            try:
+                self.products.get_nowait()
+            except queue.Empty:
+                break
+        driver = self.get_driver()
+        if driver is None:
+            return
+        try:
+            driver.execute_script(_RESET_SCRIPT)
+        except Exception:
+            pass
+
+    def pump(self) -> int:
+        """Chuyển items đã bắt được từ trang vào hàng đợi. Trả về số Product mới"""
+        free = self.products.maxsize - self.products.qsize()
+        if free <= 0:
+            return 0
+        try:
+            items = self.get_driver().execute_script(_DRAIN_SCRIPT, free) or []
+        except Exception:
+            return 0
+
+        count = 0
+        for item in items:
+            product = self.parse_item(item)
+            if product:
+                self.products.put_nowait(product)
+                count += 1
+        return count
+
+    def drain(self, limit: Optional[int] = None) -> List[Product]:
+        """Lấy tối đa `limit` Product khỏi hàng đợi (kéo thêm từ trang nếu cần)"""
+        self.pump()
+        products = []
+        while limit is None or len(products) < limit:
+            try:
+                products.append(self.products.get_nowait())
+            except queue.Empty:
+                if not self.pump():
+                    break
+        return products
+
+    def stats(self) -> Optional[Dict[str, int]]:
+        """Số response đã bắt, số items còn chờ trong trang và số bị bỏ do đầy buffer"""
+        try:
+            return self.get_driver().execute_script(_STATS_SCRIPT)
+        except Exception:
+            return None
@@ -0,0 +1,111 @@
+"""
+Engine phân trang bất đồng bộ cho API /api/v4/search/search_items
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+PAGE_SIZE = 60
+
+
+class SearchItemsPaginator:
+    """
+    Tải song song nhiều offset `newest` của search_items.
+
+    fetch_page: hàm đồng bộ nhận params, trả về JSON (dict) hoặc None nếu lỗi
+    base_params: params chung cho mọi trang (keyword/categoryids, by, order...)
+    concurrency: số trang được tải cùng lúc tối đa
+    start_page: bắt đầu từ trang này (tiếp tục từ checkpoint)
+    failed: True nếu lần phân trang gần nhất dừng vì một trang tải lỗi (không phải vì hết kết quả)
+    stop_event: được set khi phân trang dừng sớm; trang chưa bắt đầu tải sẽ bị bỏ qua,
+                fetch_page có thể kiểm tra event này để không gửi request / retry nữa
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Dict], Optional[Dict]],
+        base_params: Dict,
+        limit: int,
+        page_size: int = PAGE_SIZE,
+        concurrency: int = 4,
+        start_page: int = 0
+    ):
+        self.fetch_page = fetch_page
+        self.base_params = dict(base_params)
+        self.limit = limit
+        self.page_size = page_size
+        self.concurrency = max(1, concurrency)
+        self.start_page = start_page
+        self.failed = False
+        self.stop_event = threading.Event()
+
+    def _fetch(self, params: Dict) -> Optional[Dict]:
+        """Chạy trong thread của executor: không tải nữa nếu phân trang đã dừng"""
+        if self.stop_event.is_set():
+            return None
+        return self.fetch_page(params)
+
+    @property
+    def total_pages(self) -> int:
+        """Số trang tối đa cần tải để đủ limit"""
+        return (self.limit + self.page_size - 1) // self.page_size
+
+    def params_for_page(self, page: int) -> Dict:
+        """Params cho trang thứ `page`"""
+        params = dict(self.base_params)
+        params['limit'] = min(self.page_size, self.limit - page * self.page_size)
+        params['newest'] = page * self.page_size
+        return params
+
+    async def pages(self, executor: ThreadPoolExecutor):
+        """
+        Async generator trả về (newest, items) theo đúng thứ tự offset.
+        Dừng khi một trang không có items hoặc tải lỗi.
+        """
+        loop = asyncio.get_event_loop()
+        tasks: Dict[int, asyncio.Future] = {}
+        next_page = self.start_page
+        self.failed = False
+        self.stop_event.clear()
+        try:
+            for page in range(self.start_page, self.total_pages):
+                # Giữ tối đa `concurrency` trang đang tải phía trước trang cần trả
+                while next_page < self.total_pages and next_page - page < self.concurrency:
+                    tasks[next_page] = loop.run_in_executor(
+                        executor, self._fetch, self.params_for_page(next_page)
+                    )
+                    next_page += 1
+
+                data = await tasks.pop(page)
+                if data is None:
+                    self.failed = True
+                    break
+                items = data.get('items')
+                if not items:
+                    break
+                yield page * self.page_size, items
+        finally:
+            self.stop_event.set()
+            for task in tasks.values():
+                task.cancel()
+
+    def iter_pages(self) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Phiên bản đồng bộ của pages() để dùng trong ShopeeCrawler.
+        Dừng vòng lặp sớm (break) sẽ hủy các trang đang tải dở.
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        agen = self.pages(executor)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(agen.aclose())
+            # Bỏ các trang còn trong hàng đợi của executor, trang đang tải tự dừng theo stop_event
+            executor.shutdown(wait=False, cancel_futures=True)
+            loop.close()
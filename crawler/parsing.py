@@ -0,0 +1,83 @@
+"""
+Các quy tắc parse dùng chung cho card sản phẩm (Selenium, script hàng loạt, HTML)
+"""
+import re
+from typing import Dict, Optional
+
+from models.product import Product
+
+PRODUCT_URL_RE = re.compile(r'/product/(\d+)/(\d+)')
+PRICE_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+SOLD_RE = re.compile(r'đã\s*bán[:\s]*(\d+(?:\.\d+)?[kK]?)', re.IGNORECASE)
+RATING_RE = re.compile(r'(\d+\.\d+)')
+
+
+def absolute_url(href: str, base_url: str) -> str:
+    """Ghép base_url cho link tương đối"""
+    return f"{base_url}{href}" if href.startswith('/') else href
+
+
+def parse_price_text(price_text: str) -> Optional[float]:
+    """'₫1.234.000' -> 1234000.0"""
+    price_match = PRICE_NUMBER_RE.search(price_text.replace('.', '').replace(',', ''))
+    if price_match:
+        return float(price_match.group(1))
+    return None
+
+
+def parse_sold_count(text: str) -> int:
+    """Tìm 'Đã bán 1,2k' trong text của card, trả về số lượng bán"""
+    sold_match = SOLD_RE.search(text)
+    if not sold_match:
+        return 0
+    sold_num = sold_match.group(1).lower()
+    if 'k' in sold_num:
+        return int(float(sold_num.replace('k', '')) * 1000)
+    return int(float(sold_num))
+
+
+def normalize_image_url(image_url: str) -> str:
+    """Thêm scheme cho link ảnh dạng //cf.shopee.vn/... hoặc không có scheme"""
+    if image_url and not image_url.startswith('http'):
+        return f"https:{image_url}" if image_url.startswith('//') else f"https://{image_url}"
+    return image_url
+
+
+def product_from_card_fields(fields: Dict, base_url: str) -> Optional[Product]:
+    """
+    Tạo Product từ các trường thô của một card:
+    href, name, price_text, image, sold_text (text chứa 'đã bán')
+    """
+    href = fields.get('href') or ''
+    if '/product/' not in href:
+        return None
+
+    # Extract shop_id và product_id
+    match = PRODUCT_URL_RE.search(href)
+    if not match:
+        return None
+
+    name = (fields.get('name') or '').strip()
+    if not name:
+        return None
+
+    price = 0
+    price_text = (fields.get('price_text') or '').strip()
+    if price_text:
+        price = parse_price_text(price_text) or 0
+
+    return Product(
+        name=name,
+        price=price,
+        original_price=None,
+        commission_rate=None,
+        sales_count=parse_sold_count(fields.get('sold_text') or ''),
+        rating=None,
+        shop_name="",
+        shop_id=match.group(1),
+        product_id=match.group(2),
+        category="",
+        image_url=normalize_image_url(fields.get('image') or ''),
+        product_url=absolute_url(href, base_url),
+        location=""
+    )
@@ -0,0 +1,146 @@
+"""
+Rate limiter thích ứng (token bucket theo host) dùng chung cho mọi request của ShopeeCrawler
+"""
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Các status được coi là bị throttle / server quá tải => lùi lại rồi thử lại
+RETRY_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket đơn giản, an toàn khi dùng từ nhiều thread"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> float:
+        """Lấy 1 token, chờ nếu cần. Trả về thời gian đã chờ (giây)"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter theo host:
+    - Tăng dần tốc độ (cộng thêm increase_step) khi response khỏe mạnh
+    - Giảm mạnh tốc độ (nhân decrease_factor) khi gặp 403/429/5xx
+    - Tính thời gian backoff theo cấp số nhân có jitter cho lần thử lại
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 10.0,
+        increase_step: float = 0.2,
+        decrease_factor: float = 0.5,
+        burst: float = 2.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_retries: int = 4
+    ):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.burst = burst
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url_or_host: str) -> str:
+        """Lấy host từ URL (hoặc giữ nguyên nếu đã là host)"""
+        if '://' in url_or_host:
+            return urlparse(url_or_host).netloc
+        return url_or_host
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.initial_rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url_or_host: str) -> float:
+        """Chờ tới lượt gửi request tới host. Trả về thời gian đã chờ"""
+        return self._bucket(self._host(url_or_host)).acquire()
+
+    def record_success(self, url_or_host: str):
+        """Response khỏe mạnh: tăng dần tốc độ"""
+        host = self._host(url_or_host)
+        bucket = self._bucket(host)
+        with bucket.lock:
+            bucket._refill()
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase_step)
+        with self._lock:
+            self._failures[host] = 0
+
+    def record_failure(self, url_or_host: str) -> float:
+        """
+        Response bị throttle (403/429/5xx, captcha): giảm tốc độ.
+        Trả về thời gian nên chờ trước khi thử lại (backoff có jitter)
+        """
+        host = self._host(url_or_host)
+        bucket = self._bucket(host)
+        with bucket.lock:
+            bucket._refill()
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+        with self._lock:
+            attempt = self._failures.get(host, 0)
+            self._failures[host] = attempt + 1
+        return self.backoff_delay(attempt)
+
+    def record(self, url_or_host: str, status_code: int) -> Optional[float]:
+        """Ghi nhận status code. Trả về thời gian backoff nếu nên thử lại, None nếu không"""
+        if status_code in RETRY_STATUSES:
+            return self.record_failure(url_or_host)
+        if status_code < 400:
+            self.record_success(url_or_host)
+        return None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Backoff cấp số nhân với 'equal jitter'"""
+        cap = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def current_rate(self, url_or_host: str) -> float:
+        """Tốc độ hiện tại (request/giây) của host"""
+        host = self._host(url_or_host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+        return bucket.rate if bucket else self.initial_rate
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Tốc độ và số lần lỗi liên tiếp của từng host, để theo dõi/tinh chỉnh"""
+        with self._lock:
+            return {
+                host: {'rate': round(bucket.rate, 3), 'consecutive_failures': self._failures.get(host, 0)}
+                for host, bucket in self._buckets.items()
+            }
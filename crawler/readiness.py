@@ -0,0 +1,210 @@
+"""
+Đợi trang sẵn sàng theo điều kiện thực tế thay cho time.sleep cố định
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+# Cài MutationObserver một lần cho mỗi document, trả về số ms kể từ lần DOM thay đổi gần nhất
+_DOM_QUIET_SCRIPT = """
+if (!window.__crawlerMutation) {
+    window.__crawlerMutation = {last: performance.now()};
+    new MutationObserver(function () {
+        window.__crawlerMutation.last = performance.now();
+    }).observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return performance.now() - window.__crawlerMutation.last;
+"""
+
+# Đọc Resource Timing thay vì performance log để không làm mất log của bước lấy network
+_SEARCH_RESPONSE_SCRIPT = """
+var fragment = arguments[0];
+return performance.getEntriesByType('resource').filter(function (e) {
+    return e.name.indexOf(fragment) !== -1 && e.responseEnd > 0;
+}).length;
+"""
+
+_PRODUCT_ANCHOR_SCRIPT = "return document.querySelectorAll(\"a[href*='/product/']\").length;"
+
+
+@dataclass
+class WaitResult:
+    """Kết quả một lần đợi"""
+    condition: str
+    satisfied: bool
+    elapsed: float
+    timeout: float
+    replaced_sleep: float = 0.0  # thời gian sleep cố định trước đây ở chỗ này
+
+    @property
+    def saved(self) -> float:
+        """Thời gian tiết kiệm so với sleep cố định"""
+        return max(0.0, self.replaced_sleep - self.elapsed)
+
+
+class PageReadiness:
+    """
+    Các điều kiện sẵn sàng của trang, mỗi điều kiện có timeout riêng và
+    trả về ngay khi điều kiện đúng. Mọi lần đợi được ghi lại trong `results`.
+    """
+
+    DEFAULT_TIMEOUTS = {
+        'page_loaded': 10.0,
+        'product_anchors': 10.0,
+        'search_items_response': 10.0,
+        'dom_quiescent': 5.0,
+        'anchors_increase': 3.0,
+        'url_leaves': 10.0,
+    }
+
+    def __init__(
+        self,
+        get_driver: Callable,
+        timeouts: Optional[Dict[str, float]] = None,
+        poll_frequency: float = 0.1,
+        on_result: Optional[Callable[["WaitResult"], None]] = None
+    ):
+        """
+        get_driver: hàm trả về driver hiện tại (driver có thể được mở lại khi gặp CAPTCHA)
+        timeouts: ghi đè timeout cho từng điều kiện
+        on_result: gọi sau mỗi lần đợi (vd. ghi vào CrawlMetrics)
+        """
+        self.get_driver = get_driver
+        self.on_result = on_result
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.poll_frequency = poll_frequency
+        self.results: List[WaitResult] = []
+
+    def _wait(
+        self,
+        condition: str,
+        predicate: Callable,
+        timeout: Optional[float] = None,
+        replaced_sleep: float = 0.0
+    ) -> WaitResult:
+        """Đợi predicate(driver) trả về truthy hoặc hết timeout"""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        if timeout is None:
+            timeout = self.timeouts.get(condition, 10.0)
+        start = time.perf_counter()
+        satisfied = True
+        try:
+            WebDriverWait(
+                self.get_driver(),
+                timeout,
+                poll_frequency=self.poll_frequency,
+                ignored_exceptions=(WebDriverException,)
+            ).until(predicate)
+        except TimeoutException:
+            satisfied = False
+        result = WaitResult(condition, satisfied, time.perf_counter() - start, timeout, replaced_sleep)
+        self.results.append(result)
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    @staticmethod
+    def _count_anchors(driver) -> int:
+        return driver.execute_script(_PRODUCT_ANCHOR_SCRIPT) or 0
+
+    def anchor_count(self) -> int:
+        """Số link sản phẩm hiện có (ghi lại trước khi scroll để dùng với anchors_increase)"""
+        try:
+            return self._count_anchors(self.get_driver())
+        except Exception:
+            return 0
+
+    def search_response_count(self) -> int:
+        """Số response search_items trang đã nhận (dùng với search_items_response)"""
+        try:
+            return self.get_driver().execute_script(_SEARCH_RESPONSE_SCRIPT, 'search_items') or 0
+        except Exception:
+            return 0
+
+    def product_anchors(self, min_count: int = 1, **kwargs) -> WaitResult:
+        """Đợi có ít nhất `min_count` link sản phẩm trên trang"""
+        return self._wait(
+            'product_anchors',
+            lambda d: self._count_anchors(d) >= min_count,
+            **kwargs
+        )
+
+    def search_items_response(self, min_count: int = 1, **kwargs) -> WaitResult:
+        """Đợi trang nhận được response của API search_items"""
+        return self._wait(
+            'search_items_response',
+            lambda d: (d.execute_script(_SEARCH_RESPONSE_SCRIPT, 'search_items') or 0) >= min_count,
+            **kwargs
+        )
+
+    def dom_quiescent(self, quiet_ms: int = 500, **kwargs) -> WaitResult:
+        """Đợi DOM không thay đổi trong `quiet_ms` mili giây"""
+        return self._wait(
+            'dom_quiescent',
+            lambda d: (d.execute_script(_DOM_QUIET_SCRIPT) or 0) >= quiet_ms,
+            **kwargs
+        )
+
+    def anchors_increase(self, previous_count: int, **kwargs) -> WaitResult:
+        """Đợi số link sản phẩm tăng lên so với trước khi scroll"""
+        return self._wait(
+            'anchors_increase',
+            lambda d: self._count_anchors(d) > previous_count,
+            **kwargs
+        )
+
+    def url_leaves(self, fragment: str, **kwargs) -> WaitResult:
+        """Đợi URL hiện tại không còn chứa `fragment` (VD: rời trang CAPTCHA)"""
+        return self._wait(
+            'url_leaves',
+            lambda d: fragment not in d.current_url,
+            **kwargs
+        )
+
+    def page_loaded(self, **kwargs) -> WaitResult:
+        """
+        Đợi trang search/shop có dữ liệu: có link sản phẩm, hoặc đã có response
+        search_items, hoặc bị chuyển tới CAPTCHA/login (để xử lý ngay không phải đợi)
+        """
+        def predicate(d):
+            url = d.current_url
+            if '/verify/captcha' in url or '/buyer/login' in url:
+                return True
+            if d.execute_script("return document.readyState") != 'complete':
+                return False
+            return (
+                self._count_anchors(d) > 0
+                or (d.execute_script(_SEARCH_RESPONSE_SCRIPT, 'search_items') or 0) > 0
+            )
+        return self._wait('page_loaded', predicate, **kwargs)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Tổng hợp thời gian đợi theo từng điều kiện"""
+        summary: Dict[str, Dict[str, float]] = {}
+        for result in self.results:
+            entry = summary.setdefault(result.condition, {
+                'count': 0, 'timeouts': 0, 'waited': 0.0, 'saved': 0.0
+            })
+            entry['count'] += 1
+            entry['timeouts'] += 0 if result.satisfied else 1
+            entry['waited'] += result.elapsed
+            entry['saved'] += result.saved
+        return summary
+
+    def report(self):
+        """In thời gian đợi và thời gian tiết kiệm so với sleep cố định"""
+        for condition, entry in self.summary().items():
+            print(
+                f"⏱️  {condition}: {entry['count']} lần, đợi {entry['waited']:.2f}s, "
+                f"tiết kiệm {entry['saved']:.2f}s, timeout {entry['timeouts']} lần"
+            )
+
+    def reset(self):
+        """Xóa kết quả đo để bắt đầu trang mới"""
+        self.results = []
@@ -0,0 +1,229 @@
+"""
+Cache response HTTP trên đĩa (TTL theo endpoint, giới hạn dung lượng theo LRU) và chế độ replay offline
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# TTL mặc định (giây) theo path, chỉ các endpoint có trong đây mới được cache
+DEFAULT_TTLS = {
+    '/api/v4/search/search_items': 600,
+}
+
+
+def is_valid_body(url: str, body: bytes) -> bool:
+    """
+    Body có đáng lưu không: Shopee trả 200 kèm {"error": ..., "items": null} khi từ chối session,
+    response như vậy không được cache (nếu không sẽ bị trả lại tới khi hết TTL)
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return False
+    return not (isinstance(data, dict) and data.get('error') and not data.get('items'))
+
+
+def normalize_url(url: str) -> str:
+    """Chuẩn hóa URL: host viết thường, params sắp xếp theo tên để cùng query cho cùng key"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+
+
+class ResponseCache:
+    """
+    Lưu response theo hash của URL đã chuẩn hóa, mỗi response một file JSON.
+    - ttls: TTL theo path (endpoint không có trong ttls sẽ không được cache)
+    - max_bytes: tổng dung lượng tối đa, vượt quá thì xóa file ít dùng nhất (LRU theo mtime)
+    - replay_only: chỉ trả response đã ghi (kể cả đã hết hạn), không bao giờ gọi mạng
+    - is_valid: hàm (url, body) -> bool, chỉ lưu response 200 có body hợp lệ (mặc định is_valid_body)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".shopee_cache",
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = 200 * 1024 * 1024,
+        replay_only: bool = False,
+        is_valid: Optional[Callable[[str, bytes], bool]] = None
+    ):
+        self.cache_dir = cache_dir
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.replay_only = replay_only
+        self.is_valid = is_valid or is_valid_body
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(os.path.getsize(path) for path in self._entry_paths())
+
+    def _entry_paths(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+    def _path_for(self, url: str) -> str:
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """TTL của endpoint, None nếu endpoint không được cache"""
+        path = urlsplit(url).path
+        for prefix, ttl in self.ttls.items():
+            if path.startswith(prefix):
+                return ttl
+        return None
+
+    def is_cacheable(self, url: str) -> bool:
+        return self.ttl_for(url) is not None
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Đọc entry còn hạn (hoặc bất kỳ entry nào nếu replay_only), cập nhật thời điểm dùng cho LRU"""
+        path = self._path_for(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        ttl = self.ttl_for(url)
+        if not self.replay_only and (ttl is None or time.time() - entry['stored_at'] > ttl):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def contains(self, url: str) -> bool:
+        """Có entry dùng được cho URL này không (để bỏ qua rate limit khi đọc từ cache)"""
+        return self.is_cacheable(url) and self.get(url) is not None
+
+    def put(self, url: str, status_code: int, headers: Dict[str, str], body: bytes):
+        """Ghi response vào cache rồi dọn bớt nếu vượt dung lượng"""
+        entry = {
+            'url': normalize_url(url),
+            'status_code': status_code,
+            'headers': headers,
+            'body': base64.b64encode(body).decode('ascii'),
+            'stored_at': time.time(),
+        }
+        path = self._path_for(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Worker của scheduler có thể là nhiều process dùng chung thư mục cache
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._total_bytes += os.path.getsize(path) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Xóa các entry dùng lâu nhất cho tới khi còn 90% dung lượng tối đa"""
+        entries = []
+        for path in self._entry_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self._total_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Xóa toàn bộ cache"""
+        with self._lock:
+            for path in list(self._entry_paths()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+    def record(self, hit: bool):
+        """Đếm một lần đọc cache (adapter được nhiều thread dùng cùng lúc)"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'bytes': self._total_bytes}
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter đọc/ghi ResponseCache, mount vào requests.Session của crawler"""
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def _build_response(self, request, entry: Dict) -> Response:
+        response = Response()
+        response.status_code = entry['status_code']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = base64.b64decode(entry['body'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK'
+        response.from_cache = True
+        return response
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET' or not self.cache.is_cacheable(request.url):
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None:
+            self.cache.record(hit=True)
+            return self._build_response(request, entry)
+
+        self.cache.record(hit=False)
+        if self.cache.replay_only:
+            # Không có trong bản ghi: trả 404 thay vì gọi mạng
+            response = Response()
+            response.status_code = 404
+            response.reason = 'Not in cache (replay only)'
+            response._content = b'{}'
+            response.url = request.url
+            response.request = request
+            # Không đánh dấu from_cache: đây là lần trượt cache, không phải cache hit
+            return response
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 200 and self.cache.is_valid(request.url, response.content):
+            # Bỏ các header mô tả cách truyền, body lưu đã được giải nén
+            headers = {
+                key: value for key, value in response.headers.items()
+                if key.lower() not in ('content-encoding', 'content-length', 'transfer-encoding', 'set-cookie')
+            }
+            self.cache.put(request.url, response.status_code, headers, response.content)
+        return response
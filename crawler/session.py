@@ -0,0 +1,73 @@
+"""
+Lưu/khôi phục session HTTP (cookies + headers) để crawl API không cần mở Chrome
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+
+from .browser import USER_AGENT
+
+
+@dataclass
+class SessionState:
+    """Cookies và headers lấy từ browser một lần, dùng lại cho các request HTTP"""
+    cookies: List[Dict] = field(default_factory=list)
+    user_agent: str = USER_AGENT
+    headers: Dict[str, str] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_driver(cls, driver) -> "SessionState":
+        """Lấy cookies và user agent từ Selenium driver đang chạy"""
+        cookies = [
+            {
+                'name': cookie['name'],
+                'value': cookie['value'],
+                'domain': cookie.get('domain', '.shopee.vn'),
+                'path': cookie.get('path', '/'),
+            }
+            for cookie in driver.get_cookies()
+        ]
+        user_agent = driver.execute_script("return navigator.userAgent;") or USER_AGENT
+        return cls(
+            cookies=cookies,
+            user_agent=user_agent,
+            headers={'Accept-Language': 'vi-VN,vi;q=0.9,en-US;q=0.8,en;q=0.7'}
+        )
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SessionState"]:
+        """Đọc session từ file, trả về None nếu chưa có hoặc file hỏng"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(**json.load(f))
+        except Exception as e:
+            print(f"⚠️ Không đọc được session {path}: {e}")
+            return None
+
+    def save(self, path: str):
+        """Ghi session ra file (ghi file tạm rồi đổi tên để không bị hỏng giữa chừng)"""
+        # Tên file tạm riêng cho mỗi process / thread để các lần ghi đồng thời không ghi đè nhau
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def apply_to(self, session: requests.Session):
+        """Nạp cookies và headers vào requests.Session"""
+        for cookie in self.cookies:
+            session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', '.shopee.vn'),
+                path=cookie.get('path', '/')
+            )
+        session.headers.update(self.headers)
+        session.headers['User-Agent'] = self.user_agent
@@ -0,0 +1,82 @@
+"""
+Thu thập sản phẩm trang shop theo từng đợt scroll: chỉ xử lý các card mới xuất hiện
+"""
+from typing import Callable, List, Optional, Set, Tuple
+
+from models.product import Product
+
+SHOP_CARD_SELECTOR = "div[class*='col-xs-2-4'], div[class*='shopee-search-item']"
+
+# Lấy outerHTML của các card lá chưa xử lý và đánh dấu chúng trong DOM,
+# để lần scroll sau không phải serialize lại cả trang.
+# Card chưa có link sản phẩm (placeholder đang lazy-load) chưa được đánh dấu, lần sau lấy lại
+_NEW_CARDS_SCRIPT = """
+var selector = arguments[0];
+var cards = document.querySelectorAll(selector);
+var state = window.__crawlerCards = window.__crawlerCards || {next: 0};
+var fresh = [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    if (card.dataset.crawlerSeen || card.querySelector(selector)) continue;
+    if (!card.querySelector("a[href*='/product/']")) continue;
+    card.dataset.crawlerSeen = String(++state.next);
+    fresh.push([card.dataset.crawlerSeen, card.outerHTML]);
+}
+return fresh;
+"""
+
+# Bỏ đánh dấu các card parse không ra sản phẩm, để lần scroll sau thử lại khi card render xong
+_UNMARK_SCRIPT = """
+var ids = arguments[0];
+for (var i = 0; i < ids.length; i++) {
+    var card = document.querySelector('[data-crawler-seen="' + ids[i] + '"]');
+    if (card) delete card.dataset.crawlerSeen;
+}
+"""
+
+
+class ShopHarvester:
+    """
+    Mỗi lần harvest() chỉ lấy các card được thêm vào từ lần trước,
+    bỏ trùng bằng set (shop_id, product_id) thay vì so sánh cả danh sách.
+    """
+
+    def __init__(
+        self,
+        get_driver: Callable,
+        parse_card_html: Callable[[str], Optional[Product]],
+        card_selector: str = SHOP_CARD_SELECTOR
+    ):
+        self.get_driver = get_driver
+        self.parse_card_html = parse_card_html
+        self.card_selector = card_selector
+        self.seen: Set[Tuple[str, str]] = set()
+
+    def add(self, product: Optional[Product]) -> bool:
+        """Ghi nhận sản phẩm, trả về True nếu là sản phẩm mới"""
+        if not product or not product.product_id:
+            return False
+        key = (product.shop_id, product.product_id)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+    def harvest(self) -> List[Product]:
+        """Parse các card mới xuất hiện kể từ lần gọi trước"""
+        driver = self.get_driver()
+        fragments = driver.execute_script(_NEW_CARDS_SCRIPT, self.card_selector) or []
+        products = []
+        rejected = []
+        for card_id, fragment in fragments:
+            product = self.parse_card_html(fragment)
+            if not product or not product.product_id:
+                rejected.append(card_id)
+            elif self.add(product):
+                products.append(product)
+        if rejected:
+            try:
+                driver.execute_script(_UNMARK_SCRIPT, rejected)
+            except Exception:
+                pass
+        return products
@@ -3,124 +3,196 @@ import json
 import time
 import re
 import os
+import threading
+from dataclasses import asdict
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from bs4 import BeautifulSoup
 from models.product import Product
+from filters.product_filter import ProductFilter
+from storage.product_store import ProductStore
+from storage.sinks import ProductSink
+from .pagination import PAGE_SIZE, SearchItemsPaginator
+from .checkpoint import CrawlCheckpoint
+from .rate_limiter import AdaptiveRateLimiter
+from .browser import USER_AGENT, create_chrome_driver
+from .cookie_manager import CookieManager
+from .driver_pool import DriverPool
+from .readiness import PageReadiness
+from .session import SessionState
+from .network_capture import NetworkCapture
+from .dom_extractor import extract_cards, read_element_fields
+from .parsing import PRODUCT_URL_RE, product_from_card_fields
+from .shop_harvester import ShopHarvester
+from .html_parser import BeautifulSoupParser, get_parser
+from .response_cache import CachingAdapter, ResponseCache
+from .metrics import CrawlMetrics, instrument
+
+# Dùng cho cách parse dự phòng từ link sản phẩm trong HTML
+PRODUCT_LINK_RE = re.compile(r'/product/\d+/\d+')
+NON_EMPTY_RE = re.compile(r'.+')
 
 class ShopeeCrawler:
     """Crawler để lấy dữ liệu sản phẩm từ Shopee sử dụng Selenium"""
     
     BASE_URL = "https://shopee.vn"
+    IMAGE_BASE_URL = "https://cf.shopee.vn/file/"
     COOKIES_FILE = "shopee_cookies.json"
+    SESSION_FILE = "shopee_session.json"
+    SEARCH_API_PATH = "/api/v4/search/search_items"
+    # Header chung cho mọi request API (keyword, category, khoảng trang). Accept-Encoding để mặc định
+    # của requests (gzip/deflate, thêm br/zstd nếu có thư viện giải nén)
+    API_HEADERS = {
+        'Accept': 'application/json',
+        'Accept-Language': 'vi-VN,vi;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Connection': 'keep-alive',
+        'X-Requested-With': 'XMLHttpRequest',
+        'X-API-Source': 'pc',
+        'X-Shopee-Language': 'vi',
+    }
+    # Khi có bộ lọc local, tải tối đa chừng này sản phẩm để tìm đủ limit sản phẩm thỏa điều kiện
+    FILTER_MAX_FETCH = 3000
     
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        api_concurrency: int = 4,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        driver_pool: Optional[DriverPool] = None,
+        http_only: bool = False,
+        html_parser: str = "auto",
+        store: Optional[ProductStore] = None,
+        response_cache: Optional[ResponseCache] = None,
+        sink: Optional[ProductSink] = None,
+        metrics: Optional[CrawlMetrics] = None,
+        base_url: Optional[str] = None,
+        cookies_file: Optional[str] = None,
+        session_file: Optional[str] = None
+    ):
         """
         Khởi tạo crawler
         headless: True để chạy browser ẩn, False để hiển thị browser
+        api_concurrency: số trang search_items được tải song song
+        rate_limiter: rate limiter dùng chung (mặc định tạo mới), xem rate_limiter.stats()
+        driver_pool: mượn driver đã khởi động và load cookies sẵn từ pool
+                     thay vì tự mở Chrome mới (trả lại pool khi close())
+        http_only: crawl keyword/category chỉ bằng HTTP với session đã lưu,
+                   chỉ mở Chrome khi cần lấy session mới hoặc session bị từ chối
+        html_parser: backend parse HTML card sản phẩm: 'auto' (lxml nếu có), 'lxml', 'bs4'
+        store: ProductStore để lưu sản phẩm vào SQLite trong lúc crawl (và dùng cho recrawl)
+        response_cache: ResponseCache để đọc lại response API từ đĩa; với replay_only=True
+                        crawl keyword/category chạy hoàn toàn offline từ dữ liệu đã ghi
+        sink: ProductSink (JSONL/CSV...) nhận sản phẩm ngay khi parse xong, người gọi tự close()
+        metrics: CrawlMetrics ghi thời gian từng giai đoạn và bộ đếm (mặc định tạo mới), xem metrics.report()
+        base_url: địa chỉ thay cho https://shopee.vn (vd. server giả lập devserver), mặc định lấy từ
+                  biến môi trường SHOPEE_BASE_URL nếu có
+        cookies_file / session_file: file cookies và session của crawler. Mặc định là COOKIES_FILE /
+                  SESSION_FILE, thêm tên host khi base_url khác shopee.vn để không đọc/ghi đè session thật
         """
+        base_url = base_url or os.environ.get('SHOPEE_BASE_URL')
+        if base_url:
+            self.BASE_URL = base_url.rstrip('/')
+            self.IMAGE_BASE_URL = f"{self.BASE_URL}/file/"
+        self.cookies_file = cookies_file or self._origin_file(self.COOKIES_FILE)
+        self.session_file = session_file or self._origin_file(self.SESSION_FILE)
         self.headless = headless
+        self.api_concurrency = api_concurrency
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.driver_pool = driver_pool
+        self.http_only = http_only
         self.driver = None
-        self._init_driver()
-        self._load_cookies()
+        self.session_state: Optional[SessionState] = None
+        self._api_rejected = False
+        # Phân trang API dừng vì tải trang lỗi (mạng, hết lượt retry 429/5xx), khác với hết kết quả
+        self._fetch_failed = False
+        # Session HTTP dùng chung cho mọi lần gọi API, tạo lần đầu khi cần (xem _api_session)
+        self._http_session: Optional[requests.Session] = None
+        self._http_session_source: Optional[str] = None
+        self._http_session_stale = False
+        self._http_session_lock = threading.Lock()
+        self._cookie_snapshot: Dict[tuple, str] = {}
+        self.html_parser = get_parser(html_parser, self.BASE_URL)
+        # Cookies đã lưu: nạp thẳng qua CDP nếu còn hạn, chỉ mở trang chủ khi cần
+        self.cookie_manager = CookieManager(self.cookies_file, self.BASE_URL)
+        self.store = store
+        self.response_cache = response_cache
+        self.sink = sink
+        self.metrics = metrics or CrawlMetrics()
+        # Đợi theo điều kiện thực tế của trang, luôn dùng driver hiện tại
+        self.readiness = PageReadiness(lambda: self.driver, on_result=self._record_wait)
+        # Bắt response search/shop items ngay trong lúc trang load và scroll
+        self.network_capture = NetworkCapture(lambda: self.driver, self._parse_product_from_api)
+        if self._replaying:
+            # Replay không gọi mạng nên không cần cookies/browser
+            self.http_only = True
+            self.session_state = SessionState.load(self.session_file) or SessionState()
+        elif http_only:
+            self.session_state = SessionState.load(self.session_file)
+        else:
+            self._ensure_driver()
+    
+    def _origin_file(self, path: str) -> str:
+        """shopee_session.json -> shopee_session.127.0.0.1_8800.json khi base_url không phải shopee.vn"""
+        if self.BASE_URL == ShopeeCrawler.BASE_URL:
+            return path
+        host = re.sub(r'[^\w.-]', '_', urlsplit(self.BASE_URL).netloc)
+        root, ext = os.path.splitext(path)
+        return f"{root}.{host}{ext}"
+    
+    @property
+    def _replaying(self) -> bool:
+        return self.response_cache is not None and self.response_cache.replay_only
+    
+    def _ensure_driver(self):
+        """Mở Chrome (hoặc mượn từ pool) nếu chưa có driver"""
+        if self.driver:
+            return
+        if self.driver_pool:
+            self.headless = self.driver_pool.headless
+            with self.metrics.time('driver_acquire'):
+                self.driver = self.driver_pool.acquire()
+        else:
+            self._init_driver()
+            with self.metrics.time('cookie_load'):
+                self._load_cookies()
     
     def _init_driver(self):
         """Khởi tạo Selenium WebDriver"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless=new')  # Dùng headless mới
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Enable performance logging để intercept network requests
-        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
-        
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            # Set window size
-            self.driver.set_window_size(1920, 1080)
-        except Exception as e:
-            print(f"Lỗi khởi tạo Chrome driver: {e}")
-            print("Đảm bảo đã cài đặt Chrome và ChromeDriver")
-            raise
+        with self.metrics.time('chrome_start'):
+            self.driver = create_chrome_driver(self.headless)
+    
+    def _record_wait(self, result):
+        """Ghi thời gian mỗi lần đợi trang (thay cho sleep) vào metrics"""
+        self.metrics.observe(f"wait_{result.condition}", result.elapsed)
+        if not result.satisfied:
+            self.metrics.inc('wait_timeouts', condition=result.condition)
+    
+    def _scroll(self, y=None):
+        """Scroll tới vị trí y (mặc định cuối trang)"""
+        with self.metrics.time('scroll'):
+            if y is None:
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            else:
+                self.driver.execute_script(f"window.scrollTo(0, {y});")
     
     def _load_cookies(self):
-        """Load cookies từ file nếu có"""
-        if os.path.exists(self.COOKIES_FILE):
-            try:
-                # Truy cập trang chủ trước
-                self.driver.get(self.BASE_URL)
-                time.sleep(2)
-                
-                with open(self.COOKIES_FILE, 'r', encoding='utf-8') as f:
-                    cookies = json.load(f)
-                    
-                # Xóa cookies cũ trước
-                self.driver.delete_all_cookies()
-                
-                # Load cookies mới
-                loaded_count = 0
-                for cookie in cookies:
-                    try:
-                        # Đảm bảo domain đúng
-                        if 'domain' in cookie:
-                            # Chỉnh domain nếu cần
-                            domain = cookie['domain']
-                            if domain.startswith('.'):
-                                domain = domain[1:]
-                            cookie['domain'] = domain
-                        
-                        # Xử lý expiry
-                        if 'expiry' in cookie and cookie['expiry']:
-                            # Chuyển từ Windows timestamp sang Unix timestamp nếu cần
-                            expiry = cookie['expiry']
-                            if expiry > 10000000000000000:  # Windows timestamp
-                                expiry = expiry / 1000000
-                            cookie['expiry'] = int(expiry)
-                        
-                        # Đảm bảo có các trường bắt buộc
-                        if 'path' not in cookie:
-                            cookie['path'] = '/'
-                        if 'secure' not in cookie:
-                            cookie['secure'] = False
-                        if 'httpOnly' not in cookie:
-                            cookie['httpOnly'] = False
-                            
-                        self.driver.add_cookie(cookie)
-                        loaded_count += 1
-                    except Exception as e:
-                        continue
-                
-                if loaded_count > 0:
-                    print(f"✅ Đã load {loaded_count}/{len(cookies)} cookies từ file")
-                    # Refresh để áp dụng cookies
-                    self.driver.refresh()
-                    time.sleep(3)
-                    return True
-            except Exception as e:
-                print(f"⚠️ Không thể load cookies: {e}")
-        else:
-            # Thử import từ Chrome nếu chưa có file
+        """Load cookies từ file nếu có (không mở trang chủ nếu cookies còn hạn và còn được chấp nhận)"""
+        if os.path.exists(self.cookies_file):
+            mode = self.cookie_manager.load_into(
+                self.driver, navigate=self._navigate, before_request=self.rate_limiter.acquire
+            )
+            if mode:
+                self.metrics.inc('cookie_loads', mode=mode)
+            return mode is not None
+        elif self.BASE_URL == ShopeeCrawler.BASE_URL:
+            # Thử import từ Chrome nếu chưa có file (không gửi cookies Shopee thật tới server khác)
             try:
                 from .cookie_helper import get_chrome_cookies
                 print("💡 Đang thử import cookies từ Chrome profile...")
                 chrome_cookies = get_chrome_cookies()
                 if chrome_cookies:
                     # Lưu vào file
-                    with open(self.COOKIES_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(chrome_cookies, f, ensure_ascii=False, indent=2)
+                    self._write_cookies_file(chrome_cookies)
                     print(f"✅ Đã import {len(chrome_cookies)} cookies từ Chrome")
                     # Load lại
                     return self._load_cookies()
@@ -128,48 +200,244 @@ class ShopeeCrawler:
                 pass
         return False
     
+    def _relaunch_visible_browser(self):
+        """Đóng browser headless (hoặc trả về pool) và mở lại Chrome hiển thị để giải CAPTCHA/đăng nhập"""
+        if self.driver_pool:
+            # Driver của pool đang kẹt ở CAPTCHA/login, bỏ nó để pool tạo driver khác
+            self.driver_pool.release(self.driver, discard=True)
+            self.driver_pool = None
+        else:
+            try:
+                self.driver.quit()
+            except:
+                pass
+        
+        # Mở lại với không headless
+        self.headless = False
+        self._init_driver()
+        
+        # Load cookies lại
+        with self.metrics.time('cookie_load'):
+            self._load_cookies()
+    
+    def _navigate(self, url: str):
+        """Mở URL trong browser, đi qua rate limiter như mọi request khác"""
+        with self.metrics.time('rate_limit_wait'):
+            self.rate_limiter.acquire(url)
+        self.network_capture.attach()
+        self.network_capture.reset()
+        with self.metrics.time('page_load'):
+            self.driver.get(url)
+        self.metrics.inc('page_loads')
+        # Bị chuyển tới trang CAPTCHA nghĩa là đang đi quá nhanh
+        if '/verify/captcha' in self.driver.current_url:
+            self.metrics.inc('captchas')
+            self.rate_limiter.record_failure(url)
+        else:
+            self.rate_limiter.record_success(url)
+    
+    def _write_cookies_file(self, cookies: List[Dict]):
+        """
+        Ghi file cookies qua file tạm riêng của process / thread rồi đổi tên,
+        để các worker của batch đóng crawler cùng lúc không làm hỏng file
+        """
+        tmp_path = f"{self.cookies_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cookies_file)
+    
     def _save_cookies(self):
         """Lưu cookies vào file"""
         try:
             if self.driver:
                 cookies = self.driver.get_cookies()
-                with open(self.COOKIES_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(cookies, f, ensure_ascii=False, indent=2)
-                print(f"✅ Đã lưu {len(cookies)} cookies vào {self.COOKIES_FILE}")
+                self._write_cookies_file(cookies)
+                print(f"✅ Đã lưu {len(cookies)} cookies vào {self.cookies_file}")
         except Exception as e:
             # Không in lỗi nếu driver đã đóng
             pass
     
+    def _release_driver(self):
+        """Đóng Chrome (hoặc trả driver về pool)"""
+        if not self.driver:
+            return
+        if self.driver_pool:
+            # Trả driver về pool thay vì đóng Chrome
+            self.driver_pool.release(self.driver)
+        else:
+            try:
+                self.driver.quit()
+            except:
+                try:
+                    self.driver.close()
+                except:
+                    pass
+        self.driver = None
+    
     def close(self):
-        """Đóng driver và lưu cookies"""
+        """Đóng driver, lưu cookies và đóng các kết nối HTTP"""
         if self.driver:
             try:
                 # Lưu cookies trước khi đóng
                 self._save_cookies()
             except:
                 pass
-            try:
-                self.driver.quit()
-            except:
+            self._release_driver()
+        self._close_api_session()
+    
+    def _bootstrap_session(self):
+        """Mở browser một lần để lấy cookies + user agent, lưu lại rồi đóng browser"""
+        print("🔑 Đang lấy session mới bằng browser...")
+        self._ensure_driver()
+        if self.BASE_URL not in self.driver.current_url:
+            self._navigate(self.BASE_URL)
+            self.readiness.dom_quiescent()
+        self.session_state = SessionState.from_driver(self.driver)
+        self.session_state.save(self.session_file)
+        self._http_session_stale = True
+        print(f"✅ Đã lưu session ({len(self.session_state.cookies)} cookies) vào {self.session_file}")
+        if self.http_only:
+            # Không giữ Chrome trong chế độ HTTP-only
+            self.close()
+    
+    def _new_api_session(self) -> requests.Session:
+        """
+        Tạo requests.Session với header chung, pool kết nối đủ cho api_concurrency request song song,
+        cookies và user agent từ browser hoặc từ session đã lưu
+        """
+        session = requests.Session()
+        session.headers.update(self.API_HEADERS)
+        session.headers['User-Agent'] = USER_AGENT
+        if self.driver:
+            for cookie in self.driver.get_cookies():
+                session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', '.shopee.vn'), path=cookie.get('path', '/')
+                )
+            session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent;") or USER_AGENT
+        elif self.session_state:
+            self.session_state.apply_to(session)
+        pool_size = max(1, self.api_concurrency)
+        if self.response_cache:
+            adapter = CachingAdapter(self.response_cache, pool_connections=2, pool_maxsize=pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _api_session(self) -> requests.Session:
+        """
+        Session HTTP dùng chung cho mọi lần gọi API của crawler (giữ kết nối keep-alive giữa các lần crawl).
+        Tạo lại khi nguồn cookies đổi (có browser sau khi chạy HTTP-only), khi có session mới
+        hoặc sau khi API từ chối request
+        """
+        source = 'driver' if self.driver else 'session_state'
+        with self._http_session_lock:
+            if self._http_session is not None and (self._http_session_stale or self._http_session_source != source):
+                self._http_session.close()
+                self._http_session = None
+            if self._http_session is None:
+                self._http_session = self._new_api_session()
+                self._http_session_source = source
+                self._http_session_stale = False
+                self._cookie_snapshot = {(c.name, c.domain): c.value for c in self._http_session.cookies}
+            return self._http_session
+    
+    def _close_api_session(self):
+        with self._http_session_lock:
+            if self._http_session is not None:
+                self._http_session.close()
+                self._http_session = None
+    
+    def _is_origin_cookie(self, domain: Optional[str]) -> bool:
+        """Cookie có thuộc host của BASE_URL không (domain '.shopee.vn' khớp cả shopee.vn và con của nó)"""
+        host = urlsplit(self.BASE_URL).hostname or ''
+        domain = (domain or '').lstrip('.').lower()
+        return bool(domain) and (host == domain or host.endswith('.' + domain))
+    
+    def _write_back_cookies(self):
+        """
+        Ghi cookies mới/đổi giá trị từ response API về browser,
+        hoặc vào session đã lưu (session_file) khi chạy HTTP-only.
+        Chỉ ghi cookies của domain ứng với BASE_URL
+        """
+        session = self._http_session
+        if session is None:
+            return
+        changed = [
+            c for c in session.cookies
+            if self._cookie_snapshot.get((c.name, c.domain)) != c.value and self._is_origin_cookie(c.domain)
+        ]
+        if not changed:
+            return
+        if self.driver:
+            for cookie in changed:
                 try:
-                    self.driver.close()
-                except:
+                    self.driver.add_cookie({
+                        'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path or '/'
+                    })
+                except Exception:
+                    # Browser đang ở domain khác thì không thêm được cookie
                     pass
-            self.driver = None
+        elif self.session_state and not self._replaying:
+            cookies = {(c['name'], c.get('domain')): c for c in self.session_state.cookies}
+            for cookie in changed:
+                cookies[(cookie.name, cookie.domain)] = {
+                    'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path or '/'
+                }
+            self.session_state.cookies = list(cookies.values())
+            try:
+                self.session_state.save(self.session_file)
+            except Exception as e:
+                print(f"⚠️ Không lưu được session: {e}")
+        self._cookie_snapshot.update({(c.name, c.domain): c.value for c in changed})
+    
+    def _crawl_api_http_only(self, crawl_api) -> Optional[List[Product]]:
+        """
+        Chạy crawl_api() chỉ bằng HTTP. Nếu session bị từ chối thì lấy session mới
+        bằng browser và thử lại một lần. Trả về None nếu vẫn bị từ chối.
+        """
+        if self.session_state is None:
+            self._bootstrap_session()
+        
+        self._api_rejected = False
+        products = crawl_api()
+        if not self._api_rejected:
+            return products
+        
+        print("⚠️ Session bị từ chối, đang lấy session mới...")
+        self._bootstrap_session()
+        self._api_rejected = False
+        products = crawl_api()
+        return None if self._api_rejected else products
     
     def __del__(self):
         """Đóng driver khi hủy object"""
         self.close()
     
+    @instrument('crawl_keyword')
     def crawl_by_keyword(
         self, 
         keyword: str, 
         limit: int = 60,
-        sort_by: str = "ctime"  # ctime, sales, price, pop
+        sort_by: str = "ctime",  # ctime, sales, price, pop
+        recrawl: bool = False,
+        product_filter: Optional[ProductFilter] = None,
+        checkpoint: Optional[str] = None
     ) -> List[Product]:
-        """Crawl sản phẩm theo keyword"""
+        """
+        Crawl sản phẩm theo keyword
+        recrawl: (cần store) dừng phân trang API khi gặp trang toàn sản phẩm đã lưu và không đổi
+        product_filter: chỉ giữ sản phẩm thỏa điều kiện (giá, rating... được gửi kèm request API)
+        checkpoint: file checkpoint, lưu sau mỗi trang API để tiếp tục bằng resume()
+        """
+        ckpt = self._open_checkpoint(checkpoint, 'keyword', keyword, limit, sort_by, recrawl, product_filter)
+        accepts = product_filter.matches if product_filter else (lambda product: True)
         products = []
         seen_product_ids = set()  # Để tránh trùng lặp
+        api_count = 0  # Số sản phẩm đầu danh sách lấy từ API (đã lưu vào store)
+        emitted = 0  # Số sản phẩm đầu danh sách đã ghi ra sink
         
         # Map sort_by sang tham số URL của Shopee
         sort_map = {
@@ -179,6 +447,15 @@ class ShopeeCrawler:
             "pop": "pop"
         }
         sort_param = sort_map.get(sort_by, "ctime")
+        self.readiness.reset()
+        
+        if self.http_only:
+            api_products = self._crawl_api_http_only(lambda: self._crawl_from_api_keyword(keyword, limit, sort_by, recrawl, product_filter, ckpt))
+            if api_products is not None:
+                print(f"Đã crawl được {len(api_products)} sản phẩm (HTTP-only)")
+                return self._finish_checkpoint(ckpt, api_products[:limit])
+            print("⚠️ Session vẫn bị từ chối, chuyển sang crawl bằng browser...")
+            self._ensure_driver()
         
         try:
             # Tạo URL search
@@ -187,8 +464,8 @@ class ShopeeCrawler:
                 search_url += f"&order={sort_param}"
             
             print(f"Đang truy cập: {search_url}")
-            self.driver.get(search_url)
-            time.sleep(5)  # Đợi trang load đầy đủ
+            self._navigate(search_url)
+            self.readiness.page_loaded(replaced_sleep=5)  # Đợi trang có dữ liệu
             
             # Debug: Kiểm tra title và URL
             print(f"Title: {self.driver.title}")
@@ -208,13 +485,12 @@ class ShopeeCrawler:
                     print("\n⏳ Đang đợi bạn giải CAPTCHA...")
                     input("\n👉 Nhấn Enter sau khi giải CAPTCHA xong: ")
                     
-                    # Kiểm tra lại URL
-                    current_url = self.driver.current_url
-                    if '/verify/captcha' not in current_url:
+                    # Đợi trang rời CAPTCHA (redirect có thể chưa xong ngay khi nhấn Enter)
+                    if self.readiness.url_leaves('/verify/captcha', timeout=5).satisfied:
                         print("✅ Đã giải CAPTCHA thành công!")
                         # Reload trang search
-                        self.driver.get(search_url)
-                        time.sleep(5)
+                        self._navigate(search_url)
+                        self.readiness.page_loaded(replaced_sleep=5)
                     else:
                         print("❌ Vẫn còn ở trang CAPTCHA. Vui lòng giải lại.")
                         return products[:limit]
@@ -223,31 +499,11 @@ class ShopeeCrawler:
                     print("   Đang tự động chuyển sang chế độ hiển thị browser...")
                     
                     # Đóng browser headless và mở lại không headless
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                    
-                    # Mở lại với không headless
-                    self.headless = False
-                    chrome_options = Options()
-                    chrome_options.add_argument('--no-sandbox')
-                    chrome_options.add_argument('--disable-dev-shm-usage')
-                    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-                    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-                    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                    chrome_options.add_experimental_option('useAutomationExtension', False)
-                    
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                    self.driver.set_window_size(1920, 1080)
-                    
-                    # Load cookies lại
-                    self._load_cookies()
+                    self._relaunch_visible_browser()
                     
                     # Truy cập lại trang search
-                    self.driver.get(search_url)
-                    time.sleep(3)
+                    self._navigate(search_url)
+                    self.readiness.page_loaded(replaced_sleep=3)
                     
                     # Kiểm tra lại CAPTCHA
                     if '/verify/captcha' in self.driver.current_url:
@@ -258,10 +514,10 @@ class ShopeeCrawler:
                         input("👉 Nhấn Enter sau khi giải CAPTCHA xong: ")
                         
                         # Kiểm tra lại
-                        if '/verify/captcha' not in self.driver.current_url:
+                        if self.readiness.url_leaves('/verify/captcha', timeout=5).satisfied:
                             print("✅ Đã giải CAPTCHA thành công!")
-                            self.driver.get(search_url)
-                            time.sleep(5)
+                            self._navigate(search_url)
+                            self.readiness.page_loaded(replaced_sleep=5)
                         else:
                             print("❌ Vẫn còn ở trang CAPTCHA.")
                             return products[:limit]
@@ -292,6 +548,7 @@ class ShopeeCrawler:
             
             # Debug: Kiểm tra số lượng elements trên trang
             try:
+                from selenium.webdriver.common.by import By
                 all_divs = self.driver.find_elements(By.TAG_NAME, "div")
                 all_links = self.driver.find_elements(By.TAG_NAME, "a")
                 print(f"Tổng số divs: {len(all_divs)}, Tổng số links: {len(all_links)}")
@@ -300,20 +557,26 @@ class ShopeeCrawler:
             
             # Thử lấy dữ liệu từ network requests (API calls)
             print("Đang lấy dữ liệu từ API...")
-            api_products = self._crawl_from_api_keyword(keyword, limit, sort_by)
+            api_products = self._crawl_from_api_keyword(keyword, limit, sort_by, recrawl, product_filter, ckpt)
             for product in api_products:
                 if product.product_id and product.product_id not in seen_product_ids:
                     products.append(product)
                     seen_product_ids.add(product.product_id)
+            # Sản phẩm từ API đã được lưu vào store và ghi ra sink theo từng trang
+            api_count = len(products)
+            emitted = api_count
             
             # Nếu chưa đủ, thử intercept network requests để lấy JSON
             if len(products) < limit:
                 print(f"Đã lấy {len(products)} sản phẩm từ API, đang thử lấy từ network requests...")
                 network_products = self._get_products_from_network_requests(keyword, limit - len(products))
                 for product in network_products:
-                    if product.product_id and product.product_id not in seen_product_ids:
+                    if product.product_id and product.product_id not in seen_product_ids and accepts(product):
                         products.append(product)
                         seen_product_ids.add(product.product_id)
+                self.metrics.count_products('network', len(products) - emitted)
+                self._emit(products[emitted:limit])
+                emitted = len(products)
             
             # Kiểm tra xem có đang ở trang login không
             if '/buyer/login' in self.driver.current_url:
@@ -329,15 +592,14 @@ class ShopeeCrawler:
                     print("\n⏳ Đang đợi bạn đăng nhập...")
                     input("\n👉 Nhấn Enter sau khi đăng nhập xong: ")
                     
-                    # Kiểm tra xem đã đăng nhập chưa
-                    current_url = self.driver.current_url
-                    if '/buyer/login' not in current_url:
+                    # Kiểm tra xem đã đăng nhập chưa (đợi trang rời trang login)
+                    if self.readiness.url_leaves('/buyer/login', timeout=5).satisfied:
                         print("✅ Đăng nhập thành công!")
                         # Lưu cookies
                         self._save_cookies()
                         # Reload trang search
-                        self.driver.get(search_url)
-                        time.sleep(5)
+                        self._navigate(search_url)
+                        self.readiness.page_loaded(replaced_sleep=5)
                     else:
                         print("❌ Vẫn chưa đăng nhập. Vui lòng thử lại.")
                         return products[:limit]
@@ -347,32 +609,11 @@ class ShopeeCrawler:
                     print("   (Browser sẽ mở ra để bạn đăng nhập)\n")
                     
                     # Đóng browser headless và mở lại không headless
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                    
-                    # Mở lại với không headless
-                    self.headless = False
-                    chrome_options = Options()
-                    chrome_options.add_argument('--no-sandbox')
-                    chrome_options.add_argument('--disable-dev-shm-usage')
-                    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-                    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-                    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                    chrome_options.add_experimental_option('useAutomationExtension', False)
-                    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
-                    
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                    self.driver.set_window_size(1920, 1080)
-                    
-                    # Load cookies lại
-                    self._load_cookies()
+                    self._relaunch_visible_browser()
                     
                     # Truy cập lại trang search
-                    self.driver.get(search_url)
-                    time.sleep(3)
+                    self._navigate(search_url)
+                    self.readiness.page_loaded(replaced_sleep=3)
                     
                     # Kiểm tra lại
                     if '/buyer/login' in self.driver.current_url:
@@ -383,11 +624,11 @@ class ShopeeCrawler:
                         input("👉 Nhấn Enter sau khi đăng nhập xong: ")
                         
                         # Kiểm tra lại
-                        if '/buyer/login' not in self.driver.current_url:
+                        if self.readiness.url_leaves('/buyer/login', timeout=5).satisfied:
                             print("✅ Đăng nhập thành công!")
                             self._save_cookies()
-                            self.driver.get(search_url)
-                            time.sleep(5)
+                            self._navigate(search_url)
+                            self.readiness.page_loaded(replaced_sleep=5)
                         else:
                             print("❌ Vẫn chưa đăng nhập.")
                             return products[:limit]
@@ -403,16 +644,8 @@ class ShopeeCrawler:
                     print("❌ Vẫn ở trang login. Vui lòng đăng nhập hoặc chạy không headless để đăng nhập.")
                     return products[:limit]
                 
-                # Đợi trang load hoàn toàn
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "body"))
-                    )
-                except:
-                    pass
-                
-                # Đợi thêm để JavaScript render
-                time.sleep(5)
+                # Đợi JavaScript render các card sản phẩm
+                self.readiness.product_anchors(replaced_sleep=5)
                 
                 # Scroll để load thêm sản phẩm
                 scroll_pause_time = 2
@@ -422,55 +655,47 @@ class ShopeeCrawler:
                 while len(products) < limit and scroll_count < max_scrolls:
                     # Scroll xuống từng phần
                     for i in range(3):
-                        self.driver.execute_script(f"window.scrollTo(0, {i * 500});")
-                        time.sleep(0.5)
+                        self._scroll(i * 500)
+                        self.readiness.dom_quiescent(quiet_ms=200, timeout=0.5, replaced_sleep=0.5)
                     
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(scroll_pause_time)
+                    # Đợi tới khi có thêm link sản phẩm thay vì đợi cố định sau mỗi lần scroll
+                    anchors = self.readiness.anchor_count()
+                    self._scroll()
+                    self.readiness.anchors_increase(anchors, timeout=scroll_pause_time, replaced_sleep=scroll_pause_time)
                     scroll_count += 1
                     
-                    # Debug: In ra số lượng links tìm thấy
-                    try:
-                        all_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/product/']")
-                        print(f"Tìm thấy {len(all_links)} links sản phẩm...")
-                    except:
-                        pass
+                    # Sản phẩm từ response API bắt được trong lúc scroll
+                    for product in self.network_capture.drain(limit - len(products)):
+                        if product.product_id and product.product_id not in seen_product_ids and accepts(product):
+                            products.append(product)
+                            seen_product_ids.add(product.product_id)
+                    self.metrics.count_products('network', len(products) - emitted)
+                    if len(products) >= limit:
+                        break
                     
-                    # Dùng Selenium để tìm elements trực tiếp
+                    # Lấy toàn bộ card trên trang bằng một script duy nhất
+                    before = len(products)
                     try:
-                        # Thử nhiều selector khác nhau
-                        selectors = [
-                            "a[href*='/product/']",
-                            "div[class*='shopee-search-item-result'] a",
-                            "div[class*='col-xs-2-4'] a",
-                            "div[data-sqe='item'] a",
-                            "[class*='product-item'] a",
-                            "[class*='search-result'] a"
-                        ]
+                        with self.metrics.time('dom_extract'):
+                            extracted = extract_cards(self.driver)
+                        print(f"Tìm thấy {extracted['links']} links sản phẩm, {len(extracted['cards'])} card...")
                         
-                        for selector in selectors:
-                            try:
-                                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                                print(f"Selector '{selector}': tìm thấy {len(elements)} elements")
-                                
-                                for elem in elements:
-                                    if len(products) >= limit:
-                                        break
-                                    try:
-                                        product = self._parse_product_from_selenium_element(elem)
-                                        if product and product.product_id and product.product_id not in seen_product_ids:
-                                            products.append(product)
-                                            seen_product_ids.add(product.product_id)
-                                            print(f"Đã parse sản phẩm: {product.name[:50]}...")
-                                    except Exception as e:
-                                        continue
-                                
-                                if len(products) >= limit:
-                                    break
-                            except Exception as e:
-                                continue
+                        for fields in extracted['cards']:
+                            if len(products) >= limit:
+                                break
+                            product = product_from_card_fields(fields, self.BASE_URL)
+                            if product is None:
+                                self.metrics.inc('parse_failures', source='dom')
+                            if product and product.product_id not in seen_product_ids and accepts(product):
+                                products.append(product)
+                                seen_product_ids.add(product.product_id)
+                                print(f"Đã parse sản phẩm: {product.name[:50]}...")
                     except Exception as e:
                         print(f"Lỗi khi parse HTML: {e}")
+                    self.metrics.count_products('dom', len(products) - before)
+                    
+                    self._emit(products[emitted:limit])
+                    emitted = len(products)
                     
                     if len(products) >= limit:
                         break
@@ -479,17 +704,19 @@ class ShopeeCrawler:
                     if scroll_count == 1 and len(products) == 0:
                         print("Thử cách parse khác...")
                         # Thử parse từ HTML source
-                        html = self.driver.page_source
-                        soup = BeautifulSoup(html, 'html.parser')
+                        from bs4 import BeautifulSoup
+                        with self.metrics.time('html_parse'):
+                            html = self.driver.page_source
+                            soup = BeautifulSoup(html, 'html.parser')
                         
                         # Tìm tất cả links có chứa /product/
-                        product_links = soup.find_all('a', href=re.compile(r'/product/\d+/\d+'))
+                        product_links = soup.find_all('a', href=PRODUCT_LINK_RE)
                         print(f"Tìm thấy {len(product_links)} product links trong HTML")
                         
                         for link in product_links[:limit]:
                             try:
                                 href = link.get('href', '')
-                                match = re.search(r'/product/(\d+)/(\d+)', href)
+                                match = PRODUCT_URL_RE.search(href)
                                 if match:
                                     shop_id = match.group(1)
                                     product_id = match.group(2)
@@ -501,7 +728,7 @@ class ShopeeCrawler:
                                         price = 0
                                         
                                         if parent:
-                                            name_elem = parent.find(string=re.compile(r'.+'))
+                                            name_elem = parent.find(string=NON_EMPTY_RE)
                                             if name_elem:
                                                 name = name_elem.strip()[:200]
                                         
@@ -524,11 +751,15 @@ class ShopeeCrawler:
                                                 product_url=f"{self.BASE_URL}{href}" if href.startswith('/') else href,
                                                 location=""
                                             )
+                                            if not accepts(product):
+                                                continue
                                             products.append(product)
                                             seen_product_ids.add(product_id)
                                             print(f"Đã parse từ HTML: {name[:50]}...")
                             except:
+                                self.metrics.inc('parse_failures', source='html')
                                 continue
+                        self.metrics.count_products('html', len(products))
                         
                         if len(products) > 0:
                             break
@@ -537,25 +768,31 @@ class ShopeeCrawler:
             print(f"Lỗi khi crawl keyword {keyword}: {e}")
             import traceback
             traceback.print_exc()
+            # Giữ checkpoint chưa hoàn thành để resume() tiếp tục
+            ckpt = None
         
+        products = products[:limit]
+        self._emit(products[emitted:])
+        self._save_to_store(products[api_count:])
         print(f"Đã crawl được {len(products)} sản phẩm")
-        return products[:limit]
+        self.readiness.report()
+        return self._finish_checkpoint(ckpt, products)
     
-    def _crawl_from_api_keyword(self, keyword: str, limit: int, sort_by: str) -> List[Product]:
+    def _crawl_from_api_keyword(
+        self,
+        keyword: str,
+        limit: int,
+        sort_by: str,
+        recrawl: bool = False,
+        product_filter: Optional[ProductFilter] = None,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+        offset: int = 0
+    ) -> List[Product]:
         """Thử crawl từ API với cookies từ Selenium"""
         products = []
         try:
-            # Đợi một chút để đảm bảo cookies đã được set
-            time.sleep(2)
-            
-            # Lấy cookies từ Selenium
-            cookies = self.driver.get_cookies()
-            session = requests.Session()
-            for cookie in cookies:
-                session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', '.shopee.vn'))
-            
-            # Lấy các headers từ browser
-            user_agent = self.driver.execute_script("return navigator.userAgent;")
+            # Session dùng chung (cookies và user agent từ Selenium hoặc session đã lưu)
+            session = self._api_session()
             
             # Encode keyword đúng cách
             encoded_keyword = keyword.replace(" ", "%20")
@@ -564,109 +801,299 @@ class ShopeeCrawler:
                 encoded_keyword = urllib.parse.quote(keyword)
             except:
                 pass
-            
-            session.headers.update({
-                'User-Agent': user_agent,
-                'Referer': f'{self.BASE_URL}/search?keyword={encoded_keyword}',
-                'Accept': 'application/json',
-                'Accept-Language': 'vi-VN,vi;q=0.9,en-US;q=0.8,en;q=0.7',
-                'X-Requested-With': 'XMLHttpRequest',
-                'X-API-Source': 'pc',
-                'X-Shopee-Language': 'vi',
-            })
+            headers = {'Referer': f'{self.BASE_URL}/search?keyword={encoded_keyword}'}
             
             # Thử gọi API với cookies
-            api_url = "https://shopee.vn/api/v4/search/search_items"
-            page = 0
+            base_params = {
+                'by': sort_by,
+                'keyword': encoded_keyword,
+                'order': 'desc' if sort_by != 'price' else 'asc',
+                'page_type': 'search',
+                'scenario': 'PAGE_GLOBAL_SEARCH',
+                'version': 2
+            }
             
-            while len(products) < limit:
-                # Encode keyword đúng cách
-                try:
-                    import urllib.parse
-                    encoded_keyword = urllib.parse.quote(keyword)
-                except:
-                    encoded_keyword = keyword.replace(" ", "%20")
-                
-                params = {
-                    'by': sort_by,
-                    'keyword': encoded_keyword,
-                    'limit': min(60, limit - len(products)),
-                    'newest': page * 60,
-                    'order': 'desc' if sort_by != 'price' else 'asc',
-                    'page_type': 'search',
-                    'scenario': 'PAGE_GLOBAL_SEARCH',
-                    'version': 2
-                }
-                
-                # Encode params đúng cách
+            products = self._crawl_search_items(
+                session, base_params, limit, recrawl, product_filter, checkpoint, offset, headers
+            )
+            self._write_back_cookies()
+        except Exception as e:
+            self._fetch_failed = True
+            print(f"Lỗi khi crawl từ API: {e}")
+        
+        return products
+    
+    def _fetch_search_items_page(
+        self,
+        session: requests.Session,
+        params: Dict,
+        headers: Optional[Dict] = None,
+        stop: Optional[threading.Event] = None
+    ) -> Optional[Dict]:
+        """
+        Gọi API search_items cho một trang (headers: header riêng như Referer), trả về JSON hoặc None nếu lỗi.
+        stop: event của paginator, đã set thì không gửi request / retry nữa
+        """
+        api_url = f"{self.BASE_URL}{self.SEARCH_API_PATH}"
+        # Response đã có trong cache không tốn lượt gọi Shopee
+        cached = self.response_cache is not None and self.response_cache.contains(
+            requests.Request('GET', api_url, params=params).prepare().url
+        )
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            if stop is not None and stop.is_set():
+                return None
+            try:
+                if not cached:
+                    with self.metrics.time('rate_limit_wait'):
+                        self.rate_limiter.acquire(api_url)
+                    if stop is not None and stop.is_set():
+                        return None
+                with self.metrics.time('http_request'):
+                    try:
+                        response = session.get(api_url, params=params, headers=headers, timeout=15)
+                    except UnicodeEncodeError:
+                        # Fallback: encode manually
+                        import urllib.parse
+                        query_string = urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
+                        response = session.get(f"{api_url}?{query_string}", headers=headers, timeout=15)
+            except Exception as e:
+                self.metrics.inc('http_errors')
+                print(f"Lỗi khi gọi API (newest={params.get('newest')}): {e}")
+                return None
+            
+            self.metrics.inc('http_responses', status=response.status_code)
+            if getattr(response, 'from_cache', False):
+                self.metrics.inc('cache_hits')
+                backoff = None
+            else:
+                backoff = self.rate_limiter.record(api_url, response.status_code)
+            if response.status_code == 200:
                 try:
-                    response = session.get(api_url, params=params, timeout=15)
-                except UnicodeEncodeError:
-                    # Fallback: encode manually
-                    import urllib.parse
-                    query_string = urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
-                    full_url = f"{api_url}?{query_string}"
-                    response = session.get(full_url, timeout=15)
-                
-                if response.status_code == 200:
                     data = response.json()
-                    items = data.get('items', [])
-                    if not items:
-                        break
-                    for item in items:
-                        if len(products) >= limit:
-                            break
-                        product = self._parse_product_from_api(item)
-                        if product:
-                            products.append(product)
-                    page += 1
-                    time.sleep(1)
+                except ValueError:
+                    return None
+                # Shopee trả 200 kèm mã lỗi khi session không hợp lệ
+                if data.get('error') and not data.get('items'):
+                    self._api_rejected = True
+                    self._http_session_stale = True
+                    return None
+                return data
+            if backoff is None or attempt == self.rate_limiter.max_retries:
+                break
+            
+            print(f"API trả về {response.status_code}, thử lại sau {backoff:.1f}s...")
+            self.metrics.inc('http_retries')
+            with self.metrics.time('backoff_sleep'):
+                if stop is not None:
+                    stop.wait(backoff)
                 else:
-                    # Nếu bị 403, thử intercept network requests từ Selenium
-                    if response.status_code == 403:
-                        print("API bị chặn, sẽ parse từ HTML...")
+                    time.sleep(backoff)
+        
+        if response.status_code in (401, 403):
+            self._api_rejected = True
+            # Lần gọi sau nạp lại cookies (browser có thể đã có cookies mới)
+            self._http_session_stale = True
+            print("API bị chặn, sẽ parse từ HTML...")
+        return None
+    
+    def _crawl_search_items(
+        self,
+        session: requests.Session,
+        base_params: Dict,
+        limit: int,
+        recrawl: bool = False,
+        product_filter: Optional[ProductFilter] = None,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+        offset: int = 0,
+        headers: Optional[Dict] = None
+    ) -> List[Product]:
+        """
+        Tải các trang search_items theo thứ tự offset (song song nhiều trang) và parse sản phẩm.
+        Dùng chung cho crawl theo keyword và category. Nếu có store thì lưu từng trang;
+        với recrawl=True, dừng khi một trang chỉ toàn sản phẩm đã biết và không đổi.
+        product_filter: điều kiện API hỗ trợ được gửi kèm params, phần còn lại lọc trên từng trang
+        checkpoint: bắt đầu từ trang kế tiếp của checkpoint, lưu checkpoint sau mỗi trang
+        offset: bắt đầu từ offset `newest` này (bội số của PAGE_SIZE), dùng khi chia job thành nhiều khoảng trang
+        headers: header riêng của từng request (Referer theo keyword/category)
+        """
+        products = []
+        start_page = offset // PAGE_SIZE
+        known = set()
+        self._fetch_failed = False
+        if checkpoint:
+            # Các trang đã xong không tải lại
+            products = checkpoint.products()
+            start_page = max(start_page, checkpoint.cursor // PAGE_SIZE)
+            if len(products) >= limit:
+                return products[:limit]
+            # Trang lấy dở lần trước sẽ được tải lại, bỏ các sản phẩm đã có
+            known = {(p.shop_id, p.product_id) for p in products}
+        fetch_limit = limit
+        if product_filter:
+            base_params = {**base_params, **product_filter.to_api_params()}
+            # Một phần sản phẩm sẽ bị loại ở local, cho phép tải thêm trang tới khi đủ limit
+            fetch_limit = max(limit, self.FILTER_MAX_FETCH)
+        paginator = SearchItemsPaginator(
+            lambda params: self._fetch_search_items_page(session, params, headers, paginator.stop_event),
+            base_params,
+            start_page * PAGE_SIZE + fetch_limit,
+            concurrency=self.api_concurrency,
+            start_page=start_page
+        )
+        for newest, items in paginator.iter_pages():
+            self.metrics.inc('pages_fetched')
+            with self.metrics.time('parse_api'):
+                page_products = [p for p in map(self._parse_product_from_api, items) if p]
+            if len(page_products) < len(items):
+                self.metrics.inc('parse_failures', len(items) - len(page_products), source='api')
+            if product_filter:
+                page_products = product_filter.apply(page_products)
+            if known:
+                page_products = [p for p in page_products if (p.shop_id, p.product_id) not in known]
+            # Trang đủ item và không bị cắt bớt theo limit mới tính là xong
+            complete = len(items) >= PAGE_SIZE and len(page_products) <= limit - len(products)
+            page_products = page_products[:limit - len(products)]
+            products.extend(page_products)
+            self.metrics.count_products('api', len(page_products))
+            self._emit(page_products)
+            if checkpoint:
+                checkpoint.record(page_products, cursor=newest + PAGE_SIZE if complete else newest)
+            
+            if self.store and page_products:
+                stats = self.store.upsert_many(page_products)
+                if recrawl and stats['new'] == 0 and stats['changed'] == 0:
+                    print(f"⏹️  Trang newest={newest} không có sản phẩm mới/thay đổi, dừng phân trang")
                     break
-        except Exception as e:
-            print(f"Lỗi khi crawl từ API: {e}")
+            
+            if len(products) >= limit:
+                break
+        if paginator.failed:
+            self._fetch_failed = True
+        return products
+    
+    @instrument('crawl_page_range')
+    def crawl_page_range(self, kind: str, target, start: int, stop: int, sort_by: str = "ctime") -> List[Product]:
+        """
+        Crawl các sản phẩm ở offset [start, stop) trong kết quả keyword/category qua API search_items
+        (một phần của job lớn được chia cho nhiều worker). Trả về danh sách rỗng nếu đã hết kết quả.
+        Raise RuntimeError nếu API từ chối hoặc có trang tải lỗi, để task được thử lại thay vì coi là hết kết quả
+        """
+        self._fetch_failed = False
+        if kind == 'keyword':
+            crawl_api = lambda: self._crawl_from_api_keyword(target, stop - start, sort_by, offset=start)
+        elif kind == 'category':
+            crawl_api = lambda: self._crawl_from_api_category(int(target), stop - start, sort_by, offset=start)
+        else:
+            raise ValueError(f"Không chia được job {kind} theo khoảng trang")
+        
+        products = None
+        if self.http_only:
+            products = self._crawl_api_http_only(crawl_api)
+            if products is None:
+                print("⚠️ Session vẫn bị từ chối, chuyển sang lấy cookies từ browser...")
+                self._ensure_driver()
         
+        if products is None:
+            self._api_rejected = False
+            products = crawl_api()
+            if self._api_rejected:
+                raise RuntimeError(f"API từ chối request cho {kind}:{target} [{start}, {stop})")
+        if self._fetch_failed and len(products) < stop - start:
+            raise RuntimeError(f"Tải trang lỗi khi crawl {kind}:{target} [{start}, {stop})")
+        return products
+    
+    def _open_checkpoint(
+        self,
+        path: Optional[str],
+        kind: str,
+        target,
+        limit: int,
+        sort_by: str = "ctime",
+        recrawl: bool = False,
+        product_filter: Optional[ProductFilter] = None
+    ) -> Optional[CrawlCheckpoint]:
+        """Mở checkpoint (tiếp tục nếu file có job cùng tùy chọn chưa xong), lưu kèm tùy chọn để resume() dùng lại"""
+        # Bắt đầu lần crawl mới: bỏ trạng thái lỗi tải trang của lần crawl trước
+        self._fetch_failed = False
+        if not path:
+            return None
+        options = {'recrawl': recrawl}
+        if product_filter:
+            options['product_filter'] = {
+                name: sorted(value) if isinstance(value, frozenset) else value
+                for name, value in asdict(product_filter).items()
+            }
+        return CrawlCheckpoint.open(path, kind, target, limit, sort_by, options)
+    
+    def _finish_checkpoint(self, checkpoint: Optional[CrawlCheckpoint], products: List[Product]) -> List[Product]:
+        """
+        Đánh dấu checkpoint đã xong (nếu có). Nếu phân trang dừng vì tải trang lỗi mà chưa đủ limit
+        thì giữ checkpoint chưa hoàn thành để resume() tải tiếp từ trang lỗi
+        """
+        if checkpoint:
+            if self._fetch_failed and len(products) < checkpoint.limit:
+                print(f"⚠️ Có trang tải lỗi, giữ checkpoint {checkpoint.path} chưa hoàn thành để tiếp tục bằng resume")
+                return products
+            checkpoint.finish(products)
         return products
     
+    def resume(self, path: str) -> List[Product]:
+        """
+        Tiếp tục crawl từ file checkpoint: các trang API đã xong không tải lại,
+        trang shop được scroll tới vị trí cũ và bỏ qua sản phẩm đã thấy
+        """
+        checkpoint = CrawlCheckpoint.load(path)
+        if checkpoint is None:
+            raise FileNotFoundError(f"Không tìm thấy checkpoint: {path}")
+        if checkpoint.done:
+            print(f"✅ Checkpoint đã hoàn thành ({checkpoint.product_count} sản phẩm)")
+            return checkpoint.products()
+        
+        options = checkpoint.options
+        product_filter = None
+        if options.get('product_filter'):
+            product_filter = ProductFilter(**options['product_filter'])
+        if checkpoint.kind == 'keyword':
+            return self.crawl_by_keyword(
+                checkpoint.target, limit=checkpoint.limit, sort_by=checkpoint.sort_by,
+                recrawl=options.get('recrawl', False), product_filter=product_filter, checkpoint=path
+            )
+        if checkpoint.kind == 'category':
+            return self.crawl_by_category(
+                int(checkpoint.target), limit=checkpoint.limit, sort_by=checkpoint.sort_by,
+                recrawl=options.get('recrawl', False), product_filter=product_filter, checkpoint=path
+            )
+        return self.crawl_by_shop(checkpoint.target, limit=checkpoint.limit, product_filter=product_filter, checkpoint=path)
+    
+    def _emit(self, products: List[Product]):
+        """Ghi sản phẩm vừa parse ra sink (nếu có)"""
+        if self.sink and products:
+            self.sink.write_many(products)
+    
+    def _save_to_store(self, products: List[Product]):
+        """Lưu sản phẩm vào store (nếu có)"""
+        if self.store and products:
+            stats = self.store.upsert_many(products)
+            print(f"💾 Đã lưu vào store: {stats['new']} mới, {stats['changed']} thay đổi, {stats['unchanged']} không đổi")
+    
     def _get_products_from_network_requests(self, keyword: str, limit: int) -> List[Product]:
-        """Lấy dữ liệu từ network requests bằng Chrome DevTools Protocol"""
+        """Lấy dữ liệu từ response API mà trang đã gọi (bắt qua NetworkCapture)"""
         products = []
         try:
-            # Lấy performance logs để xem network requests
-            logs = self.driver.get_log('performance')
+            # Lấy các sản phẩm đã bắt được từ response API trong lúc trang load
+            products.extend(self.network_capture.drain(limit))
             
-            for log in logs:
-                try:
-                    message = json.loads(log['message'])['message']
-                    if message['method'] == 'Network.responseReceived':
-                        url = message['params']['response']['url']
-                        if 'search_items' in url or 'search/search_items' in url:
-                            request_id = message['params']['requestId']
-                            # Lấy response body
-                            try:
-                                response_body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
-                                if response_body and 'body' in response_body:
-                                    data = json.loads(response_body['body'])
-                                    if 'items' in data:
-                                        for item in data['items'][:limit]:
-                                            product = self._parse_product_from_api(item)
-                                            if product:
-                                                products.append(product)
-                            except:
-                                pass
-                except:
-                    continue
+            # Scroll để trigger thêm API calls, lấy sản phẩm ngay khi response về
+            for i in range(2):
+                if len(products) >= limit:
+                    break
+                responses = self.readiness.search_response_count()
+                self._scroll()
+                self.readiness.search_items_response(responses + 1, timeout=2, replaced_sleep=2)
+                products.extend(self.network_capture.drain(limit - len(products)))
             
-            # Nếu không lấy được từ logs, thử intercept bằng JavaScript
+            # Nếu không bắt được response nào, thử lấy từ window object
             if len(products) == 0:
-                # Scroll để trigger API calls
-                for i in range(2):
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                
                 # Thử lấy từ window object
                 try:
                     script = """
@@ -705,196 +1132,159 @@ class ShopeeCrawler:
         return products[:limit]
     
     def _parse_product_from_selenium_element(self, element) -> Optional[Product]:
-        """Parse sản phẩm từ Selenium WebElement"""
+        """Parse sản phẩm từ Selenium WebElement (mỗi card nhiều round trip, ưu tiên extract_cards)"""
         try:
-            # Lấy href để extract product_id
-            href = element.get_attribute('href')
-            
-            # Nếu element không phải là link, tìm link bên trong
-            if not href or '/product/' not in href:
-                try:
-                    # Thử tìm link trong element hoặc parent
-                    link_elem = element.find_element(By.CSS_SELECTOR, "a[href*='/product/']")
-                    href = link_elem.get_attribute('href')
-                except:
-                    try:
-                        # Thử tìm trong parent
-                        parent = element.find_element(By.XPATH, "./..")
-                        link_elem = parent.find_element(By.CSS_SELECTOR, "a[href*='/product/']")
-                        href = link_elem.get_attribute('href')
-                    except:
-                        return None
-            
-            if not href or '/product/' not in href:
-                return None
-            
-            # Extract shop_id và product_id
-            match = re.search(r'/product/(\d+)/(\d+)', href)
-            if not match:
-                return None
-            
-            shop_id = match.group(1)
-            product_id = match.group(2)
-            product_url = f"{self.BASE_URL}{href}" if href.startswith('/') else href
-            
-            # Lấy tên sản phẩm
-            name = ""
-            try:
-                name_elem = element.find_element(By.CSS_SELECTOR, "[class*='name'], [class*='title'], [class*='product-name']")
-                name = name_elem.text.strip()
-            except:
-                try:
-                    name = element.find_element(By.TAG_NAME, "a").text.strip()
-                except:
-                    pass
-            
-            if not name:
-                return None
-            
-            # Lấy giá
-            price = 0
-            try:
-                price_elem = element.find_element(By.CSS_SELECTOR, "[class*='price'], [class*='final-price']")
-                price_text = price_elem.text.strip()
-                price_match = re.search(r'(\d+(?:\.\d+)?)', price_text.replace('.', '').replace(',', ''))
-                if price_match:
-                    price = float(price_match.group(1))
-            except:
-                pass
-            
-            # Lấy hình ảnh
-            image_url = ""
-            try:
-                img_elem = element.find_element(By.CSS_SELECTOR, "img")
-                image_url = img_elem.get_attribute('src') or img_elem.get_attribute('data-src') or ""
-                if image_url and not image_url.startswith('http'):
-                    image_url = f"https:{image_url}" if image_url.startswith('//') else f"https://{image_url}"
-            except:
-                pass
-            
-            # Lấy số lượng bán
-            sales_count = 0
-            try:
-                text = element.text
-                sold_match = re.search(r'đã\s*bán[:\s]*(\d+(?:\.\d+)?[kK]?)', text, re.IGNORECASE)
-                if sold_match:
-                    sold_num = sold_match.group(1).lower()
-                    if 'k' in sold_num:
-                        sales_count = int(float(sold_num.replace('k', '')) * 1000)
-                    else:
-                        sales_count = int(float(sold_num))
-            except:
-                pass
-            
-            return Product(
-                name=name,
-                price=price,
-                original_price=None,
-                commission_rate=None,
-                sales_count=sales_count,
-                rating=None,
-                shop_name="",
-                shop_id=shop_id,
-                product_id=product_id,
-                category="",
-                image_url=image_url,
-                product_url=product_url,
-                location=""
-            )
+            fields = read_element_fields(element)
+            return product_from_card_fields(fields, self.BASE_URL) if fields else None
         except Exception as e:
             return None
     
+    @instrument('crawl_category')
     def crawl_by_category(
         self,
         category_id: int,
         limit: int = 60,
-        sort_by: str = "ctime"
+        sort_by: str = "ctime",
+        recrawl: bool = False,
+        product_filter: Optional[ProductFilter] = None,
+        checkpoint: Optional[str] = None
+    ) -> List[Product]:
+        """
+        Crawl sản phẩm theo category
+        recrawl: (cần store) dừng phân trang khi gặp trang toàn sản phẩm đã lưu và không đổi
+        product_filter: chỉ giữ sản phẩm thỏa điều kiện (giá, rating... được gửi kèm request API)
+        checkpoint: file checkpoint, lưu sau mỗi trang API để tiếp tục bằng resume()
+        """
+        ckpt = self._open_checkpoint(checkpoint, 'category', category_id, limit, sort_by, recrawl, product_filter)
+        if self.http_only:
+            products = self._crawl_api_http_only(lambda: self._crawl_from_api_category(category_id, limit, sort_by, recrawl, product_filter, ckpt))
+            if products is not None:
+                return self._finish_checkpoint(ckpt, products[:limit])
+            print("⚠️ Session vẫn bị từ chối, chuyển sang lấy cookies từ browser...")
+            self._ensure_driver()
+        
+        self._api_rejected = False
+        products = self._crawl_from_api_category(category_id, limit, sort_by, recrawl, product_filter, ckpt)[:limit]
+        if self._api_rejected:
+            # Bị chặn giữa chừng, giữ checkpoint chưa hoàn thành để resume() tiếp tục
+            return products
+        return self._finish_checkpoint(ckpt, products)
+    
+    def _crawl_from_api_category(
+        self,
+        category_id: int,
+        limit: int,
+        sort_by: str,
+        recrawl: bool = False,
+        product_filter: Optional[ProductFilter] = None,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+        offset: int = 0
     ) -> List[Product]:
-        """Crawl sản phẩm theo category"""
+        """Crawl category qua API search_items"""
         products = []
         
         try:
-            category_url = f"{self.BASE_URL}/api/v4/search/search_items"
+            # Session dùng chung (cookies và user agent từ Selenium hoặc session đã lưu)
+            session = self._api_session()
+            headers = {'Referer': f'{self.BASE_URL}/'}
             
-            # Lấy cookies từ Selenium
-            cookies = self.driver.get_cookies()
-            session = requests.Session()
-            for cookie in cookies:
-                session.cookies.set(cookie['name'], cookie['value'])
+            base_params = {
+                'by': sort_by,
+                'categoryids': category_id,
+                'order': 'desc' if sort_by != 'price' else 'asc',
+                'page_type': 'search',
+                'scenario': 'PAGE_CATEGORY',
+                'version': 2
+            }
             
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Referer': f'{self.BASE_URL}/',
-                'Accept': 'application/json',
-            })
-            
-            page = 0
-            while len(products) < limit:
-                params = {
-                    'by': sort_by,
-                    'categoryids': category_id,
-                    'limit': min(60, limit - len(products)),
-                    'newest': page * 60,
-                    'order': 'desc' if sort_by != 'price' else 'asc',
-                    'page_type': 'search',
-                    'scenario': 'PAGE_CATEGORY',
-                    'version': 2
-                }
-                
-                response = session.get(category_url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    items = data.get('items', [])
-                    if not items:
-                        break
-                    for item in items:
-                        if len(products) >= limit:
-                            break
-                        product = self._parse_product_from_api(item)
-                        if product:
-                            products.append(product)
-                    page += 1
-                    time.sleep(1)
-                else:
-                    break
+            products = self._crawl_search_items(
+                session, base_params, limit, recrawl, product_filter, checkpoint, offset, headers
+            )
+            self._write_back_cookies()
         except Exception as e:
+            self._fetch_failed = True
             print(f"Lỗi khi crawl category {category_id}: {e}")
         
         return products[:limit]
     
+    @instrument('crawl_shop')
     def crawl_by_shop(
         self,
         shop_id: str,
-        limit: int = 60
+        limit: int = 60,
+        product_filter: Optional[ProductFilter] = None,
+        checkpoint: Optional[str] = None
     ) -> List[Product]:
-        """Crawl sản phẩm theo shop"""
-        products = []
+        """
+        Crawl sản phẩm theo shop
+        product_filter: chỉ giữ sản phẩm thỏa điều kiện (lọc ở local)
+        checkpoint: file checkpoint, lưu vị trí scroll và sản phẩm đã thấy sau mỗi lần scroll
+        """
+        ckpt = self._open_checkpoint(checkpoint, 'shop', shop_id, limit, product_filter=product_filter)
+        products = ckpt.products() if ckpt else []
+        if ckpt and len(products) >= limit:
+            return products[:limit]
+        # Trang shop cần browser kể cả ở chế độ HTTP-only
+        self._ensure_driver()
         
         try:
             shop_url = f"{self.BASE_URL}/shop/{shop_id}"
             print(f"Đang truy cập shop: {shop_url}")
-            self.driver.get(shop_url)
-            time.sleep(3)
+            self._navigate(shop_url)
+            self.readiness.page_loaded(replaced_sleep=3)
+            
+            # Mỗi lần scroll chỉ parse các card mới, bỏ trùng theo (shop_id, product_id)
+            harvester = ShopHarvester(
+                lambda: self.driver,
+                lambda fragment: self.html_parser.parse_fragment(fragment, shop_id=shop_id)
+            )
             
             # Scroll và load sản phẩm
             scroll_pause_time = 1
             last_height = self.driver.execute_script("return document.body.scrollHeight")
             
+            if ckpt:
+                # Bỏ qua sản phẩm đã lấy, scroll (để trang load dần) tới vị trí đã lưu
+                harvester.seen.update(ckpt.seen)
+                harvester.seen.update((p.shop_id, p.product_id) for p in products)
+                while last_height < ckpt.cursor:
+                    self._scroll()
+                    self.readiness.dom_quiescent(timeout=scroll_pause_time, replaced_sleep=scroll_pause_time)
+                    new_height = self.driver.execute_script("return document.body.scrollHeight")
+                    if new_height == last_height:
+                        break
+                    last_height = new_height
+            
             while len(products) < limit:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(scroll_pause_time)
+                anchors = self.readiness.anchor_count()
+                self._scroll()
+                self.readiness.anchors_increase(anchors, timeout=scroll_pause_time, replaced_sleep=scroll_pause_time)
                 
-                html = self.driver.page_source
-                soup = BeautifulSoup(html, 'html.parser')
+                emitted = len(products)
+                # Sản phẩm từ response API của shop bắt được trong lúc scroll
+                for product in self.network_capture.drain(limit - len(products)):
+                    if harvester.add(product) and (product_filter is None or product_filter.matches(product)):
+                        products.append(product)
+                self.metrics.count_products('network', len(products) - emitted)
                 
-                # Parse sản phẩm từ HTML
-                product_elements = soup.find_all('div', class_=re.compile(r'col-xs-2-4|shopee-search-item'))
-                for element in product_elements:
+                # Parse các card mới xuất hiện trên trang
+                before = len(products)
+                with self.metrics.time('html_harvest'):
+                    harvested = harvester.harvest()
+                if product_filter:
+                    harvested = product_filter.apply(harvested)
+                for product in harvested:
                     if len(products) >= limit:
                         break
-                    product = self._parse_product_from_html(element, shop_id=shop_id)
-                    if product and product not in products:
-                        products.append(product)
+                    products.append(product)
+                self.metrics.count_products('html', len(products) - before)
+                self._emit(products[emitted:])
+                if ckpt:
+                    ckpt.record(
+                        products[emitted:],
+                        cursor=self.driver.execute_script("return window.pageYOffset"),
+                        seen=harvester.seen
+                    )
                 
                 new_height = self.driver.execute_script("return document.body.scrollHeight")
                 if new_height == last_height:
@@ -905,8 +1295,12 @@ class ShopeeCrawler:
                     break
         except Exception as e:
             print(f"Lỗi khi crawl shop {shop_id}: {e}")
+            # Giữ checkpoint chưa hoàn thành để resume() tiếp tục
+            ckpt = None
         
-        return products[:limit]
+        products = products[:limit]
+        self._save_to_store(products)
+        return self._finish_checkpoint(ckpt, products)
     
     def _parse_product_from_api(self, item: Dict) -> Optional[Product]:
         """Parse sản phẩm từ API response"""
@@ -924,8 +1318,8 @@ class ShopeeCrawler:
             rating = item_basic.get('item_rating', {}).get('rating_star', 0)
             name = item_basic.get('name', '')
             product_id = str(item_basic.get('itemid', ''))
-            image_url = f"https://cf.shopee.vn/file/{item_basic.get('image', '')}"
-            product_url = f"https://shopee.vn/product/{shop_id}/{product_id}"
+            image_url = f"{self.IMAGE_BASE_URL}{item_basic.get('image', '')}"
+            product_url = f"{self.BASE_URL}/product/{shop_id}/{product_id}"
             category = str(item_basic.get('catid', ''))
             location = item_basic.get('shop_location', '')
             
@@ -948,107 +1342,5 @@ class ShopeeCrawler:
             return None
     
     def _parse_product_from_html(self, element, shop_id: Optional[str] = None) -> Optional[Product]:
-        """Parse sản phẩm từ HTML element"""
-        try:
-            # Tìm link sản phẩm trước (quan trọng nhất)
-            link_elem = element.find('a', href=re.compile(r'/product/'))
-            if not link_elem:
-                return None
-            
-            href = link_elem.get('href', '')
-            if not href:
-                return None
-            
-            product_url = f"{self.BASE_URL}{href}" if href.startswith('/') else href
-            
-            # Extract shop_id và product_id từ URL
-            match = re.search(r'/product/(\d+)/(\d+)', href)
-            if not match:
-                return None
-            
-            shop_id = match.group(1)
-            product_id = match.group(2)
-            
-            # Tìm tên sản phẩm - thử nhiều selector
-            name = ""
-            name_selectors = [
-                'div[class*="name"]',
-                'div[class*="product-name"]',
-                'div[class*="title"]',
-                'a[href*="/product/"]'
-            ]
-            for selector in name_selectors:
-                name_elem = element.select_one(selector)
-                if name_elem:
-                    name = name_elem.get_text(strip=True)
-                    if name:
-                        break
-            
-            if not name:
-                name = link_elem.get_text(strip=True)
-            
-            if not name:
-                return None
-            
-            # Tìm giá - thử nhiều selector
-            price = 0
-            price_selectors = [
-                'span[class*="price"]',
-                'div[class*="price"]',
-                '[class*="final-price"]',
-                '[class*="current-price"]'
-            ]
-            for selector in price_selectors:
-                price_elem = element.select_one(selector)
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    # Extract số từ giá
-                    price_match = re.search(r'(\d+(?:\.\d+)?)', price_text.replace('.', '').replace(',', ''))
-                    if price_match:
-                        price = float(price_match.group(1))
-                        break
-            
-            # Tìm hình ảnh
-            img_elem = element.find('img')
-            image_url = ""
-            if img_elem:
-                image_url = img_elem.get('src', '') or img_elem.get('data-src', '')
-                if image_url and not image_url.startswith('http'):
-                    image_url = f"https:{image_url}" if image_url.startswith('//') else f"https://{image_url}"
-            
-            # Tìm số lượng bán
-            sales_count = 0
-            sold_text = element.get_text()
-            sold_match = re.search(r'đã\s*bán[:\s]*(\d+(?:\.\d+)?[kK]?)', sold_text, re.IGNORECASE)
-            if sold_match:
-                sold_num = sold_match.group(1).lower()
-                if 'k' in sold_num:
-                    sales_count = int(float(sold_num.replace('k', '')) * 1000)
-                else:
-                    sales_count = int(float(sold_num))
-            
-            # Tìm rating
-            rating = None
-            rating_elem = element.find(string=re.compile(r'\d+\.\d+'))
-            if rating_elem:
-                rating_match = re.search(r'(\d+\.\d+)', rating_elem)
-                if rating_match:
-                    rating = float(rating_match.group(1))
-            
-            return Product(
-                name=name,
-                price=price,
-                original_price=None,
-                commission_rate=None,
-                sales_count=sales_count,
-                rating=rating,
-                shop_name="",
-                shop_id=shop_id,
-                product_id=product_id,
-                category="",
-                image_url=image_url,
-                product_url=product_url,
-                location=""
-            )
-        except Exception as e:
-            return None
+        """Parse sản phẩm từ HTML element (BeautifulSoup Tag)"""
+        return BeautifulSoupParser(self.BASE_URL).parse_element(element, shop_id=shop_id)
@@ -0,0 +1,5 @@
+from .server import Catalogue, DevServerConfig, ShopeeDevServer
+
+__all__ = ['Catalogue', 'DevServerConfig', 'ShopeeDevServer']
+
+
@@ -0,0 +1,52 @@
+"""
+Chạy server giả lập Shopee để test tải / lỗi:
+    python -m devserver --port 8800 --latency 0.1 --error-rate 0.05 --max-rps 20
+    python cli.py crawl keyword "áo thun" --http-only --base-url http://127.0.0.1:8800
+Đổi cấu hình khi đang chạy: curl "http://127.0.0.1:8800/__config?error_rate=0.5&error_codes=429"
+Xem số request: curl http://127.0.0.1:8800/__stats
+"""
+import argparse
+
+from .server import DevServerConfig, ShopeeDevServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, default=0.05, help='Độ trễ mỗi request (giây)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Độ trễ ngẫu nhiên thêm tối đa (giây)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Tỉ lệ request API trả lỗi (0-1)')
+    parser.add_argument('--error-codes', default='429,403', help='Mã lỗi trả về, phân cách bằng dấu phẩy')
+    parser.add_argument('--captcha-rate', type=float, default=0.0, help='Tỉ lệ trang search/shop bị chuyển tới CAPTCHA')
+    parser.add_argument('--max-rps', type=float, default=None, help='Quá số request API/giây này thì trả 429')
+    parser.add_argument('--page-size', type=int, default=60, help='Số item tối đa mỗi trang search_items')
+    parser.add_argument('--items', type=int, default=3000, help='Số sản phẩm mỗi keyword/category')
+    parser.add_argument('--shop-items', type=int, default=120, help='Số sản phẩm mỗi trang shop')
+    parser.add_argument('--require-cookie', action='store_true', help='Từ chối request API không có cookie SPC_F')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = DevServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_codes=tuple(int(code) for code in args.error_codes.split(',') if code),
+        captcha_rate=args.captcha_rate,
+        max_rps=args.max_rps,
+        page_size=args.page_size,
+        items_per_target=args.items,
+        shop_items=args.shop_items,
+        require_cookie=args.require_cookie,
+        seed=args.seed,
+    )
+    server = ShopeeDevServer(config, args.host, args.port)
+    print(f"🧪 Server giả lập Shopee tại {server.url} (thống kê: {server.url}/__stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Dừng server")
+
+
+if __name__ == '__main__':
+    main()
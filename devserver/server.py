@@ -0,0 +1,383 @@
+"""
+Server HTTP giả lập Shopee chạy local để test tải, throttle và khả năng phục hồi của crawler:
+- /api/v4/search/search_items: phân trang theo `newest`/`limit` cho keyword và categoryids,
+  sắp xếp theo `by`/`order`, lọc price_min/price_max/rating_filter
+- /search, /shop/<shop_id>, /product/<shop_id>/<item_id>: trang HTML với card sản phẩm
+- /verify/captcha: trang CAPTCHA (trang search/shop bị redirect tới đây theo captcha_rate)
+- lỗi 403/429/5xx theo error_rate, 429 khi vượt max_rps
+- /__stats: số request theo loại và status, /__config?error_rate=0.3: đổi cấu hình khi đang chạy
+Dữ liệu sinh từ các bản ghi mẫu trong file `aaa`, cố định theo keyword/category/shop.
+"""
+import json
+import random
+import threading
+import time
+import urllib.parse
+import zlib
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.fixtures import api_item
+from benchmarks.html_fixtures import card_html, load_sample_records
+
+SEARCH_ITEMS_PATH = '/api/v4/search/search_items'
+
+# Ảnh GIF 1x1 cho /file/<id>
+PIXEL_GIF = (
+    b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00'
+    b',\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+)
+
+SESSION_COOKIE = 'SPC_F'
+# Cookie Shopee đổi giá trị sau mỗi response API
+ROTATING_COOKIE = 'SPC_R_T_ID'
+
+
+@dataclass
+class DevServerConfig:
+    """
+    Cấu hình server giả lập:
+    - latency / jitter: độ trễ mỗi request (giây), cộng thêm ngẫu nhiên trong [0, jitter]
+    - error_rate / error_codes: tỉ lệ request API trả lỗi, chọn ngẫu nhiên một mã trong error_codes
+    - captcha_rate: tỉ lệ trang search/shop bị redirect tới /verify/captcha
+    - max_rps: quá số request API/giây này thì trả 429 (None: không giới hạn)
+    - page_size: số item tối đa mỗi trang search_items (limit lớn hơn bị cắt)
+    - items_per_target: số sản phẩm của mỗi keyword/category
+    - shop_items: số sản phẩm mỗi trang shop
+    - require_cookie: API trả lỗi (200 kèm error) nếu request không có cookie SPC_F, như session hết hạn
+    """
+    latency: float = 0.05
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_codes: Tuple[int, ...] = (429, 403)
+    captcha_rate: float = 0.0
+    max_rps: Optional[float] = None
+    page_size: int = 60
+    items_per_target: int = 3000
+    shop_items: int = 120
+    require_cookie: bool = False
+    seed: int = 0
+
+    def update(self, values: Dict[str, str]):
+        """Đổi cấu hình từ query string (/__config?error_rate=0.2&error_codes=429,500)"""
+        for field in fields(self):
+            if field.name not in values:
+                continue
+            raw = values[field.name]
+            current = getattr(self, field.name)
+            if field.name == 'error_codes':
+                value = tuple(int(code) for code in raw.split(',') if code)
+            elif field.name == 'max_rps':
+                value = float(raw) if raw not in ('', 'none', 'None') else None
+            elif isinstance(current, bool):
+                value = raw.lower() in ('1', 'true', 'yes')
+            else:
+                value = type(current)(raw)
+            setattr(self, field.name, value)
+
+
+class Catalogue:
+    """Sản phẩm giả của từng keyword/category/shop (bản ghi dạng Product.to_dict()), sinh một lần rồi giữ lại"""
+
+    def __init__(self, config: DevServerConfig):
+        self.config = config
+        self.samples = load_sample_records()
+        self._lock = threading.Lock()
+        self._targets: Dict[str, List[Dict]] = {}
+
+    def _generate(self, key: str, count: int, shop_id: Optional[str] = None) -> List[Dict]:
+        seed = zlib.crc32(key.encode('utf-8'))
+        rng = random.Random(seed ^ self.config.seed)
+        base_id = 10 ** 9 + (seed % 10 ** 5) * 10 ** 5
+        records = []
+        for i in range(count):
+            sample = self.samples[(seed + i) % len(self.samples)]
+            item_shop_id = shop_id or str(100000 + rng.randrange(max(1, count // 20)))
+            product_id = str(base_id + i)
+            records.append({
+                **sample,
+                'name': f"{sample['name']} #{i}",
+                'price': float(round(sample['price'] * rng.uniform(0.5, 1.5), -2)),
+                'sales_count': rng.randint(0, 20000),
+                'rating': rng.choice((0.0, 3.5, 4.0, 4.5, 4.8, 5.0)),
+                'shop_id': item_shop_id,
+                'product_id': product_id,
+                'product_url': f"https://shopee.vn/product/{item_shop_id}/{product_id}",
+            })
+        return records
+
+    def records(self, key: str, shop_id: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            records = self._targets.get(key)
+            if records is None:
+                count = self.config.shop_items if shop_id else self.config.items_per_target
+                records = self._targets[key] = self._generate(key, count, shop_id)
+            return records
+
+    def search(self, key: str, by: str, order: str, params: Dict[str, str]) -> List[Dict]:
+        """Sản phẩm của keyword/category sau khi lọc và sắp xếp như search_items"""
+        records = self.records(key)
+        if 'price_min' in params:
+            records = [r for r in records if r['price'] >= float(params['price_min'])]
+        if 'price_max' in params:
+            records = [r for r in records if r['price'] <= float(params['price_max'])]
+        if 'rating_filter' in params:
+            records = [r for r in records if r['rating'] >= float(params['rating_filter'])]
+        if by == 'sales':
+            records = sorted(records, key=lambda r: r['sales_count'], reverse=True)
+        elif by == 'price':
+            records = sorted(records, key=lambda r: r['price'], reverse=order == 'desc')
+        elif by == 'pop':
+            records = sorted(records, key=lambda r: r['sales_count'] * (r['rating'] or 1), reverse=True)
+        return records
+
+
+class ShopeeDevServer:
+    """
+    Server giả lập chạy trong thread nền:
+        with ShopeeDevServer(DevServerConfig(error_rate=0.1)) as server:
+            crawler = ShopeeCrawler(http_only=True, base_url=server.url)
+    """
+
+    def __init__(self, config: Optional[DevServerConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or DevServerConfig()
+        self.catalogue = Catalogue(self.config)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._connections = 0
+        self._tokens = float(self.config.max_rps or 0)
+        self._last_refill = time.monotonic()
+        self.started_at = time.time()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # --- Điều khiển lỗi / độ trễ ---
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _sleep(self):
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += self._random() * self.config.jitter
+        if delay > 0:
+            time.sleep(delay)
+
+    def _throttled(self) -> bool:
+        """Token bucket theo max_rps (cho phép dồn tối đa max_rps request)"""
+        rate = self.config.max_rps
+        if not rate:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(rate, 1.0), self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def _injected_error(self) -> Optional[int]:
+        if self.config.error_codes and self._random() < self.config.error_rate:
+            with self._lock:
+                return self._rng.choice(self.config.error_codes)
+        return None
+
+    def _count(self, kind: str, status: int):
+        with self._lock:
+            self._counts[(kind, status)] = self._counts.get((kind, status), 0) + 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._counts)
+        requests_by_kind: Dict[str, Dict[str, int]] = {}
+        for (kind, status), count in sorted(counts.items()):
+            requests_by_kind.setdefault(kind, {})[str(status)] = count
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 3),
+            'requests': requests_by_kind,
+            'total': sum(counts.values()),
+            'connections': self._connections,
+            'config': asdict(self.config),
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts.clear()
+            self._connections = 0
+            self.started_at = time.time()
+
+    # --- Nội dung ---
+
+    def search_items(self, params: Dict[str, str]) -> Dict:
+        if 'categoryids' in params:
+            key = f"category:{params['categoryids']}"
+        else:
+            key = f"keyword:{params.get('keyword', '')}"
+        records = self.catalogue.search(key, params.get('by', 'relevancy'), params.get('order', 'desc'), params)
+        newest = max(0, int(params.get('newest', 0)))
+        limit = min(max(0, int(params.get('limit', self.config.page_size))), self.config.page_size)
+        page = records[newest:newest + limit]
+        return {
+            'error': None,
+            'total_count': len(records),
+            'nomore': newest + limit >= len(records),
+            'items': [api_item(record) for record in page],
+        }
+
+    def _page_html(self, title: str, container: str, records: List[Dict]) -> str:
+        cards = ''.join(card_html(record, 0) for record in records)
+        return (
+            f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head><body>'
+            f'{container.format(cards=cards)}</body></html>'
+        )
+
+    def search_html(self, keyword: str) -> str:
+        records = self.catalogue.search(f"keyword:{keyword}", 'relevancy', 'desc', {})
+        return self._page_html(
+            'Shopee search', '<div class="shopee-search-item-result"><div class="row">{cards}</div></div>',
+            records[:self.config.page_size]
+        )
+
+    def shop_html(self, shop_id: str) -> str:
+        records = self.catalogue.records(f"shop:{shop_id}", shop_id=shop_id)
+        return self._page_html(
+            'Shopee shop', '<div class="shop-page"><div class="shop-all-product-view">{cards}</div></div>', records
+        )
+
+    # --- HTTP ---
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # Mỗi kết nối TCP mới (keep-alive dùng lại kết nối thì không tăng)
+                with server._lock:
+                    server._connections += 1
+
+            def _send(self, kind: str, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+                server._count(kind, status)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, kind: str, data: Dict, status: int = 200, headers: Dict[str, str] = None):
+                body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self._send(kind, status, body, 'application/json; charset=utf-8', headers)
+
+            def _send_html(self, kind: str, html: str, status: int = 200, headers: Dict[str, str] = None):
+                self._send(kind, status, html.encode('utf-8'), 'text/html; charset=utf-8', headers)
+
+            def _redirect_captcha(self, kind: str) -> bool:
+                if server._random() >= server.config.captcha_rate:
+                    return False
+                target = urllib.parse.quote(self.path, safe='')
+                self._send(kind, 302, b'', 'text/plain', {'Location': f"/verify/captcha?anti_bot_tracking_id=dev&next={target}"})
+                return True
+
+            def _has_session(self) -> bool:
+                return f"{SESSION_COOKIE}=" in self.headers.get('Cookie', '')
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                path = parsed.path
+                params = {name: values[-1] for name, values in urllib.parse.parse_qs(parsed.query).items()}
+
+                if path == '/__stats':
+                    self._send_json('control', server.stats())
+                    return
+                if path == '/__config':
+                    server.config.update(params)
+                    self._send_json('control', asdict(server.config))
+                    return
+
+                server._sleep()
+                if path == SEARCH_ITEMS_PATH:
+                    self._search_items(params)
+                elif path == '/':
+                    self._send_html(
+                        'home', '<!DOCTYPE html><html><head><title>Shopee</title></head><body>Shopee dev</body></html>',
+                        headers={'Set-Cookie': f"{SESSION_COOKIE}=dev-{int(time.time())}; Path=/"}
+                    )
+                elif path == '/search':
+                    if not self._redirect_captcha('search'):
+                        self._send_html('search', server.search_html(params.get('keyword', '')))
+                elif path.startswith('/shop/'):
+                    if not self._redirect_captcha('shop'):
+                        self._send_html('shop', server.shop_html(path.rsplit('/', 1)[-1]))
+                elif path.startswith('/verify/captcha'):
+                    self._send_html(
+                        'captcha', '<!DOCTYPE html><html><body><div class="captcha">Xác minh captcha: bạn có phải robot?</div></body></html>'
+                    )
+                elif path.startswith('/product/'):
+                    self._send_html('product', f'<!DOCTYPE html><html><body><h1>{path}</h1></body></html>')
+                elif path.startswith('/file/'):
+                    self._send('file', 200, PIXEL_GIF, 'image/gif')
+                else:
+                    self._send_html('other', '<html><body>Not found</body></html>', status=404)
+
+            def _search_items(self, params: Dict[str, str]):
+                if server._throttled():
+                    self._send_json('api', {'error': 'too many requests'}, status=429, headers={'Retry-After': '1'})
+                    return
+                status = server._injected_error()
+                if status is not None:
+                    headers = {'Retry-After': '1'} if status == 429 else None
+                    self._send_json('api', {'error': status}, status=status, headers=headers)
+                    return
+                if server.config.require_cookie and not self._has_session():
+                    # Shopee trả 200 kèm mã lỗi khi session không hợp lệ
+                    self._send_json('api', {'error': 90309999, 'items': None})
+                    return
+                try:
+                    data = server.search_items(params)
+                except ValueError:
+                    self._send_json('api', {'error': 'bad params'}, status=400)
+                    return
+                self._send_json('api', data, headers={'Set-Cookie': f"{ROTATING_COOKIE}={time.time_ns()}; Path=/"})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    # --- Vòng đời ---
+
+    def start(self) -> "ShopeeDevServer":
+        """Chạy server trong thread nền"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ShopeeDevServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -1,5 +1,6 @@
-from .sorter import ProductSorter
+from .product_filter import ProductFilter
+from .sorter import ProductSorter, SortKey
 
-__all__ = ['ProductSorter']
+__all__ = ['ProductSorter', 'SortKey', 'ProductFilter']
 
 
@@ -0,0 +1,106 @@
+import math
+from dataclasses import dataclass
+from itertools import compress
+from operator import attrgetter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Union
+
+from models.product import Product
+from models.product_batch import ProductBatch
+
+
+@dataclass(frozen=True)
+class ProductFilter:
+    """
+    Điều kiện lọc sản phẩm:
+    - min_price / max_price: khoảng giá (VND)
+    - min_rating: rating tối thiểu
+    - min_sales: lượt bán tối thiểu
+    - locations / categories: tập nơi bán / category được giữ lại
+    - name_contains: tên có chứa chuỗi này (không phân biệt hoa thường)
+    Các điều kiện API search_items hỗ trợ được gửi kèm request (to_api_params()),
+    tất cả điều kiện đều được kiểm tra lại ở local (apply() / matches()).
+    Sản phẩm thiếu giá trị (vd. rating None) không qua điều kiện của trường đó.
+    """
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_rating: Optional[float] = None
+    min_sales: Optional[int] = None
+    locations: Optional[FrozenSet[str]] = None
+    categories: Optional[FrozenSet[str]] = None
+    name_contains: Optional[str] = None
+
+    def __post_init__(self):
+        # Cho phép truyền list/set, lưu dạng frozenset để filter hash được
+        for name in ('locations', 'categories'):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, frozenset):
+                object.__setattr__(self, name, frozenset(str(v) for v in value))
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, name) is None for name in self.__dataclass_fields__)
+
+    def to_api_params(self) -> Dict[str, object]:
+        """Tham số search_items tương ứng (lọc ngay phía Shopee, bớt trang phải tải)"""
+        params = {}
+        if self.min_price is not None:
+            params['price_min'] = int(self.min_price)
+        if self.max_price is not None:
+            params['price_max'] = int(math.ceil(self.max_price))
+        if self.min_rating is not None and self.min_rating >= 1:
+            # rating_filter=4 nghĩa là từ 4 sao trở lên
+            params['rating_filter'] = int(self.min_rating)
+        if self.locations:
+            params['locations'] = ','.join(sorted(self.locations))
+        return params
+
+    def _predicates(self):
+        """(trường, hàm kiểm tra giá trị) cho từng điều kiện đang dùng"""
+        predicates = []
+        if self.min_price is not None:
+            min_price = self.min_price
+            predicates.append(('price', lambda v: v is not None and v >= min_price))
+        if self.max_price is not None:
+            max_price = self.max_price
+            predicates.append(('price', lambda v: v is not None and v <= max_price))
+        if self.min_rating is not None:
+            min_rating = self.min_rating
+            predicates.append(('rating', lambda v: v is not None and v >= min_rating))
+        if self.min_sales is not None:
+            min_sales = self.min_sales
+            predicates.append(('sales_count', lambda v: v is not None and v >= min_sales))
+        if self.locations is not None:
+            predicates.append(('location', self.locations.__contains__))
+        if self.categories is not None:
+            predicates.append(('category', self.categories.__contains__))
+        if self.name_contains:
+            needle = self.name_contains.lower()
+            predicates.append(('name', lambda v: needle in v.lower()))
+        return predicates
+
+    def matches(self, product: Product) -> bool:
+        """Kiểm tra một sản phẩm (dùng khi nhận từng sản phẩm lúc crawl)"""
+        return all(predicate(getattr(product, field)) for field, predicate in self._predicates())
+
+    def mask(self, products: Union[Sequence[Product], ProductBatch]) -> List[bool]:
+        """Kết quả lọc của cả danh sách, kiểm tra theo từng cột chỉ trên các sản phẩm còn lại"""
+        count = len(products)
+        indices = range(count)
+        for field, predicate in self._predicates():
+            if isinstance(products, ProductBatch):
+                column = products.column(field)
+                values = [column[i] for i in indices] if len(indices) < count else column
+            else:
+                values = list(map(attrgetter(field), (products[i] for i in indices)))
+            indices = list(compress(indices, map(predicate, values)))
+            if not indices:
+                break
+        mask = [False] * count
+        for i in indices:
+            mask[i] = True
+        return mask
+
+    def apply(self, products: Union[Sequence[Product], ProductBatch]) -> List[Product]:
+        """Các sản phẩm thỏa mọi điều kiện, giữ nguyên thứ tự"""
+        if isinstance(products, ProductBatch):
+            return products.take(compress(range(len(products)), self.mask(products)))
+        return list(compress(products, self.mask(products)))
@@ -1,35 +1,145 @@
-from typing import List
+import heapq
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, List, Optional, Sequence, Union
+
 from models.product import Product
+from models.product_batch import ProductBatch
+
+NULLS_FIRST = 'first'
+NULLS_LAST = 'last'
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    Một tiêu chí sắp xếp:
+    - field: tên trường của Product
+    - descending: True để giảm dần
+    - nulls: vị trí giá trị None ('first' / 'last'), không dùng khi có fill
+    - fill: giá trị thay cho None (vd. 0 để None xếp như 0)
+    """
+    field: str
+    descending: bool = False
+    nulls: str = NULLS_LAST
+    fill: Any = None
+
+    @classmethod
+    def parse(cls, key: Union["SortKey", str]) -> "SortKey":
+        """'sales_count' -> tăng dần, '-sales_count' -> giảm dần"""
+        if isinstance(key, SortKey):
+            return key
+        if key.startswith('-'):
+            return cls(key[1:], descending=True)
+        return cls(key)
+
+
+def _column(products, field: str) -> list:
+    """Giá trị một trường của mọi sản phẩm (ProductBatch đọc thẳng từ cột)"""
+    if isinstance(products, ProductBatch):
+        return products.column(field)
+    return list(map(attrgetter(field), products))
+
+
+def _sort_values(values: list, key: SortKey) -> list:
+    """Giá trị dùng làm key sort cho một cột, xử lý None theo fill/nulls"""
+    if key.fill is not None:
+        fill = key.fill
+        return [fill if v is None else v for v in values]
+    if None not in values:
+        return values
+    # None xếp cuối (hoặc đầu) theo chiều sắp xếp thực tế
+    null_high = (key.nulls == NULLS_LAST) != key.descending
+    null_key = (1 if null_high else -1, 0)
+    return [null_key if v is None else (0, v) for v in values]
+
+
+def _ascending_values(values: list, key: SortKey) -> Optional[list]:
+    """Giá trị key luôn theo chiều tăng dần (đổi dấu cột giảm dần), None nếu không đổi dấu được (cột chuỗi)"""
+    if key.fill is not None:
+        values = [key.fill if v is None else v for v in values]
+    if key.descending:
+        try:
+            values = [v if v is None else -v for v in values]
+        except TypeError:
+            return None
+    if None not in values:
+        return values
+    null_key = (1 if key.nulls == NULLS_LAST else -1, 0)
+    return [null_key if v is None else (0, v) for v in values]
+
 
 class ProductSorter:
-    """Class để sắp xếp sản phẩm"""
-    
+    """
+    Class để sắp xếp sản phẩm:
+    - sort(): nhiều tiêu chí, mỗi tiêu chí có chiều và vị trí None riêng, limit để lấy top-K
+    - top_k(): chọn K sản phẩm đầu bằng heap, không sắp xếp cả danh sách
+    Làm việc trên từng cột giá trị (list Product hoặc ProductBatch), sort theo vị trí.
+    """
+
+    @staticmethod
+    def argsort(
+        products: Union[Sequence[Product], ProductBatch],
+        keys: Sequence[Union[SortKey, str]],
+        limit: Optional[int] = None
+    ) -> List[int]:
+        """Vị trí các sản phẩm theo thứ tự sắp xếp (ổn định: bằng nhau giữ thứ tự ban đầu)"""
+        keys = [SortKey.parse(key) for key in keys]
+        count = len(products)
+        if not keys:
+            return list(range(count))[:limit]
+
+        if limit is not None and limit < count:
+            columns = [_ascending_values(_column(products, key.field), key) for key in keys]
+            if all(column is not None for column in columns):
+                # Chọn bằng heap trên tuple (giá trị..., vị trí), so sánh trong C,
+                # vị trí giữ thứ tự ổn định khi bằng nhau
+                return [row[-1] for row in heapq.nsmallest(limit, zip(*columns, range(count)))]
+
+        # Sort ổn định lần lượt từ tiêu chí cuối lên tiêu chí đầu
+        order = list(range(count))
+        for key in reversed(keys):
+            values = _sort_values(_column(products, key.field), key)
+            order.sort(key=values.__getitem__, reverse=key.descending)
+        return order if limit is None else order[:limit]
+
+    @staticmethod
+    def sort(
+        products: Union[Sequence[Product], ProductBatch],
+        keys: Sequence[Union[SortKey, str]],
+        limit: Optional[int] = None
+    ) -> List[Product]:
+        """Sắp xếp theo nhiều tiêu chí, vd. [SortKey('commission_rate', True), '-sales_count']"""
+        order = ProductSorter.argsort(products, keys, limit)
+        if isinstance(products, ProductBatch):
+            return products.take(order)
+        return [products[i] for i in order]
+
+    @staticmethod
+    def top_k(
+        products: Union[Sequence[Product], ProductBatch],
+        keys: Sequence[Union[SortKey, str]],
+        k: int
+    ) -> List[Product]:
+        """K sản phẩm đầu tiên theo các tiêu chí"""
+        return ProductSorter.sort(products, keys, limit=k)
+
     @staticmethod
     def sort_by_commission(products: List[Product], reverse: bool = True) -> List[Product]:
         """Sắp xếp theo % hoa hồng"""
-        return sorted(
-            products,
-            key=lambda p: p.commission_rate if p.commission_rate else 0,
-            reverse=reverse
-        )
-    
+        return ProductSorter.sort(products, [SortKey('commission_rate', descending=reverse, fill=0)])
+
     @staticmethod
     def sort_by_price(products: List[Product], reverse: bool = False) -> List[Product]:
         """Sắp xếp theo giá (mặc định tăng dần)"""
-        return sorted(products, key=lambda p: p.price, reverse=reverse)
-    
+        return ProductSorter.sort(products, [SortKey('price', descending=reverse)])
+
     @staticmethod
     def sort_by_sales(products: List[Product], reverse: bool = True) -> List[Product]:
         """Sắp xếp theo lượt bán"""
-        return sorted(products, key=lambda p: p.sales_count, reverse=reverse)
-    
+        return ProductSorter.sort(products, [SortKey('sales_count', descending=reverse)])
+
     @staticmethod
     def sort_by_rating(products: List[Product], reverse: bool = True) -> List[Product]:
         """Sắp xếp theo đánh giá"""
-        return sorted(
-            products,
-            key=lambda p: p.rating if p.rating else 0,
-            reverse=reverse
-        )
-
-
+        return ProductSorter.sort(products, [SortKey('rating', descending=reverse, fill=0)])
@@ -1,10 +1,26 @@
 import json
-import pandas as pd
-from crawler.shopee_crawler import ShopeeCrawler
-from filters.sorter import ProductSorter
+import os
+import sys
+
+from cli import CHECKPOINT_FILE
+
+
+def clear_finished_checkpoint(path: str):
+    """Xóa checkpoint khi lần crawl đã xong, chỉ giữ lại checkpoint của lần crawl bị dừng"""
+    from crawler.checkpoint import CrawlCheckpoint
+
+    checkpoint = CrawlCheckpoint.load(path)
+    if checkpoint and checkpoint.done:
+        checkpoint.remove()
+
 
 def main():
+    # Import ở đây để `python main.py <lệnh>` (chuyển sang cli.py) không phải tải selenium
+    from crawler.shopee_crawler import ShopeeCrawler
+    from filters.sorter import ProductSorter
+    
     crawler = None
+    sink = None
     try:
         print("=== TOOL CRAWL DỮ LIỆU SHOPEE ===\n")
         print("📌 LƯU Ý: Shopee yêu cầu đăng nhập để crawl dữ liệu.")
@@ -38,31 +54,82 @@ def main():
             print("\n⚠️  Chạy headless có thể không đăng nhập được.")
             print("   Nếu gặp lỗi, hãy chạy lại với 'n' để hiển thị browser.\n")
         
-        crawler = ShopeeCrawler(headless=headless)
+        # Chế độ HTTP-only: không giữ Chrome, chỉ mở khi cần lấy session
+        http_only_choice = input("Crawl keyword/category chỉ bằng HTTP, không mở browser? (y/n, mặc định: n): ").lower()
+        http_only = http_only_choice == 'y'
+        
+        # Lưu vào SQLite để lần crawl sau chỉ lấy phần mới
+        store = None
+        recrawl = False
+        store_choice = input("Lưu vào database shopee_products.db và chỉ crawl phần mới? (y/n, mặc định: n): ").lower()
+        if store_choice == 'y':
+            from storage.product_store import ProductStore
+            store = ProductStore("shopee_products.db")
+            recrawl = True
+        
+        # Ghi dần ra file trong lúc crawl, dừng giữa chừng vẫn giữ được phần đã crawl
+        stream_file = input("Ghi dần kết quả ra file .jsonl/.csv/.parquet trong lúc crawl (Enter để bỏ qua): ").strip()
+        if stream_file:
+            from storage.sinks import open_sink
+            sink = open_sink(stream_file)
+        
+        # Lọc sản phẩm (giá, rating được gửi kèm request API nên tải ít trang hơn)
+        product_filter = None
+        filter_choice = input("Lọc sản phẩm theo giá/rating/lượt bán? (y/n, mặc định: n): ").lower()
+        if filter_choice == 'y':
+            from filters.product_filter import ProductFilter
+            
+            def ask_number(prompt):
+                value = input(f"{prompt} (Enter để bỏ qua): ").strip()
+                return float(value) if value else None
+            
+            min_sales = ask_number("Lượt bán tối thiểu")
+            product_filter = ProductFilter(
+                min_price=ask_number("Giá thấp nhất"),
+                max_price=ask_number("Giá cao nhất"),
+                min_rating=ask_number("Rating tối thiểu"),
+                min_sales=int(min_sales) if min_sales is not None else None,
+                name_contains=input("Tên có chứa (Enter để bỏ qua): ").strip() or None
+            )
+        
+        crawler = ShopeeCrawler(headless=headless, http_only=http_only, store=store, sink=sink)
         sorter = ProductSorter()
         
         print("\n1. Crawl theo keyword")
         print("2. Crawl theo category")
         print("3. Crawl theo shop")
+        print(f"4. Tiếp tục lần crawl bị dừng ({CHECKPOINT_FILE})")
         
-        choice = input("\nChọn phương thức crawl (1/2/3): ")
+        choice = input("\nChọn phương thức crawl (1/2/3/4): ")
         
         products = []
         
         if choice == "1":
             keyword = input("Nhập keyword: ")
             limit = int(input("Số lượng sản phẩm cần crawl: "))
-            products = crawler.crawl_by_keyword(keyword, limit=limit)
+            products = crawler.crawl_by_keyword(
+                keyword, limit=limit, recrawl=recrawl, product_filter=product_filter, checkpoint=CHECKPOINT_FILE
+            )
             
         elif choice == "2":
             category_id = int(input("Nhập category ID: "))
             limit = int(input("Số lượng sản phẩm cần crawl: "))
-            products = crawler.crawl_by_category(category_id, limit=limit)
+            products = crawler.crawl_by_category(
+                category_id, limit=limit, recrawl=recrawl, product_filter=product_filter, checkpoint=CHECKPOINT_FILE
+            )
             
         elif choice == "3":
             shop_id = input("Nhập shop ID: ")
             limit = int(input("Số lượng sản phẩm cần crawl: "))
-            products = crawler.crawl_by_shop(shop_id, limit=limit)
+            products = crawler.crawl_by_shop(shop_id, limit=limit, product_filter=product_filter, checkpoint=CHECKPOINT_FILE)
+            
+        elif choice == "4":
+            if not os.path.exists(CHECKPOINT_FILE):
+                print("Không có lần crawl nào bị dừng để tiếp tục.")
+                return
+            products = crawler.resume(CHECKPOINT_FILE)
+        
+        clear_finished_checkpoint(CHECKPOINT_FILE)
         
         if not products:
             print("Không tìm thấy sản phẩm nào!")
@@ -91,8 +158,11 @@ def main():
         print("\n=== XUẤT DỮ LIỆU ===")
         print("1. JSON")
         print("2. Excel")
+        print("3. JSONL (mỗi dòng một sản phẩm)")
+        print("4. CSV")
+        print("5. Parquet (nhỏ, đọc lại nhanh bằng pandas)")
         
-        export_choice = input("\nChọn định dạng xuất (1/2): ")
+        export_choice = input("\nChọn định dạng xuất (1/2/3/4/5): ")
         
         if export_choice == "1":
             filename = input("Tên file JSON: ")
@@ -101,20 +171,41 @@ def main():
             print(f"Đã lưu vào {filename}")
             
         elif export_choice == "2":
+            import pandas as pd
             filename = input("Tên file Excel: ")
             df = pd.DataFrame([p.to_dict() for p in products])
             df.to_excel(filename, index=False, engine='openpyxl')
             print(f"Đã lưu vào {filename}")
+            
+        elif export_choice in ("3", "4"):
+            from storage.sinks import CsvSink, JsonlSink
+            sink_class = JsonlSink if export_choice == "3" else CsvSink
+            filename = input(f"Tên file {'JSONL' if export_choice == '3' else 'CSV'}: ")
+            with sink_class(filename, batch_size=1000) as export_sink:
+                export_sink.write_many(products)
+            print(f"Đã lưu vào {filename}")
+            
+        elif export_choice == "5":
+            from storage.parquet_sink import ParquetSink
+            filename = input("Tên file Parquet: ")
+            with ParquetSink(filename) as export_sink:
+                export_sink.write_many(products)
+            print(f"Đã lưu vào {filename}")
         
         print(f"\nĐã crawl được {len(products)} sản phẩm!")
     
     except KeyboardInterrupt:
         print("\n\nĐã hủy bởi người dùng.")
+        print(f"Chạy lại và chọn 4 để tiếp tục từ {CHECKPOINT_FILE}.")
     except Exception as e:
         print(f"Lỗi: {e}")
         import traceback
         traceback.print_exc()
     finally:
+        # Ghi nốt phần sản phẩm còn trong bộ đệm
+        if sink:
+            sink.close()
+            print(f"Đã ghi {sink.count} sản phẩm vào {sink.path}")
         # Đóng browser an toàn
         if crawler:
             try:
@@ -124,6 +215,10 @@ def main():
                 pass
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Có tham số dòng lệnh: chạy không cần nhập tay (xem cli.py)
+        from cli import main as cli_main
+        sys.exit(cli_main())
     main()
 
 
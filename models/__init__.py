@@ -1,5 +1,6 @@
 from .product import Product
+from .product_batch import ProductBatch
 
-__all__ = ['Product']
+__all__ = ['Product', 'ProductBatch']
 
 
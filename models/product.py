@@ -1,38 +1,170 @@
-from dataclasses import dataclass
+import sys
 from typing import Optional
 
-@dataclass
+# Ảnh và link sản phẩm Shopee đều có dạng cố định, chỉ cần lưu phần id
+IMAGE_URL_PREFIX = "https://cf.shopee.vn/file/"
+PRODUCT_URL_BASE = "https://shopee.vn"
+
+# Thứ tự tham số khởi tạo
+FIELDS = (
+    'name', 'price', 'original_price', 'commission_rate', 'sales_count', 'rating',
+    'shop_name', 'shop_id', 'product_id', 'category', 'image_url', 'product_url', 'location',
+)
+# Các cột khi xuất dữ liệu (giống to_dict())
+EXPORT_FIELDS = (
+    'name', 'price', 'original_price', 'commission_rate', 'sales_count', 'rating',
+    'shop_name', 'product_id', 'category', 'image_url', 'product_url', 'location',
+)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
 class Product:
-    """Model đại diện cho sản phẩm Shopee"""
+    """
+    Model đại diện cho sản phẩm Shopee.
+    Dùng __slots__ (không có __dict__ mỗi object), các trường ít giá trị khác nhau
+    (shop, category, location) được intern, image_url/product_url chỉ lưu phần id.
+    Link sản phẩm dạng chuẩn được suy ra từ shop_id/product_id; đổi một trong hai id sau khi tạo
+    thì link cũ được lưu lại, không đổi theo.
+
+    Không còn là dataclass: thay dataclasses.asdict() bằng to_dict() (hoặc _values() theo FIELDS),
+    dataclasses.replace() bằng product.replace(...).
+    """
     name: str
     price: float
-    original_price: Optional[float] = None
-    commission_rate: Optional[float] = None  # % hoa hồng
-    sales_count: int = 0  # Lượt bán
-    rating: Optional[float] = None
-    shop_name: str = ""
-    shop_id: str = ""
-    product_id: str = ""
-    category: str = ""
-    image_url: str = ""
-    product_url: str = ""
-    location: str = ""
-    
+    original_price: Optional[float]
+    commission_rate: Optional[float]  # % hoa hồng
+    sales_count: int  # Lượt bán
+    rating: Optional[float]
+    shop_name: str
+    shop_id: str
+    product_id: str
+    category: str
+    image_url: str
+    product_url: str
+    location: str
+
+    __slots__ = (
+        'name', 'price', 'original_price', 'commission_rate', 'sales_count', 'rating',
+        'shop_name', '_shop_id', '_product_id', 'category', '_image', '_product_url', 'location',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        price: float,
+        original_price: Optional[float] = None,
+        commission_rate: Optional[float] = None,
+        sales_count: int = 0,
+        rating: Optional[float] = None,
+        shop_name: str = "",
+        shop_id: str = "",
+        product_id: str = "",
+        category: str = "",
+        image_url: str = "",
+        product_url: str = "",
+        location: str = ""
+    ):
+        self.name = name
+        self.price = price
+        self.original_price = original_price
+        self.commission_rate = commission_rate
+        self.sales_count = sales_count
+        self.rating = rating
+        self.shop_name = _intern(shop_name)
+        self._shop_id = _intern(shop_id)
+        self._product_id = product_id
+        self.category = _intern(category)
+        self.location = _intern(location)
+        self.image_url = image_url
+        self.product_url = product_url
+
+    @property
+    def image_url(self) -> str:
+        image = self._image
+        if not image or '/' in image:
+            return image
+        return IMAGE_URL_PREFIX + image
+
+    @image_url.setter
+    def image_url(self, value: str):
+        # Chỉ lưu id ảnh nếu là ảnh trên CDN của Shopee
+        image_id = value[len(IMAGE_URL_PREFIX):] if value and value.startswith(IMAGE_URL_PREFIX) else ''
+        if image_id and '/' not in image_id:
+            value = image_id
+        self._image = value
+
+    def _pin_product_url(self):
+        """Lưu hẳn link đang suy ra từ id trước khi đổi id, để link không đổi theo"""
+        if self._product_url is None:
+            self._product_url = f"{PRODUCT_URL_BASE}/product/{self._shop_id}/{self._product_id}"
+
+    @property
+    def shop_id(self) -> str:
+        return self._shop_id
+
+    @shop_id.setter
+    def shop_id(self, value: str):
+        self._pin_product_url()
+        self._shop_id = _intern(value)
+
+    @property
+    def product_id(self) -> str:
+        return self._product_id
+
+    @product_id.setter
+    def product_id(self, value: str):
+        self._pin_product_url()
+        self._product_id = value
+
+    @property
+    def product_url(self) -> str:
+        if self._product_url is None:
+            return f"{PRODUCT_URL_BASE}/product/{self.shop_id}/{self.product_id}"
+        return self._product_url
+
+    @product_url.setter
+    def product_url(self, value: str):
+        # Không lưu link nếu suy ra được từ shop_id/product_id
+        if value and value == f"{PRODUCT_URL_BASE}/product/{self.shop_id}/{self.product_id}":
+            value = None
+        self._product_url = value
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Product":
+        """Tạo Product từ dictionary (bỏ qua các key không phải trường của Product)"""
+        return cls(**{key: data[key] for key in FIELDS if key in data})
+
+    def replace(self, **changes) -> "Product":
+        """Bản sao với một số trường thay đổi (thay cho dataclasses.replace)"""
+        values = dict(zip(FIELDS, self._values()))
+        values.update(changes)
+        return self.__class__(**values)
+
+    def to_tuple(self) -> tuple:
+        """Giá trị theo thứ tự EXPORT_FIELDS, không tạo dict (dùng khi xuất nhiều sản phẩm)"""
+        return (
+            self.name, self.price, self.original_price, self.commission_rate, self.sales_count,
+            self.rating, self.shop_name, self.product_id, self.category, self.image_url,
+            self.product_url, self.location,
+        )
+
     def to_dict(self):
         """Chuyển đổi sang dictionary"""
-        return {
-            'name': self.name,
-            'price': self.price,
-            'original_price': self.original_price,
-            'commission_rate': self.commission_rate,
-            'sales_count': self.sales_count,
-            'rating': self.rating,
-            'shop_name': self.shop_name,
-            'product_id': self.product_id,
-            'category': self.category,
-            'image_url': self.image_url,
-            'product_url': self.product_url,
-            'location': self.location
-        }
+        return dict(zip(EXPORT_FIELDS, self.to_tuple()))
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, field) for field in FIELDS)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
 
+    __hash__ = None
 
+    def __repr__(self):
+        values = ', '.join(f"{field}={getattr(self, field)!r}" for field in FIELDS)
+        return f"{self.__class__.__qualname__}({values})"
@@ -0,0 +1,120 @@
+"""
+Lưu nhiều sản phẩm dạng cột (mỗi trường một mảng) cho kết quả crawl rất lớn
+"""
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+from .product import FIELDS, IMAGE_URL_PREFIX, PRODUCT_URL_BASE, Product, _intern
+
+# Cột số lưu trong array (không tạo object float/int cho mỗi giá trị), None lưu là NaN / -1
+FLOAT_COLUMNS = ('price', 'original_price', 'commission_rate', 'rating')
+INT_COLUMNS = ('sales_count',)
+INTERNED_COLUMNS = ('shop_name', 'shop_id', 'category', 'location')
+_NAN = float('nan')
+
+
+class ProductBatch:
+    """
+    Danh sách sản phẩm dạng cột:
+    - append()/extend(): thêm Product, không giữ lại object Product
+    - column(name): cả cột dưới dạng list (None được khôi phục), dùng để sắp xếp/lọc nhanh
+    - batch[i] / iter(batch): tạo lại Product khi cần
+    """
+
+    def __init__(self, products: Iterable[Product] = ()):
+        self._columns: Dict[str, object] = {}
+        for field in FIELDS:
+            if field in FLOAT_COLUMNS:
+                self._columns[field] = array('d')
+            elif field in INT_COLUMNS:
+                self._columns[field] = array('q')
+            else:
+                self._columns[field] = []
+        self.extend(products)
+
+    def append(self, product: Product):
+        columns = self._columns
+        for field in FLOAT_COLUMNS:
+            value = getattr(product, field)
+            columns[field].append(_NAN if value is None else value)
+        for field in INT_COLUMNS:
+            value = getattr(product, field)
+            columns[field].append(-1 if value is None else int(value))
+        columns['name'].append(product.name)
+        columns['product_id'].append(product.product_id)
+        for field in INTERNED_COLUMNS:
+            columns[field].append(_intern(getattr(product, field)))
+        # Lưu dạng rút gọn giống Product (id ảnh, link None nếu suy ra được)
+        columns['image_url'].append(product._image)
+        columns['product_url'].append(product._product_url)
+
+    def extend(self, products: Iterable[Product]):
+        for product in products:
+            self.append(product)
+
+    def __len__(self) -> int:
+        return len(self._columns['name'])
+
+    def column(self, name: str) -> List:
+        """Giá trị cả cột, giống getattr(product, name) cho từng sản phẩm"""
+        if name in FLOAT_COLUMNS:
+            return [None if math.isnan(value) else value for value in self._columns[name]]
+        if name in INT_COLUMNS:
+            return [None if value == -1 else value for value in self._columns[name]]
+        if name == 'image_url':
+            return [
+                IMAGE_URL_PREFIX + image if image and '/' not in image else image
+                for image in self._columns['image_url']
+            ]
+        if name == 'product_url':
+            columns = self._columns
+            return [
+                f"{PRODUCT_URL_BASE}/product/{shop_id}/{product_id}" if url is None else url
+                for url, shop_id, product_id in zip(columns['product_url'], columns['shop_id'], columns['product_id'])
+            ]
+        if name not in self._columns:
+            raise KeyError(name)
+        return list(self._columns[name])
+
+    def _product_at(self, index: int) -> Product:
+        columns = self._columns
+        product = Product.__new__(Product)
+        for field in FLOAT_COLUMNS:
+            value = columns[field][index]
+            setattr(product, field, None if math.isnan(value) else value)
+        for field in INT_COLUMNS:
+            value = columns[field][index]
+            setattr(product, field, None if value == -1 else value)
+        for field in ('name', 'shop_name', 'category', 'location'):
+            setattr(product, field, columns[field][index])
+        # Gán thẳng slot của id (setter của shop_id/product_id cần _product_url đã có)
+        product._shop_id = columns['shop_id'][index]
+        product._product_id = columns['product_id'][index]
+        product._image = columns['image_url'][index]
+        product._product_url = columns['product_url'][index]
+        return product
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._product_at(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._product_at(index)
+
+    def __iter__(self) -> Iterator[Product]:
+        for index in range(len(self)):
+            yield self._product_at(index)
+
+    def take(self, indices: Iterable[int]) -> List[Product]:
+        """Lấy các sản phẩm theo danh sách vị trí (vd. kết quả sắp xếp)"""
+        return [self._product_at(index) for index in indices]
+
+    def to_products(self) -> List[Product]:
+        return list(self)
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductBatch":
+        return cls(products)
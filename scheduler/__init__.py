@@ -0,0 +1,10 @@
+from .batch import BatchScheduler, CrawlJob, JobStatus, load_jobs
+from .coordinator import CrawlCoordinator, QueueWorker
+from .work_queue import CrawlTask, SQLiteWorkQueue, WorkQueue
+
+__all__ = [
+    'BatchScheduler', 'CrawlJob', 'JobStatus', 'load_jobs',
+    'CrawlCoordinator', 'QueueWorker', 'CrawlTask', 'SQLiteWorkQueue', 'WorkQueue',
+]
+
+
@@ -0,0 +1,11 @@
+import sys
+
+from .batch import main
+from .coordinator import main as coordinator_main
+
+if __name__ == '__main__':
+    # Các lệnh của hàng đợi nhiều máy, còn lại là batch trên một máy
+    if len(sys.argv) > 1 and sys.argv[1] in ('submit', 'work', 'status', 'collect'):
+        coordinator_main()
+    else:
+        main()
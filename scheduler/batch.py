@@ -0,0 +1,307 @@
+"""
+Chạy nhiều job crawl (keyword / category / shop) song song trên nhiều process.
+Mỗi worker process có một ShopeeCrawler riêng, tiến trình chính ghi trạng thái job và gộp kết quả.
+
+File job: mỗi dòng một job, dạng text hoặc JSON:
+    keyword:áo thun
+    category:11036032
+    shop:326544948
+    {"kind": "keyword", "target": "quần jean", "limit": 300, "sort_by": "sales"}
+
+Chạy từ thư mục gốc:
+    python -m scheduler jobs.txt --workers 4 --output results.jsonl --rate 4 --http-only
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from multiprocessing.util import Finalize
+from typing import Dict, Iterable, List, Optional
+
+from crawler.metrics import CrawlMetrics
+
+JOB_KINDS = ('keyword', 'category', 'shop')
+
+# Trạng thái job
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+@dataclass
+class CrawlJob:
+    """Một job crawl: kind là keyword / category / shop, target là keyword hoặc id"""
+    kind: str
+    target: str
+    limit: int = 60
+    sort_by: str = "ctime"
+    job_id: str = ""
+
+    def __post_init__(self):
+        if self.kind not in JOB_KINDS:
+            raise ValueError(f"Loại job không hợp lệ: {self.kind} (chọn: {', '.join(JOB_KINDS)})")
+        self.target = str(self.target)
+        if not self.job_id:
+            self.job_id = f"{self.kind}:{self.target}"
+
+
+@dataclass
+class JobStatus:
+    """Trạng thái của một job trong batch"""
+    job_id: str
+    state: str = PENDING
+    products: int = 0
+    attempts: int = 0
+    error: str = ""
+    worker: str = ""
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+def parse_job_line(line: str, default_limit: int = 60) -> Optional[CrawlJob]:
+    """Đọc một dòng file job (bỏ qua dòng trống và dòng bắt đầu bằng #)"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        data = json.loads(line)
+        data.setdefault('limit', default_limit)
+        return CrawlJob(**data)
+    kind, _, target = line.partition(':')
+    return CrawlJob(kind.strip().lower(), target.strip(), limit=default_limit)
+
+
+def load_jobs(path: str, default_limit: int = 60) -> List[CrawlJob]:
+    """Đọc file job, bỏ các job trùng job_id"""
+    jobs, seen = [], set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            try:
+                job = parse_job_line(line, default_limit)
+            except (ValueError, TypeError) as e:
+                print(f"⚠️ Bỏ qua dòng {number}: {e}")
+                continue
+            if job and job.job_id not in seen:
+                seen.add(job.job_id)
+                jobs.append(job)
+    return jobs
+
+
+# --- Phần chạy trong worker process ---
+
+_worker_crawler = None
+_started_queue = None
+
+
+def _init_worker(crawler_options: Dict, rate_per_worker: float, started_queue=None):
+    """Tạo ShopeeCrawler riêng cho worker, đóng khi process kết thúc"""
+    global _worker_crawler, _started_queue
+    _started_queue = started_queue
+    from crawler.rate_limiter import AdaptiveRateLimiter
+    from crawler.shopee_crawler import ShopeeCrawler
+
+    # Mỗi worker chỉ được dùng phần của mình trong tổng rate cho phép
+    rate_limiter = AdaptiveRateLimiter(
+        initial_rate=min(2.0, rate_per_worker),
+        min_rate=min(0.2, rate_per_worker),
+        max_rate=rate_per_worker
+    )
+    _worker_crawler = ShopeeCrawler(rate_limiter=rate_limiter, **crawler_options)
+    Finalize(None, _worker_crawler.close, exitpriority=10)
+
+
+def _run_job(job: CrawlJob):
+    """Chạy một job, trả về (job_id, tên worker, danh sách Product, lỗi, metrics của job, thời điểm bắt đầu)"""
+    worker = multiprocessing.current_process().name
+    started_at = time.time()
+    # Báo tiến trình chính job bắt đầu chạy thật (job chờ trong pool vẫn là pending)
+    if _started_queue is not None:
+        _started_queue.put((job.job_id, worker, started_at))
+    # Metrics riêng của job này, tiến trình chính gộp lại
+    _worker_crawler.metrics.reset()
+    try:
+        if job.kind == 'keyword':
+            products = _worker_crawler.crawl_by_keyword(job.target, limit=job.limit, sort_by=job.sort_by)
+        elif job.kind == 'category':
+            products = _worker_crawler.crawl_by_category(int(job.target), limit=job.limit, sort_by=job.sort_by)
+        else:
+            products = _worker_crawler.crawl_by_shop(job.target, limit=job.limit)
+        return job.job_id, worker, products, "", _worker_crawler.metrics.export_state(), started_at
+    except Exception as e:
+        error = f"{e.__class__.__name__}: {e}\n{traceback.format_exc(limit=3)}"
+        return job.job_id, worker, [], error, _worker_crawler.metrics.export_state(), started_at
+
+
+# --- Phần chạy trong tiến trình chính ---
+
+class BatchScheduler:
+    """
+    Chạy danh sách job trên `workers` process:
+    - rate: tổng số request/giây cho cả batch, chia đều cho các worker
+    - retries: số lần chạy lại job lỗi hoặc không có sản phẩm
+    - status_file: file JSON trạng thái từng job, cập nhật mỗi khi có job xong
+    - stats_file / metrics_port: metrics gộp từ mọi worker (file JSON / endpoint Prometheus)
+    Kết quả của mọi job được ghi vào một sink (JSONL/CSV/Parquet) theo thứ tự xong.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        rate: float = 4.0,
+        retries: int = 1,
+        status_file: str = "batch_status.json",
+        crawler_options: Optional[Dict] = None,
+        stats_file: Optional[str] = None,
+        metrics_port: Optional[int] = None
+    ):
+        self.workers = max(1, workers)
+        self.rate = rate
+        self.retries = retries
+        self.status_file = status_file
+        self.crawler_options = dict(crawler_options or {})
+        self.statuses: Dict[str, JobStatus] = {}
+        self._status_lock = threading.Lock()
+        self.metrics = CrawlMetrics(stats_file)
+        self.metrics_port = metrics_port
+
+    def _watch_started(self, started_queue):
+        """Thread của tiến trình chính: đánh dấu job running khi worker thật sự bắt đầu chạy"""
+        while True:
+            message = started_queue.get()
+            if message is None:
+                return
+            job_id, worker, started_at = message
+            with self._status_lock:
+                status = self.statuses[job_id]
+                # Bỏ qua thông báo đến muộn của lần chạy đã có kết quả
+                if status.state != PENDING or (status.finished_at and status.finished_at > started_at):
+                    continue
+                status.state = RUNNING
+                status.worker = worker
+                status.started_at = started_at
+                self._save_status()
+
+    def _save_status(self):
+        """Ghi trạng thái ra file tạm rồi đổi tên để file không bị hỏng giữa chừng"""
+        if not self.status_file:
+            return
+        summary = {state: 0 for state in (PENDING, RUNNING, DONE, FAILED)}
+        for status in self.statuses.values():
+            summary[status.state] += 1
+        data = {
+            'updated_at': time.time(),
+            'summary': summary,
+            'jobs': [asdict(status) for status in self.statuses.values()],
+        }
+        tmp_path = f"{self.status_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.status_file)
+
+    def run(self, jobs: Iterable[CrawlJob], sink=None) -> Dict[str, JobStatus]:
+        """Chạy hết các job, ghi sản phẩm vào sink (nếu có), trả về trạng thái từng job"""
+        jobs = {job.job_id: job for job in jobs}
+        self.statuses = {job_id: JobStatus(job_id) for job_id in jobs}
+        self._save_status()
+        if not jobs:
+            return self.statuses
+
+        workers = min(self.workers, len(jobs))
+        rate_per_worker = self.rate / workers
+        print(f"🚀 Chạy {len(jobs)} job trên {workers} worker ({rate_per_worker:.2f} request/s mỗi worker)")
+
+        pending = list(jobs.values())
+        started = time.time()
+        if self.metrics_port is not None:
+            self.metrics.serve(self.metrics_port)
+        context = multiprocessing.get_context('spawn')
+        started_queue = context.Queue()
+        watcher = threading.Thread(target=self._watch_started, args=(started_queue,), daemon=True)
+        watcher.start()
+        initargs = (self.crawler_options, rate_per_worker, started_queue)
+        with context.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            while pending:
+                with self._status_lock:
+                    for job in pending:
+                        self.statuses[job.job_id].attempts += 1
+
+                retry = []
+                for job_id, worker, products, error, metrics, started_at in pool.imap_unordered(_run_job, pending):
+                    self.metrics.merge_state(metrics)
+                    with self._status_lock:
+                        status = self.statuses[job_id]
+                        status.worker = worker
+                        status.started_at = started_at
+                        status.finished_at = time.time()
+                        status.products = len(products)
+                        status.error = error
+                        if error or not products:
+                            if status.attempts <= self.retries:
+                                status.state = PENDING
+                                retry.append(jobs[job_id])
+                            else:
+                                status.state = FAILED
+                            print(f"❌ {job_id}: {error.splitlines()[0] if error else 'không có sản phẩm'}")
+                        else:
+                            status.state = DONE
+                            if sink:
+                                sink.write_many(products)
+                            print(f"✅ {job_id}: {len(products)} sản phẩm ({worker})")
+                        self.metrics.inc('jobs', state=status.state)
+                        self.metrics.save()
+                        self._save_status()
+                pending = retry
+            pool.close()
+            pool.join()
+        started_queue.put(None)
+        watcher.join()
+
+        elapsed = time.time() - started
+        done = sum(1 for status in self.statuses.values() if status.state == DONE)
+        total_products = sum(status.products for status in self.statuses.values() if status.state == DONE)
+        print(f"🏁 Xong {done}/{len(jobs)} job, {total_products} sản phẩm trong {elapsed:.1f}s")
+        self.metrics.report()
+        self.metrics.stop_server()
+        return self.statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('jobs', help='File job')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument('--output', default='batch_results.jsonl', help='File kết quả (.jsonl/.csv/.parquet)')
+    parser.add_argument('--rate', type=float, default=4.0, help='Tổng số request/giây cho cả batch')
+    parser.add_argument('--limit', type=int, default=60, help='Số sản phẩm mặc định mỗi job')
+    parser.add_argument('--retries', type=int, default=1)
+    parser.add_argument('--status', default='batch_status.json', help='File trạng thái job')
+    parser.add_argument('--http-only', action='store_true', help='Crawl keyword/category chỉ bằng HTTP')
+    parser.add_argument('--show-browser', action='store_true', help='Hiển thị browser thay vì chạy ẩn')
+    parser.add_argument('--stats-file', default='batch_stats.json', help='File JSON metrics gộp của batch')
+    parser.add_argument('--metrics-port', type=int, default=None, help='Mở endpoint Prometheus /metrics ở port này')
+    parser.add_argument('--base-url', default=None, help='Địa chỉ thay cho https://shopee.vn (server giả lập)')
+    args = parser.parse_args()
+
+    from storage.sinks import open_sink
+
+    jobs = load_jobs(args.jobs, default_limit=args.limit)
+    scheduler = BatchScheduler(
+        workers=args.workers,
+        rate=args.rate,
+        retries=args.retries,
+        status_file=args.status,
+        crawler_options={'headless': not args.show_browser, 'http_only': args.http_only, 'base_url': args.base_url},
+        stats_file=args.stats_file,
+        metrics_port=args.metrics_port
+    )
+    with open_sink(args.output) as sink:
+        scheduler.run(jobs, sink=sink)
+    print(f"Đã lưu vào {args.output}, trạng thái job trong {args.status}")
+
+
+if __name__ == '__main__':
+    main()
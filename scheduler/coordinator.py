@@ -0,0 +1,225 @@
+"""
+Chia job crawl cho nhiều máy qua hàng đợi task (WorkQueue):
+- CrawlCoordinator chia job keyword/category thành các khoảng trang, đưa vào hàng đợi, theo dõi và gộp kết quả
+- QueueWorker chạy trên từng máy: claim task, gửi heartbeat trong lúc crawl, báo kết quả
+Mỗi máy có rate limit riêng, nên thêm máy là thêm tốc độ crawl.
+
+Chạy từ thư mục gốc (hàng đợi SQLite đặt trên ổ dùng chung nếu chạy nhiều máy):
+    python -m scheduler submit jobs.txt --queue work_queue.db --pages-per-task 5
+    python -m scheduler work --queue work_queue.db --rate 2 --http-only     # trên mỗi máy
+    python -m scheduler status --queue work_queue.db
+    python -m scheduler collect --queue work_queue.db --output results.jsonl
+"""
+import argparse
+import threading
+import time
+import traceback
+from typing import Dict, Iterable, List, Optional
+
+from models.product import Product
+from crawler.pagination import PAGE_SIZE
+from .batch import CrawlJob, load_jobs
+from .work_queue import DONE, FAILED, LEASED, PENDING, CrawlTask, SQLiteWorkQueue, WorkQueue, default_worker_id
+
+
+class CrawlCoordinator:
+    """
+    Chia job thành task và theo dõi hàng đợi.
+    pages_per_task: số trang search_items (PAGE_SIZE sản phẩm) mỗi task
+    """
+
+    def __init__(self, queue: WorkQueue, pages_per_task: int = 5):
+        self.queue = queue
+        self.pages_per_task = max(1, pages_per_task)
+
+    def split(self, job: CrawlJob) -> List[CrawlTask]:
+        """Chia job keyword/category thành các khoảng offset, job shop giữ nguyên một task"""
+        if job.kind == 'shop':
+            return [CrawlTask(f"{job.job_id}@0", job.job_id, job.kind, job.target, 0, job.limit, job.sort_by)]
+        step = self.pages_per_task * PAGE_SIZE
+        return [
+            CrawlTask(f"{job.job_id}@{start}", job.job_id, job.kind, job.target, start, min(start + step, job.limit), job.sort_by)
+            for start in range(0, job.limit, step)
+        ]
+
+    def submit(self, jobs: Iterable[CrawlJob]) -> int:
+        """Đưa task của các job vào hàng đợi (job đã submit trước đó không bị thêm lại)"""
+        tasks = [task for job in jobs for task in self.split(job)]
+        added = self.queue.put_many(tasks)
+        print(f"📤 Đã thêm {added}/{len(tasks)} task vào hàng đợi")
+        return added
+
+    def wait(self, poll_interval: float = 5.0, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Chờ tới khi không còn task pending/leased, đồng thời đưa task hết hạn lease về hàng đợi"""
+        started = time.time()
+        while True:
+            requeued = self.queue.requeue_expired()
+            if requeued:
+                print(f"♻️  {requeued} task hết hạn lease, đã đưa lại hàng đợi")
+            stats = self.queue.stats()
+            print(f"⏳ pending={stats[PENDING]} leased={stats[LEASED]} done={stats[DONE]} failed={stats[FAILED]}")
+            if not stats[PENDING] and not stats[LEASED]:
+                return stats
+            if timeout is not None and time.time() - started > timeout:
+                return stats
+            time.sleep(poll_interval)
+
+    def collect(self, sink=None) -> Dict[str, List[Product]]:
+        """
+        Gộp kết quả theo job (theo thứ tự offset, bỏ sản phẩm trùng giữa các trang),
+        ghi vào sink nếu có
+        """
+        results = {}
+        for job_id in sorted({task.job_id for task in self.queue.tasks()}):
+            products, seen = [], set()
+            for product in self.queue.results(job_id):
+                key = (product.shop_id, product.product_id)
+                if key not in seen:
+                    seen.add(key)
+                    products.append(product)
+            results[job_id] = products
+            if sink:
+                sink.write_many(products)
+        return results
+
+
+class QueueWorker:
+    """
+    Vòng lặp worker trên một máy: claim task, crawl bằng ShopeeCrawler, báo kết quả.
+    Trong lúc crawl, một thread gửi heartbeat mỗi lease_seconds/3 giây để giữ lease.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        crawler,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 120,
+        idle_wait: float = 5.0
+    ):
+        self.queue = queue
+        self.crawler = crawler
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.idle_wait = idle_wait
+
+    def _crawl(self, task: CrawlTask) -> List[Product]:
+        if task.kind == 'shop':
+            return self.crawler.crawl_by_shop(task.target, limit=task.stop)
+        return self.crawler.crawl_page_range(task.kind, task.target, task.start, task.stop, task.sort_by)
+
+    def _heartbeat(self, task: CrawlTask, stop: threading.Event):
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(task.task_id, self.worker_id, self.lease_seconds):
+                print(f"⚠️ Mất lease của {task.task_id}")
+                return
+
+    def run_task(self, task: CrawlTask) -> bool:
+        """Chạy một task đã claim, trả về True nếu kết quả được nhận"""
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task, stop), daemon=True)
+        heartbeat.start()
+        try:
+            products = self._crawl(task)
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}\n{traceback.format_exc(limit=3)}"
+            print(f"❌ {task.task_id}: {e}")
+            return self.queue.fail(task.task_id, self.worker_id, error)
+        finally:
+            stop.set()
+            heartbeat.join()
+        # Task shop không có sản phẩm coi như lỗi (thường do CAPTCHA / trang không tải được),
+        # khoảng trang keyword/category rỗng là đã hết kết quả (tải lỗi thì crawl_page_range đã raise)
+        if task.kind == 'shop' and not products:
+            return self.queue.fail(task.task_id, self.worker_id, "không có sản phẩm")
+        accepted = self.queue.complete(task.task_id, self.worker_id, products)
+        print(f"{'✅' if accepted else '⚠️'} {task.task_id}: {len(products)} sản phẩm")
+        return accepted
+
+    def run(self, max_tasks: Optional[int] = None, exit_when_empty: bool = True) -> int:
+        """Chạy tới khi hết task (hoặc đủ max_tasks), trả về số task đã xong"""
+        done = 0
+        while max_tasks is None or done < max_tasks:
+            task = self.queue.claim(self.worker_id, self.lease_seconds)
+            if task is None:
+                stats = self.queue.stats()
+                # Còn task do worker khác giữ thì chờ, phòng trường hợp lease hết hạn
+                if exit_when_empty and not stats[LEASED]:
+                    break
+                time.sleep(self.idle_wait)
+                continue
+            if self.run_task(task):
+                done += 1
+        print(f"🏁 Worker {self.worker_id} xong {done} task")
+        return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    submit = subparsers.add_parser('submit', help='Chia job thành task và đưa vào hàng đợi')
+    submit.add_argument('jobs', help='File job (giống batch)')
+    submit.add_argument('--limit', type=int, default=60, help='Số sản phẩm mặc định mỗi job')
+    submit.add_argument('--pages-per-task', type=int, default=5)
+
+    work = subparsers.add_parser('work', help='Chạy worker trên máy này')
+    work.add_argument('--rate', type=float, default=2.0, help='Số request/giây của máy này')
+    work.add_argument('--lease', type=float, default=120, help='Thời gian lease (giây)')
+    work.add_argument('--worker-id', default=None)
+    work.add_argument('--http-only', action='store_true', help='Crawl keyword/category chỉ bằng HTTP')
+    work.add_argument('--show-browser', action='store_true', help='Hiển thị browser thay vì chạy ẩn')
+    work.add_argument('--forever', action='store_true', help='Không thoát khi hết task, chờ task mới')
+    work.add_argument('--stats-file', default=None, help='File JSON metrics của worker')
+    work.add_argument('--metrics-port', type=int, default=None, help='Mở endpoint Prometheus /metrics ở port này')
+    work.add_argument('--base-url', default=None, help='Địa chỉ thay cho https://shopee.vn (server giả lập)')
+
+    subparsers.add_parser('status', help='Xem số task theo trạng thái')
+
+    collect = subparsers.add_parser('collect', help='Gộp kết quả ra file')
+    collect.add_argument('--output', default='queue_results.jsonl', help='File kết quả (.jsonl/.csv/.parquet)')
+
+    for sub in (submit, work, subparsers.choices['status'], collect):
+        sub.add_argument('--queue', default='work_queue.db', help='File hàng đợi SQLite')
+    args = parser.parse_args(argv)
+
+    queue = SQLiteWorkQueue(args.queue)
+    try:
+        if args.command == 'submit':
+            CrawlCoordinator(queue, args.pages_per_task).submit(load_jobs(args.jobs, default_limit=args.limit))
+        elif args.command == 'work':
+            from crawler.metrics import CrawlMetrics
+            from crawler.rate_limiter import AdaptiveRateLimiter
+            from crawler.shopee_crawler import ShopeeCrawler
+
+            rate_limiter = AdaptiveRateLimiter(
+                initial_rate=min(2.0, args.rate), min_rate=min(0.2, args.rate), max_rate=args.rate
+            )
+            metrics = CrawlMetrics(args.stats_file)
+            if args.metrics_port is not None:
+                metrics.serve(args.metrics_port, host='0.0.0.0')
+            crawler = ShopeeCrawler(
+                headless=not args.show_browser, http_only=args.http_only, rate_limiter=rate_limiter, metrics=metrics,
+                base_url=args.base_url
+            )
+            try:
+                QueueWorker(queue, crawler, args.worker_id, args.lease).run(exit_when_empty=not args.forever)
+            finally:
+                crawler.close()
+        elif args.command == 'status':
+            for task in queue.tasks():
+                if task.state != DONE:
+                    print(f"{task.state:8} {task.task_id} (lần thử {task.attempts}) {task.worker} {task.error.splitlines()[0] if task.error else ''}")
+            print(queue.stats())
+        else:
+            from storage.sinks import open_sink
+
+            with open_sink(args.output) as sink:
+                results = CrawlCoordinator(queue).collect(sink)
+            print(f"Đã lưu {sum(map(len, results.values()))} sản phẩm của {len(results)} job vào {args.output}")
+    finally:
+        queue.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Hàng đợi task dùng chung giữa nhiều máy crawl, theo kiểu lease / visibility timeout:
+- worker claim() một task và giữ lease trong `lease_seconds`, gia hạn bằng heartbeat()
+- worker báo complete() / fail(); lease hết hạn (worker chết, mất mạng) thì task tự về lại hàng đợi
+- WorkQueue là interface, SQLiteWorkQueue là bản cài đặt trên một file SQLite
+  (chạy local hoặc đặt trên ổ dùng chung giữa các máy)
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.product import FIELDS, Product
+
+# Trạng thái task
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+TASK_STATES = (PENDING, LEASED, DONE, FAILED)
+
+
+@dataclass
+class CrawlTask:
+    """
+    Một phần của job crawl: offset [start, stop) trong kết quả keyword/category,
+    job shop không chia được nên là một task duy nhất (start=0, stop=limit)
+    """
+    task_id: str
+    job_id: str
+    kind: str
+    target: str
+    start: int
+    stop: int
+    sort_by: str = "ctime"
+    state: str = PENDING
+    attempts: int = 0
+    worker: str = ""
+    lease_expires: Optional[float] = None
+    error: str = ""
+
+
+def default_worker_id() -> str:
+    """Tên worker dạng host:pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Interface hàng đợi task. Mọi thao tác của worker đều kèm tên worker,
+    chỉ worker đang giữ lease mới gia hạn / báo kết quả được.
+    """
+
+    def put_many(self, tasks: Iterable[CrawlTask]) -> int:
+        """Thêm task (bỏ qua task_id đã có), trả về số task mới"""
+        raise NotImplementedError
+
+    def claim(self, worker: str, lease_seconds: float = 120) -> Optional[CrawlTask]:
+        """Lấy một task đang chờ và giữ lease, trả về None nếu hết task"""
+        raise NotImplementedError
+
+    def heartbeat(self, task_id: str, worker: str, lease_seconds: float = 120) -> bool:
+        """Gia hạn lease, trả về False nếu lease đã mất (task đã giao cho worker khác)"""
+        raise NotImplementedError
+
+    def complete(self, task_id: str, worker: str, products: List[Product]) -> bool:
+        """Lưu kết quả task, trả về False nếu lease đã mất (kết quả bị bỏ)"""
+        raise NotImplementedError
+
+    def fail(self, task_id: str, worker: str, error: str) -> bool:
+        """Báo task lỗi, task về lại hàng đợi nếu còn lượt thử"""
+        raise NotImplementedError
+
+    def requeue_expired(self) -> int:
+        """Đưa các task hết hạn lease về lại hàng đợi, trả về số task"""
+        raise NotImplementedError
+
+    def tasks(self, job_id: Optional[str] = None) -> List[CrawlTask]:
+        raise NotImplementedError
+
+    def results(self, job_id: str) -> Iterator[Product]:
+        """Sản phẩm của các task đã xong trong job, theo thứ tự offset"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Số task theo trạng thái"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    stop INTEGER NOT NULL,
+    sort_by TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT NOT NULL DEFAULT '',
+    lease_expires REAL,
+    error TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks (state, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_tasks_job ON tasks (job_id, start);
+"""
+
+_TASK_COLUMNS = (
+    'task_id', 'job_id', 'kind', 'target', 'start', 'stop', 'sort_by',
+    'state', 'attempts', 'worker', 'lease_expires', 'error',
+)
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Hàng đợi trên SQLite (WAL). Mỗi thread dùng connection riêng,
+    claim() chạy trong transaction IMMEDIATE nên hai worker không lấy trùng task.
+    max_attempts: số lần claim tối đa của một task, quá số này task bị đánh dấu failed
+    """
+
+    def __init__(self, path: str = "work_queue.db", max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put_many(self, tasks: Iterable[CrawlTask]) -> int:
+        conn = self._conn()
+        now = time.time()
+        rows = [
+            (t.task_id, t.job_id, t.kind, t.target, t.start, t.stop, t.sort_by, PENDING, now)
+            for t in tasks
+        ]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, job_id, kind, target, start, stop, sort_by, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        # Task đã hết lượt thử thì đánh dấu failed thay vì đưa lại hàng đợi
+        conn.execute(
+            "UPDATE tasks SET state = ?, worker = '', lease_expires = NULL, "
+            "error = 'lease hết hạn', updated_at = ? "
+            "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, now, LEASED, now, self.max_attempts)
+        )
+        cursor = conn.execute(
+            "UPDATE tasks SET state = ?, worker = '', lease_expires = NULL, updated_at = ? "
+            "WHERE state = ? AND lease_expires < ?",
+            (PENDING, now, LEASED, now)
+        )
+        return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            count = self._requeue_expired(conn, time.time())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def claim(self, worker: str, lease_seconds: float = 120) -> Optional[CrawlTask]:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._requeue_expired(conn, now)
+            # Ưu tiên task ít lần thử, offset nhỏ (trang đầu của mỗi job) trước
+            row = conn.execute(
+                f"SELECT {', '.join(_TASK_COLUMNS)} FROM tasks WHERE state = ? "
+                "ORDER BY attempts, start, rowid LIMIT 1",
+                (PENDING,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            task = CrawlTask(*row)
+            task.state = LEASED
+            task.attempts += 1
+            task.worker = worker
+            task.lease_expires = now + lease_seconds
+            conn.execute(
+                "UPDATE tasks SET state = ?, attempts = ?, worker = ?, lease_expires = ?, updated_at = ? "
+                "WHERE task_id = ?",
+                (task.state, task.attempts, worker, task.lease_expires, now, task.task_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return task
+
+    def _update_leased(self, task_id: str, worker: str, assignments: str, values: tuple) -> bool:
+        """Cập nhật task chỉ khi worker vẫn đang giữ lease"""
+        cursor = self._conn().execute(
+            f"UPDATE tasks SET {assignments}, updated_at = ? WHERE task_id = ? AND state = ? AND worker = ?",
+            values + (time.time(), task_id, LEASED, worker)
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, task_id: str, worker: str, lease_seconds: float = 120) -> bool:
+        return self._update_leased(task_id, worker, "lease_expires = ?", (time.time() + lease_seconds,))
+
+    def complete(self, task_id: str, worker: str, products: List[Product]) -> bool:
+        result = json.dumps([[getattr(p, field) for field in FIELDS] for p in products], ensure_ascii=False)
+        return self._update_leased(
+            task_id, worker, "state = ?, lease_expires = NULL, error = '', result = ?", (DONE, result)
+        )
+
+    def fail(self, task_id: str, worker: str, error: str) -> bool:
+        conn = self._conn()
+        attempts = conn.execute("SELECT attempts FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        state = FAILED if attempts and attempts[0] >= self.max_attempts else PENDING
+        return self._update_leased(
+            task_id, worker, "state = ?, worker = '', lease_expires = NULL, error = ?", (state, error)
+        )
+
+    def tasks(self, job_id: Optional[str] = None) -> List[CrawlTask]:
+        query = f"SELECT {', '.join(_TASK_COLUMNS)} FROM tasks"
+        params = ()
+        if job_id is not None:
+            query += " WHERE job_id = ?"
+            params = (job_id,)
+        rows = self._conn().execute(query + " ORDER BY job_id, start", params).fetchall()
+        return [CrawlTask(*row) for row in rows]
+
+    def results(self, job_id: str) -> Iterator[Product]:
+        rows = self._conn().execute(
+            "SELECT result FROM tasks WHERE job_id = ? AND state = ? ORDER BY start",
+            (job_id, DONE)
+        )
+        for (result,) in rows:
+            for values in json.loads(result or '[]'):
+                yield Product(*values)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {state: 0 for state in TASK_STATES}
+        for state, count in self._conn().execute("SELECT state, COUNT(*) FROM tasks GROUP BY state"):
+            stats[state] = count
+        return stats
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,11 @@
+from .product_store import ProductStore
+from .sinks import CsvSink, JsonlSink, ProductSink, open_sink
+from .parquet_sink import ParquetSink, product_schema
+from .product_files import iter_products, read_products, write_products
+
+__all__ = [
+    'ProductStore', 'ProductSink', 'JsonlSink', 'CsvSink', 'ParquetSink', 'product_schema', 'open_sink',
+    'iter_products', 'read_products', 'write_products',
+]
+
+
@@ -0,0 +1,74 @@
+"""
+Xuất sản phẩm ra Parquet (Arrow) theo schema sinh từ models.product.Product
+"""
+import typing
+from typing import List, Optional
+
+from models.product import Product
+from .sinks import ProductSink
+
+# Cột lặp lại nhiều (ít giá trị khác nhau) được lưu dạng dictionary
+DICTIONARY_COLUMNS = ('shop_name', 'location', 'category')
+
+
+def _arrow_type(pa, annotation):
+    """Đổi type hint của Product sang kiểu Arrow (Optional[X] -> X, cột nào cũng nullable)"""
+    if getattr(annotation, '__origin__', None) is typing.Union:
+        annotation = next(arg for arg in annotation.__args__ if arg is not type(None))
+    if annotation is float:
+        return pa.float64()
+    if annotation is int:
+        return pa.int64()
+    return pa.string()
+
+
+def product_schema(dictionary_columns=DICTIONARY_COLUMNS):
+    """Schema Arrow theo thứ tự và kiểu các trường của Product"""
+    import pyarrow as pa
+    fields = []
+    for name, annotation in typing.get_type_hints(Product).items():
+        if name.startswith('_'):
+            continue
+        if name in dictionary_columns:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = _arrow_type(pa, annotation)
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class ParquetSink(ProductSink):
+    """
+    Ghi mỗi lô sản phẩm thành một row group Parquet.
+    Đọc lại bằng pd.read_parquet(path) hoặc pyarrow.parquet.read_table(path).
+    """
+
+    def __init__(self, path: str, batch_size: int = 10000, compression: str = 'zstd', schema=None):
+        super().__init__(batch_size)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Cần cài pyarrow để xuất Parquet: pip install pyarrow")
+        self._pa = pa
+        self.path = path
+        self.schema = schema or product_schema()
+        self._writer: Optional[object] = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def _write_batch(self, products: List[Product]):
+        pa = self._pa
+        columns = []
+        for field in self.schema:
+            values = [getattr(p, field.name) for p in products]
+            if pa.types.is_dictionary(field.type):
+                columns.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                columns.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        if self._writer is None:
+            return
+        super().close()
+        self._writer.close()
+        self._writer = None
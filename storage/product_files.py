@@ -0,0 +1,105 @@
+"""
+Đọc / ghi cả danh sách sản phẩm theo đuôi file (.json, .jsonl, .csv, .parquet, .xlsx).
+pandas / pyarrow chỉ được import khi dùng Excel / Parquet.
+"""
+import csv
+import json
+import os
+import re
+from typing import Iterable, Iterator, List
+
+from models.product import Product
+from .sinks import open_sink
+
+# Các trường số khi đọc từ CSV (CSV chỉ có chuỗi)
+FLOAT_FIELDS = ('price', 'original_price', 'commission_rate', 'rating')
+INT_FIELDS = ('sales_count',)
+
+PRODUCT_IDS_RE = re.compile(r'/product/(\d+)/(\d+)')
+
+READ_FORMATS = ('json', 'jsonl', 'csv', 'parquet', 'xlsx')
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1].lower().lstrip('.')
+
+
+def _record_to_product(record: dict) -> Product:
+    # File xuất (to_dict) không có shop_id, lấy lại từ link sản phẩm
+    if not record.get('shop_id'):
+        match = PRODUCT_IDS_RE.search(record.get('product_url') or '')
+        if match:
+            record['shop_id'] = match.group(1)
+    return Product.from_dict(record)
+
+
+def _parse_typed_record(record: dict) -> dict:
+    """Đưa giá trị đọc từ CSV / Excel (chuỗi, số nguyên) về đúng kiểu của Product"""
+    record = {key: value for key, value in record.items() if value != ''}
+    for field in FLOAT_FIELDS:
+        if field in record:
+            record[field] = float(record[field])
+    for field in INT_FIELDS:
+        if field in record:
+            record[field] = int(float(record[field]))
+    for field in ('shop_id', 'product_id'):
+        if field in record:
+            record[field] = str(record[field])
+    return record
+
+
+def iter_products(path: str) -> Iterator[Product]:
+    """Đọc lần lượt sản phẩm từ file đã xuất"""
+    extension = _extension(path)
+    if extension == 'jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield _record_to_product(json.loads(line))
+    elif extension == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        for record in records:
+            yield _record_to_product(record)
+    elif extension == 'csv':
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                yield _record_to_product(_parse_typed_record(row))
+    elif extension == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches():
+            for record in batch.to_pylist():
+                yield _record_to_product(record)
+    elif extension == 'xlsx':
+        import pandas as pd
+
+        df = pd.read_excel(path, engine='openpyxl')
+        for record in df.to_dict('records'):
+            # Ô trống trong Excel được đọc thành NaN
+            yield _record_to_product(_parse_typed_record({key: value for key, value in record.items() if value == value}))
+    else:
+        raise ValueError(f"Định dạng không hỗ trợ: {path} (chọn: {', '.join(READ_FORMATS)})")
+
+
+def read_products(path: str) -> List[Product]:
+    return list(iter_products(path))
+
+
+def write_products(products: Iterable[Product], path: str) -> int:
+    """Ghi danh sách sản phẩm ra file theo đuôi, trả về số sản phẩm đã ghi"""
+    extension = _extension(path)
+    if extension == 'json':
+        records = [p.to_dict() for p in products]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        return len(records)
+    if extension == 'xlsx':
+        import pandas as pd
+
+        records = [p.to_dict() for p in products]
+        pd.DataFrame(records).to_excel(path, index=False, engine='openpyxl')
+        return len(records)
+    with open_sink(path, batch_size=1000) as sink:
+        sink.write_many(products)
+    return sink.count
@@ -0,0 +1,185 @@
+"""
+Lưu sản phẩm vào SQLite, khóa theo (shop_id, product_id), upsert theo lô trong transaction
+"""
+import hashlib
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from models.product import Product
+
+# Các cột dữ liệu (ngoài khóa) theo đúng thứ tự trong bảng
+DATA_COLUMNS = (
+    'name', 'price', 'original_price', 'commission_rate', 'sales_count', 'rating',
+    'shop_name', 'category', 'image_url', 'product_url', 'location',
+)
+
+# Các cột được phép dùng để sắp xếp khi query
+SORTABLE_COLUMNS = {'price', 'sales_count', 'rating', 'commission_rate', 'last_seen', 'last_changed'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    shop_id TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    price REAL,
+    original_price REAL,
+    commission_rate REAL,
+    sales_count INTEGER,
+    rating REAL,
+    shop_name TEXT,
+    category TEXT,
+    image_url TEXT,
+    product_url TEXT,
+    location TEXT,
+    fingerprint TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_changed REAL NOT NULL,
+    PRIMARY KEY (shop_id, product_id)
+);
+CREATE INDEX IF NOT EXISTS idx_products_price ON products (price);
+CREATE INDEX IF NOT EXISTS idx_products_sales_count ON products (sales_count);
+CREATE INDEX IF NOT EXISTS idx_products_rating ON products (rating);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products (category);
+"""
+
+_UPSERT = f"""
+INSERT INTO products (shop_id, product_id, {', '.join(DATA_COLUMNS)}, fingerprint, first_seen, last_seen, last_changed)
+VALUES ({', '.join('?' * (len(DATA_COLUMNS) + 6))})
+ON CONFLICT (shop_id, product_id) DO UPDATE SET
+    {', '.join(f'{column} = excluded.{column}' for column in DATA_COLUMNS)},
+    last_changed = CASE WHEN products.fingerprint != excluded.fingerprint
+                        THEN excluded.last_changed ELSE products.last_changed END,
+    fingerprint = excluded.fingerprint,
+    last_seen = excluded.last_seen
+"""
+
+
+def product_fingerprint(product: Product) -> str:
+    """Hash các trường có thể thay đổi giữa các lần crawl (giá, lượt bán, rating...)"""
+    values = '\x1f'.join(str(getattr(product, column)) for column in DATA_COLUMNS)
+    return hashlib.md5(values.encode('utf-8')).hexdigest()
+
+
+class ProductStore:
+    """
+    Kho sản phẩm SQLite dùng cho crawl lặp lại:
+    - upsert_many(): ghi cả lô trong một transaction, trả về số sản phẩm mới/thay đổi/không đổi
+    - classify(): biết trước sản phẩm nào đã có và không đổi (dùng cho chế độ recrawl)
+    - query(): đọc lại theo category/giá, sắp xếp theo cột có index
+    """
+
+    def __init__(self, path: str = "shopee_products.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def _known_fingerprints(self, products: Sequence[Product]) -> Dict[tuple, str]:
+        """Lấy fingerprint đã lưu của các sản phẩm trong lô"""
+        known = {}
+        keys = list({(p.shop_id, p.product_id) for p in products})
+        # Tra theo cả khóa chính (shop_id, product_id) để dùng index của PRIMARY KEY;
+        # SQLite giới hạn số tham số mỗi câu lệnh nên chia nhỏ danh sách khóa
+        for start in range(0, len(keys), 250):
+            chunk = keys[start:start + 250]
+            rows = self.conn.execute(
+                f"SELECT p.shop_id, p.product_id, p.fingerprint "
+                f"FROM (VALUES {', '.join(['(?, ?)'] * len(chunk))}) AS k "
+                f"JOIN products p ON p.shop_id = k.column1 AND p.product_id = k.column2",
+                [value for key in chunk for value in key]
+            )
+            for shop_id, product_id, fingerprint in rows:
+                known[(shop_id, product_id)] = fingerprint
+        return known
+
+    def classify(self, products: Sequence[Product]) -> Dict[str, int]:
+        """Đếm số sản phẩm mới / đã thay đổi / không đổi so với dữ liệu đã lưu"""
+        known = self._known_fingerprints(products)
+        stats = {'new': 0, 'changed': 0, 'unchanged': 0}
+        for product in products:
+            fingerprint = known.get((product.shop_id, product.product_id))
+            if fingerprint is None:
+                stats['new'] += 1
+            elif fingerprint != product_fingerprint(product):
+                stats['changed'] += 1
+            else:
+                stats['unchanged'] += 1
+        return stats
+
+    def upsert_many(self, products: Iterable[Product]) -> Dict[str, int]:
+        """Ghi (insert/update) cả lô sản phẩm trong một transaction"""
+        products = [p for p in products if p.product_id]
+        stats = self.classify(products)
+        now = time.time()
+        rows = [
+            (
+                p.shop_id, p.product_id,
+                *(getattr(p, column) for column in DATA_COLUMNS),
+                product_fingerprint(p), now, now, now
+            )
+            for p in products
+        ]
+        with self.conn:
+            self.conn.executemany(_UPSERT, rows)
+        return stats
+
+    def get(self, shop_id: str, product_id: str) -> Optional[Product]:
+        """Đọc một sản phẩm theo khóa"""
+        row = self.conn.execute(
+            f"SELECT shop_id, product_id, {', '.join(DATA_COLUMNS)} FROM products "
+            f"WHERE shop_id = ? AND product_id = ?",
+            (shop_id, product_id)
+        ).fetchone()
+        return self._row_to_product(row) if row else None
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        order_by: str = 'sales_count',
+        descending: bool = True,
+        limit: Optional[int] = None
+    ) -> List[Product]:
+        """Đọc sản phẩm theo điều kiện, sắp xếp theo cột có index"""
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Không thể sắp xếp theo cột: {order_by}")
+        conditions, params = [], []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if min_price is not None:
+            conditions.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            conditions.append("price <= ?")
+            params.append(max_price)
+
+        sql = f"SELECT shop_id, product_id, {', '.join(DATA_COLUMNS)} FROM products"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._row_to_product(row) for row in self.conn.execute(sql, params)]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    @staticmethod
+    def _row_to_product(row) -> Product:
+        shop_id, product_id, *values = row
+        return Product(shop_id=shop_id, product_id=product_id, **dict(zip(DATA_COLUMNS, values)))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
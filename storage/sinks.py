@@ -0,0 +1,113 @@
+"""
+Ghi sản phẩm ra file theo kiểu streaming trong lúc crawl (bộ nhớ không tăng theo số sản phẩm)
+"""
+import csv
+import json
+import os
+from typing import Iterable, List
+
+from models.product import EXPORT_FIELDS, Product
+
+
+class ProductSink:
+    """
+    Nơi nhận sản phẩm ngay khi parse xong. Sản phẩm được gom thành lô và ghi ra
+    mỗi khi đủ batch_size, nên nếu crawl bị dừng giữa chừng vẫn giữ được phần đã ghi.
+    """
+
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer: List[Product] = []
+
+    def write(self, product: Product):
+        self._buffer.append(product)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, products: Iterable[Product]):
+        for product in products:
+            self.write(product)
+
+    def flush(self):
+        """Ghi các sản phẩm đang chờ ra file"""
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self._buffer = []
+
+    def _write_batch(self, products: List[Product]):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlSink(ProductSink):
+    """Mỗi dòng một sản phẩm JSON (đọc lại bằng pd.read_json(path, lines=True))"""
+
+    def __init__(self, path: str, batch_size: int = 100, append: bool = False):
+        super().__init__(batch_size)
+        self.path = path
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def _write_batch(self, products: List[Product]):
+        self._file.write(''.join(
+            json.dumps(p.to_dict(), ensure_ascii=False) + '\n' for p in products
+        ))
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        super().close()
+        self._file.close()
+
+
+class CsvSink(ProductSink):
+    """File CSV (utf-8-sig để Excel hiển thị đúng tiếng Việt), cột theo EXPORT_FIELDS"""
+
+    def __init__(self, path: str, batch_size: int = 100, append: bool = False):
+        super().__init__(batch_size)
+        self.path = path
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8-sig', newline='')
+        self._writer = None
+        self._write_header = write_header
+
+    def _write_batch(self, products: List[Product]):
+        if self._writer is None:
+            self._writer = csv.writer(self._file)
+            if self._write_header:
+                self._writer.writerow(EXPORT_FIELDS)
+        self._writer.writerows(p.to_tuple() for p in products)
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        super().close()
+        self._file.close()
+
+
+SINK_FORMATS = {
+    'jsonl': JsonlSink,
+    'csv': CsvSink,
+}
+
+
+def open_sink(path: str, **kwargs) -> ProductSink:
+    """Chọn sink theo đuôi file (.jsonl / .csv / .parquet)"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'parquet':
+        from .parquet_sink import ParquetSink
+        return ParquetSink(path, **kwargs)
+    if extension not in SINK_FORMATS:
+        raise ValueError(f"Định dạng không hỗ trợ: {path} (chọn: {', '.join(SINK_FORMATS)}, parquet)")
+    return SINK_FORMATS[extension](path, **kwargs)